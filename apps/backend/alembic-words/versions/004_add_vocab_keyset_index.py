@@ -0,0 +1,24 @@
+"""add keyset index for admin vocabulary pagination and export
+
+Revision ID: 004_add_vocab_keyset_index
+Revises: 003_add_rank
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op  # type: ignore[attr-defined]
+
+revision: str = "004_add_vocab_keyset_index"
+down_revision: str | Sequence[str] | None = "003_add_rank"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_vocab_keyset ON vocabulary_items(version_id, list_name, source_text, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_vocab_keyset")
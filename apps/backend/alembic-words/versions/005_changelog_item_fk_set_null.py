@@ -0,0 +1,38 @@
+"""keep changelog rows when their vocabulary item is deleted
+
+Revision ID: 005_changelog_item_fk_set_null
+Revises: 004_add_vocab_keyset_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op  # type: ignore[attr-defined]
+
+revision: str = "005_changelog_item_fk_set_null"
+down_revision: str | Sequence[str] | None = "004_add_vocab_keyset_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE content_changelog DROP CONSTRAINT IF EXISTS content_changelog_vocabulary_item_id_fkey")
+    op.execute(
+        """
+        ALTER TABLE content_changelog
+        ADD CONSTRAINT content_changelog_vocabulary_item_id_fkey
+        FOREIGN KEY (vocabulary_item_id) REFERENCES vocabulary_items(id) ON DELETE SET NULL
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE content_changelog DROP CONSTRAINT IF EXISTS content_changelog_vocabulary_item_id_fkey")
+    op.execute(
+        """
+        ALTER TABLE content_changelog
+        ADD CONSTRAINT content_changelog_vocabulary_item_id_fkey
+        FOREIGN KEY (vocabulary_item_id) REFERENCES vocabulary_items(id)
+    """
+    )
@@ -0,0 +1,37 @@
+"""add stored search vector for admin search
+
+Revision ID: 006_add_search_vector
+Revises: 005_changelog_item_fk_set_null
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op  # type: ignore[attr-defined]
+
+revision: str = "006_add_search_vector"
+down_revision: str | Sequence[str] | None = "005_changelog_item_fk_set_null"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE vocabulary_items
+        ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', source_text), 'A') || setweight(to_tsvector('simple', target_text), 'B')
+        ) STORED
+    """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_vocab_search ON vocabulary_items USING GIN(search_vector)")
+    op.execute("DROP INDEX IF EXISTS idx_vocab_fts_source")
+    op.execute("DROP INDEX IF EXISTS idx_vocab_fts_target")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_vocab_fts_source ON vocabulary_items USING GIN(to_tsvector('simple', source_text))")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_vocab_fts_target ON vocabulary_items USING GIN(to_tsvector('simple', target_text))")
+    op.execute("DROP INDEX IF EXISTS idx_vocab_search")
+    op.execute("ALTER TABLE vocabulary_items DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,35 @@
+"""add per-file manifest for incremental vocabulary sync
+
+Revision ID: 007_add_vocabulary_file_manifest
+Revises: 006_add_search_vector
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op  # type: ignore[attr-defined]
+
+revision: str = "007_add_vocabulary_file_manifest"
+down_revision: str | Sequence[str] | None = "006_add_search_vector"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vocabulary_file_manifest (
+            version_id INTEGER NOT NULL REFERENCES content_versions(id) ON DELETE CASCADE,
+            filename TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            word_ids UUID[] NOT NULL DEFAULT '{}',
+            synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (version_id, filename)
+        )
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS vocabulary_file_manifest")
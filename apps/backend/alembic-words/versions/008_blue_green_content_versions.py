@@ -0,0 +1,63 @@
+"""key vocabulary items by version so sync can build blue/green content versions
+
+Revision ID: 008_blue_green_content_versions
+Revises: 007_add_vocabulary_file_manifest
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op  # type: ignore[attr-defined]
+
+revision: str = "008_blue_green_content_versions"
+down_revision: str | Sequence[str] | None = "007_add_vocabulary_file_manifest"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Item ids stay stable across versions (user progress references them), so the same id
+    # appears once per version and the changelog can no longer point at a single row
+    op.execute("ALTER TABLE content_changelog DROP CONSTRAINT IF EXISTS content_changelog_vocabulary_item_id_fkey")
+    op.execute("ALTER TABLE vocabulary_items DROP CONSTRAINT IF EXISTS vocabulary_items_pkey")
+    op.execute("ALTER TABLE vocabulary_items ADD CONSTRAINT vocabulary_items_pkey PRIMARY KEY (version_id, id)")
+
+    # Retired versions are garbage-collected; their changelog entries outlive them
+    op.execute("ALTER TABLE content_changelog DROP CONSTRAINT IF EXISTS content_changelog_version_id_fkey")
+    op.execute(
+        """
+        ALTER TABLE content_changelog
+        ADD CONSTRAINT content_changelog_version_id_fkey
+        FOREIGN KEY (version_id) REFERENCES content_versions(id) ON DELETE SET NULL
+    """
+    )
+
+    op.execute("ALTER TABLE content_versions ADD COLUMN IF NOT EXISTS activated_at TIMESTAMPTZ")
+    op.execute("ALTER TABLE content_versions ADD COLUMN IF NOT EXISTS retired_at TIMESTAMPTZ")
+    op.execute("UPDATE content_versions SET activated_at = created_at WHERE is_active")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM content_versions WHERE NOT is_active")
+    op.execute("ALTER TABLE content_versions DROP COLUMN IF EXISTS retired_at")
+    op.execute("ALTER TABLE content_versions DROP COLUMN IF EXISTS activated_at")
+
+    op.execute("ALTER TABLE content_changelog DROP CONSTRAINT IF EXISTS content_changelog_version_id_fkey")
+    op.execute(
+        """
+        ALTER TABLE content_changelog
+        ADD CONSTRAINT content_changelog_version_id_fkey
+        FOREIGN KEY (version_id) REFERENCES content_versions(id)
+    """
+    )
+
+    op.execute("ALTER TABLE vocabulary_items DROP CONSTRAINT IF EXISTS vocabulary_items_pkey")
+    op.execute("ALTER TABLE vocabulary_items ADD CONSTRAINT vocabulary_items_pkey PRIMARY KEY (id)")
+    op.execute(
+        """
+        ALTER TABLE content_changelog
+        ADD CONSTRAINT content_changelog_vocabulary_item_id_fkey
+        FOREIGN KEY (vocabulary_item_id) REFERENCES vocabulary_items(id) ON DELETE SET NULL
+    """
+    )
@@ -0,0 +1,31 @@
+"""add_users_progress_version
+
+Revision ID: a7d41e9c3b28
+Revises: f3c9d27a5e14
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d41e9c3b28"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "f3c9d27a5e14"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Counter bumped by every progress write.
+
+    Quiz sessions cached in one worker compare it before use and make their writes conditional on it,
+    so a write served by another worker invalidates them instead of being overwritten.
+    """
+    op.execute("ALTER TABLE users ADD COLUMN progress_version BIGINT NOT NULL DEFAULT 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS progress_version")
@@ -0,0 +1,35 @@
+"""add_user_progress_summary_list_name
+
+Revision ID: b6e1c4f08d92
+Revises: a7d41e9c3b28
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1c4f08d92"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "a7d41e9c3b28"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Record which summary list each progress row is counted under.
+
+    Writes take a row's old counts back out of that list instead of the word's current one, so list moves
+    no longer drift; the content version a summary was built against lets stats requests rebuild after a
+    sync. Existing summaries were built without either and are flagged for a rebuild.
+    """
+    op.execute("ALTER TABLE user_progress ADD COLUMN summary_list_name TEXT")
+    op.execute("ALTER TABLE users ADD COLUMN progress_summary_version INTEGER")
+    op.execute("UPDATE users SET progress_summary_ready = FALSE WHERE id IN (SELECT DISTINCT user_id FROM user_progress)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS progress_summary_version")
+    op.execute("ALTER TABLE user_progress DROP COLUMN IF EXISTS summary_list_name")
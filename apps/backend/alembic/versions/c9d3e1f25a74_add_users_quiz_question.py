@@ -0,0 +1,31 @@
+"""add_users_quiz_question
+
+Revision ID: c9d3e1f25a74
+Revises: b6e1c4f08d92
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d3e1f25a74"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "b6e1c4f08d92"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """The quiz question last issued to each user.
+
+    Quiz sessions are cached per worker, so the question /quiz/next handed out is kept where the worker
+    serving the answer can check it; the progress write of the answer clears it.
+    """
+    op.execute("ALTER TABLE users ADD COLUMN quiz_question_id UUID, ADD COLUMN quiz_question_level SMALLINT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS quiz_question_level, DROP COLUMN IF EXISTS quiz_question_id")
@@ -0,0 +1,27 @@
+"""add_refresh_tokens_revoked_index
+
+Revision ID: d4e7a91c3b20
+Revises: c3a1f8b2d456
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e7a91c3b20"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "c3a1f8b2d456"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index revoked tokens so the background purge can find them without a full scan."""
+    op.execute("CREATE INDEX IF NOT EXISTS idx_refresh_tokens_revoked ON refresh_tokens(revoked_at) WHERE revoked_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_refresh_tokens_revoked")
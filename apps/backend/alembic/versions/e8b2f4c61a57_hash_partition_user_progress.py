@@ -0,0 +1,77 @@
+"""hash_partition_user_progress
+
+Revision ID: e8b2f4c61a57
+Revises: d4e7a91c3b20
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b2f4c61a57"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "d4e7a91c3b20"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PARTITIONS = 16
+
+COLUMNS = """
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    vocabulary_item_id UUID NOT NULL,
+    level SMALLINT NOT NULL CHECK (level BETWEEN 0 AND 5),
+    queue_position INTEGER NOT NULL CHECK (queue_position >= 0),
+    consecutive_correct SMALLINT NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0 CHECK (correct_count >= 0),
+    incorrect_count INTEGER NOT NULL DEFAULT 0 CHECK (incorrect_count >= 0),
+    recent_history BOOLEAN[] DEFAULT '{}',
+    first_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_practiced_at TIMESTAMPTZ,
+    pronunciation_passed BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (user_id, vocabulary_item_id)
+"""
+
+COLUMN_NAMES = """
+    user_id, vocabulary_item_id, level, queue_position, consecutive_correct, correct_count, incorrect_count,
+    recent_history, first_seen_at, last_practiced_at, pronunciation_passed
+"""
+
+SECONDARY_INDEXES = (
+    "CREATE INDEX idx_progress_user_level ON user_progress(user_id, level)",
+    "CREATE INDEX idx_progress_user_queue ON user_progress(user_id, queue_position)",
+    "CREATE INDEX idx_progress_last_practiced ON user_progress(user_id, last_practiced_at)",
+)
+
+
+def _swap_table(*definition: str) -> None:
+    op.execute("ALTER TABLE user_progress RENAME TO user_progress_old")
+    op.execute("ALTER INDEX user_progress_pkey RENAME TO user_progress_old_pkey")
+    for index in ("idx_progress_user_level", "idx_progress_user_queue", "idx_progress_last_practiced", "idx_progress_user_vocab"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    for statement in definition:
+        op.execute(statement)
+    op.execute(f"INSERT INTO user_progress ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM user_progress_old")  # nosec B608
+    op.execute("DROP TABLE user_progress_old")
+    for statement in SECONDARY_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Hash-partition user_progress by user_id; idx_progress_user_vocab duplicated the primary key."""
+    _swap_table(
+        f"CREATE TABLE user_progress ({COLUMNS}) PARTITION BY HASH (user_id)",
+        *(
+            f"CREATE TABLE user_progress_p{remainder:02d} PARTITION OF user_progress FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+            for remainder in range(PARTITIONS)
+        ),
+    )
+    op.execute("ANALYZE user_progress")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap_table(f"CREATE TABLE user_progress ({COLUMNS})")
+    op.execute("CREATE INDEX idx_progress_user_vocab ON user_progress(user_id, vocabulary_item_id)")
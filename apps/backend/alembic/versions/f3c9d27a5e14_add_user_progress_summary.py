@@ -0,0 +1,51 @@
+"""add_user_progress_summary
+
+Revision ID: f3c9d27a5e14
+Revises: e8b2f4c61a57
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c9d27a5e14"  # pragma: allowlist secret
+down_revision: str | Sequence[str] | None = "e8b2f4c61a57"  # pragma: allowlist secret
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Per-(user, list) progress aggregates kept current by the progress writer.
+
+    List names live in the words database, so existing users are flagged for a one-off rebuild
+    on their first stats request instead of being backfilled here.
+    """
+    op.execute(
+        """
+        CREATE TABLE user_progress_summary (
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            list_name TEXT NOT NULL,
+            level_0_count INTEGER NOT NULL DEFAULT 0,
+            level_1_count INTEGER NOT NULL DEFAULT 0,
+            level_2_count INTEGER NOT NULL DEFAULT 0,
+            level_3_count INTEGER NOT NULL DEFAULT 0,
+            level_4_count INTEGER NOT NULL DEFAULT 0,
+            level_5_count INTEGER NOT NULL DEFAULT 0,
+            correct_count BIGINT NOT NULL DEFAULT 0,
+            incorrect_count BIGINT NOT NULL DEFAULT 0,
+            last_practiced_at TIMESTAMPTZ,
+            PRIMARY KEY (user_id, list_name)
+        )
+    """
+    )
+    op.execute("ALTER TABLE users ADD COLUMN progress_summary_ready BOOLEAN NOT NULL DEFAULT TRUE")
+    op.execute("UPDATE users SET progress_summary_ready = FALSE WHERE id IN (SELECT DISTINCT user_id FROM user_progress)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS progress_summary_ready")
+    op.execute("DROP TABLE IF EXISTS user_progress_summary")
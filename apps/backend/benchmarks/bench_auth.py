@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Microbenchmark of the get_current_user dependency with and without the verified-token cache.
+
+Run from apps/backend: python benchmarks/bench_auth.py [--sessions N] [--threads N]
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from common import report
+from core.auth_helpers import build_access_token
+from core.security import get_current_user, verified_tokens
+from fastapi.security import HTTPAuthorizationCredentials
+
+
+def run_load(tokens: list[str], requests_per_session: int, threads: int) -> list[float]:
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) for token in tokens]
+
+    def session(creds: HTTPAuthorizationCredentials) -> list[float]:
+        samples = []
+        for _ in range(requests_per_session):
+            start = time.perf_counter()
+            get_current_user(creds)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [sample for samples in pool.map(session, credentials) for sample in samples]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200, help="distinct access tokens")
+    parser.add_argument("--requests", type=int, default=50, help="requests per session")
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    tokens = [build_access_token(user_id, f"user_{user_id}") for user_id in range(args.sessions)]
+
+    verified_tokens.max_size = 0
+    verified_tokens.clear()
+    report("jwt.decode on every request", run_load(tokens, args.requests, args.threads))
+
+    verified_tokens.max_size = args.sessions
+    verified_tokens.clear()
+    report("verified-token cache", run_load(tokens, args.requests, args.threads))
+    stats = verified_tokens.stats()
+    print(f"cache hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Per-request logging overhead on the calling thread, synchronous vs queued, plus masking cost.
+
+Run from apps/backend: python benchmarks/bench_logging.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+
+from common import measure
+from core.logging import configure_logging, mask_sensitive_data
+from core.request_logging import RequestLoggingMiddleware
+from starlette.requests import Request
+
+REQUEST_SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/api/user/progress",
+    "headers": [(b"user-agent", b"benchmark")],
+    "client": ("10.0.0.1", 50000),
+    "query_string": b"",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    middleware = RequestLoggingMiddleware(app=None)
+    request = Request(REQUEST_SCOPE)
+
+    def log_request() -> None:
+        middleware._log_request(request, 200, 12.5, "00000000-0000-0000-0000-000000000000")
+
+    with open(os.devnull, "w") as devnull:
+        for label, queue_size in (("sync JSON handler", 0), ("queued JSON handler", 10000)):
+            sys.stdout = devnull
+            configure_logging(log_level="INFO", json_format=True, queue_size=queue_size)
+            sys.stdout = sys.__stdout__
+            measure(f"request log line: {label}", log_request, iterations=args.iterations, warmup=500)
+        configure_logging(log_level="WARNING")
+
+    measure("mask: no candidate keywords", lambda: mask_sensitive_data("GET /api/user/progress 200"), iterations=args.iterations)
+    measure("mask: token in message", lambda: mask_sensitive_data("refresh failed token=abc123 for bob@example.com"), iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
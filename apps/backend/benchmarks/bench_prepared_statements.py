@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Planning time and latency of the hot queries as plain text vs named prepared statements.
+
+For every statement in the registry, EXPLAIN (SUMMARY) reports the planner time Postgres spends
+when the SQL arrives as text, against EXPLAIN EXECUTE once the prepared statement has settled on
+its cached plan. Read statements are then timed end to end both ways on the same connection;
+writes (progress upsert, refresh-token rotation, quiz question issue) are only explained, never run.
+
+Needs migrated and populated main and words databases, e.g. after loadtest_seed.py.
+Run from apps/backend: python benchmarks/bench_prepared_statements.py [--iterations N]
+"""
+
+import argparse
+import importlib
+import json
+import re
+import uuid
+
+from common import measure
+from core.config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_PORT,
+    DB_USER,
+    WORDS_DB_HOST,
+    WORDS_DB_NAME,
+    WORDS_DB_PASSWORD,
+    WORDS_DB_PORT,
+    WORDS_DB_USER,
+)
+from core.prepared import PreparedStatement, registered_statements
+import psycopg2
+
+# Importing these registers their statements (core.database and core.security come along with them)
+REGISTERING_MODULES = ("api.v2.auth", "api.v2.progress", "api.v2.vocabulary", "core.auth_helpers", "core.progress_writer", "core.quiz_engine")
+
+WORDS_STATEMENTS = {"active_version", "word_lists", "translations", "progress_vocabulary"}
+WRITE_STATEMENTS = {"progress_upsert", "rotate_refresh_token", "quiz_issue_question"}
+# Executions before the plan cache switches a statement to its generic plan
+GENERIC_PLAN_AFTER = 6
+UPSERT_BATCH = 20
+
+
+def as_text(statement: PreparedStatement) -> str:
+    return re.sub(r"\$(\d+)", lambda m: f"%s::{statement.param_types[int(m[1]) - 1]}", statement.sql)
+
+
+def text_args(statement: PreparedStatement, args: tuple) -> tuple:
+    return tuple(args[int(m[1]) - 1] for m in re.finditer(r"\$(\d+)", statement.sql))
+
+
+def sample_args(main, words) -> dict[str, tuple]:
+    with words.cursor() as cur:
+        cur.execute("SELECT get_active_version_id()")
+        version_id = cur.fetchone()[0]
+        cur.execute("SELECT list_name FROM vocabulary_items WHERE version_id = %s GROUP BY list_name ORDER BY COUNT(*) DESC LIMIT 1", (version_id,))
+        list_name = cur.fetchone()[0]
+    with main.cursor() as cur:
+        cur.execute("SELECT user_id FROM user_progress LIMIT 1")
+        user_id = cur.fetchone()[0]
+        cur.execute("SELECT username FROM users WHERE id = %s", (user_id,))
+        username = cur.fetchone()[0]
+        cur.execute("SELECT vocabulary_item_id::text FROM user_progress WHERE user_id = %s", (user_id,))
+        item_ids = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT token_hash FROM refresh_tokens LIMIT 1")
+        token = cur.fetchone()
+    main.rollback()
+    words.rollback()
+
+    batch = [str(uuid.uuid4()) for _ in range(UPSERT_BATCH)]
+    return {
+        "active_version": (),
+        "word_lists": (version_id,),
+        "translations": (list_name, version_id),
+        "progress_read": (user_id,),
+        "progress_vocabulary": (item_ids, version_id, None),
+        "progress_upsert": (
+            user_id,
+            batch,
+            [list_name] * UPSERT_BATCH,
+            [1] * UPSERT_BATCH,
+            list(range(UPSERT_BATCH)),
+            [1] * UPSERT_BATCH,
+            [0] * UPSERT_BATCH,
+            [1] * UPSERT_BATCH,
+            ["{t}"] * UPSERT_BATCH,
+            [None] * UPSERT_BATCH,
+            None,
+            None,
+        ),
+        "user_by_username": (username,),
+        "user_is_admin": (user_id,),
+        "user_progress_version": (user_id,),
+        "quiz_issue_question": (user_id, item_ids[0], 1),
+        "refresh_token_by_hash": (token[0] if token else "missing",),
+        "rotate_refresh_token": ("missing", "bench-" + uuid.uuid4().hex, "2099-01-01T00:00:00Z"),
+    }
+
+
+def planning_ms(cur, query: str, args: tuple) -> float:
+    cur.execute(f"EXPLAIN (SUMMARY, FORMAT JSON) {query}", args)
+    plan = cur.fetchone()[0]
+    return float((plan if isinstance(plan, list) else json.loads(plan))[0]["Planning Time"])
+
+
+def run(conn, statement: PreparedStatement, args: tuple, iterations: int) -> None:
+    text_query, text_params = as_text(statement), text_args(statement, args)
+    # The prelude (the progress writer's advisory lock) is the caller's business, not the statement's
+    execute_query = statement.execute_sql.removeprefix(statement.prelude)
+    cur = conn.cursor()
+    cur.execute(f"DEALLOCATE ALL; {statement.prepare_sql}")
+    for _ in range(GENERIC_PLAN_AFTER):
+        cur.execute(f"EXPLAIN {execute_query}", args)
+        cur.fetchall()
+
+    text_plan = sorted(planning_ms(cur, text_query, text_params) for _ in range(50))[25]
+    prepared_plan = sorted(planning_ms(cur, execute_query, args) for _ in range(50))[25]
+    print(f"{statement.name:<48} planning text={text_plan:.3f}ms  prepared={prepared_plan:.3f}ms")
+
+    if statement.name not in WRITE_STATEMENTS:
+
+        def plain() -> None:
+            cur.execute(text_query, text_params)
+            cur.fetchall()
+
+        def prepared() -> None:
+            cur.execute(execute_query, args)
+            cur.fetchall()
+
+        measure(f"{statement.name} text", plain, iterations=iterations)
+        measure(f"{statement.name} prepared", prepared, iterations=iterations)
+    conn.rollback()
+    cur.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    for module in REGISTERING_MODULES:
+        importlib.import_module(module)
+
+    main_conn = psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    words_conn = psycopg2.connect(host=WORDS_DB_HOST, port=WORDS_DB_PORT, dbname=WORDS_DB_NAME, user=WORDS_DB_USER, password=WORDS_DB_PASSWORD)
+    try:
+        samples = sample_args(main_conn, words_conn)
+        for statement in registered_statements():
+            run(words_conn if statement.name in WORDS_STATEMENTS else main_conn, statement, samples[statement.name], args.iterations)
+    finally:
+        main_conn.close()
+        words_conn.close()
+
+
+if __name__ == "__main__":
+    main()
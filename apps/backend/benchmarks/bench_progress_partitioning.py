@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Progress upsert throughput and per-user read latency: single heap vs hash-partitioned user_progress.
+
+Builds two scratch tables in the main database with the pre- and post-partitioning layouts
+(bench_progress_heap keeps the redundant idx_progress_user_vocab), fills both with the same rows,
+then replays the backend's bulk upsert and progress read against each. Filling 100M rows takes
+a while and needs roughly 40 GB of disk per table; --reuse skips the fill on a second run.
+
+Run from apps/backend: python benchmarks/bench_progress_partitioning.py [--rows N] [--per-user N] [--reuse] [--keep]
+"""
+
+import argparse
+import hashlib
+import random
+import time
+import uuid
+
+from common import measure
+from core.config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER
+import psycopg2
+
+PARTITIONS = 16
+UPSERT_BATCH = 20
+
+COLUMNS = """
+    user_id INTEGER NOT NULL,
+    vocabulary_item_id UUID NOT NULL,
+    level SMALLINT NOT NULL CHECK (level BETWEEN 0 AND 5),
+    queue_position INTEGER NOT NULL CHECK (queue_position >= 0),
+    consecutive_correct SMALLINT NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0 CHECK (correct_count >= 0),
+    incorrect_count INTEGER NOT NULL DEFAULT 0 CHECK (incorrect_count >= 0),
+    recent_history BOOLEAN[] DEFAULT '{}',
+    first_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_practiced_at TIMESTAMPTZ,
+    pronunciation_passed BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (user_id, vocabulary_item_id)
+"""
+
+# User u holds items (u * 7919 + g) mod vocab for g < per_user, as in loadtest_seed.py
+FILL_SQL = """
+    INSERT INTO {table} (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count,
+                         consecutive_correct, recent_history, last_practiced_at)
+    SELECT u, md5(((u * 7919 + g) %% %(vocab)s)::text)::uuid,
+           (random() * 5)::int, g, (random() * 20)::int, (random() * 10)::int,
+           (random() * 3)::int, ARRAY[random() > 0.3, random() > 0.3, random() > 0.3],
+           NOW() - random() * INTERVAL '90 days'
+    FROM generate_series(%(low)s, %(high)s) AS u
+    CROSS JOIN generate_series(0, %(per_user)s - 1) AS g
+"""
+
+UPSERT_SQL = """
+    INSERT INTO {table}
+    (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, recent_history, pronunciation_passed, last_practiced_at)
+    VALUES {values}
+    ON CONFLICT (user_id, vocabulary_item_id)
+    DO UPDATE SET
+        level = EXCLUDED.level,
+        queue_position = EXCLUDED.queue_position,
+        correct_count = EXCLUDED.correct_count,
+        incorrect_count = EXCLUDED.incorrect_count,
+        consecutive_correct = EXCLUDED.consecutive_correct,
+        recent_history = EXCLUDED.recent_history,
+        pronunciation_passed = COALESCE(EXCLUDED.pronunciation_passed, {table}.pronunciation_passed),
+        last_practiced_at = EXCLUDED.last_practiced_at
+"""
+
+READ_SQL = """
+    SELECT vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct,
+           COALESCE(recent_history, '{{}}') as recent_history,
+           TO_CHAR(last_practiced_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as last_practiced,
+           pronunciation_passed
+    FROM {table}
+    WHERE user_id = %s
+    ORDER BY last_practiced_at DESC
+"""
+
+SIZE_SQL = """
+    SELECT COALESCE(SUM(pg_table_size(relid)), 0), COALESCE(SUM(pg_indexes_size(relid)), 0)
+    FROM (SELECT %(table)s::regclass AS relid UNION ALL SELECT inhrelid FROM pg_inherits WHERE inhparent = %(table)s::regclass) AS t
+"""
+
+LAYOUTS = {
+    "bench_progress_heap": (
+        [f"CREATE TABLE bench_progress_heap ({COLUMNS})"],
+        ["bench_heap_user_vocab ON bench_progress_heap(user_id, vocabulary_item_id)"],
+    ),
+    "bench_progress_hash": (
+        [f"CREATE TABLE bench_progress_hash ({COLUMNS}) PARTITION BY HASH (user_id)"]
+        + [
+            f"CREATE TABLE bench_progress_hash_p{i:02d} PARTITION OF bench_progress_hash FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})"
+            for i in range(PARTITIONS)
+        ],
+        [],
+    ),
+}
+
+
+def vocabulary_item_id(index: int) -> str:
+    return str(uuid.UUID(hashlib.md5(str(index).encode(), usedforsecurity=False).hexdigest()))
+
+
+def table_exists(conn, table: str) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+        return bool(cur.fetchone()[0])
+
+
+def build(conn, table: str, args: argparse.Namespace) -> None:
+    definition, extra_indexes = LAYOUTS[table]
+    users = args.rows // args.per_user
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in definition:
+            cur.execute(statement)
+        conn.commit()
+
+        start = time.perf_counter()
+        for low in range(1, users + 1, args.batch_users):
+            cur.execute(
+                FILL_SQL.format(table=table),
+                {"vocab": args.vocab, "low": low, "high": min(users, low + args.batch_users - 1), "per_user": args.per_user},
+            )
+            conn.commit()
+            print(f"{table}: {min(users, low + args.batch_users - 1) * args.per_user} rows ({time.perf_counter() - start:.0f}s)", flush=True)
+
+        for index in [
+            f"{table}_user_level ON {table}(user_id, level)",
+            f"{table}_user_queue ON {table}(user_id, queue_position)",
+            f"{table}_last_practiced ON {table}(user_id, last_practiced_at)",
+            *extra_indexes,
+        ]:
+            cur.execute(f"CREATE INDEX {index}")
+        cur.execute(f"ANALYZE {table}")
+        conn.commit()
+    print(f"{table}: built in {time.perf_counter() - start:.0f}s")
+
+
+def run(conn, table: str, args: argparse.Namespace) -> None:
+    users = args.rows // args.per_user
+    rng = random.Random(args.seed)
+    upsert_sql = UPSERT_SQL.format(table=table, values=", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, FALSE), NOW())"] * UPSERT_BATCH))
+    read_sql = READ_SQL.format(table=table)
+    cur = conn.cursor()
+
+    def upsert() -> None:
+        user_id = rng.randint(1, users)
+        # Half of each batch hits rows the user already has, half inserts new ones
+        positions = rng.sample(range(args.per_user * 2), UPSERT_BATCH)
+        params: list = []
+        for position in positions:
+            params.extend(
+                [
+                    user_id,
+                    vocabulary_item_id((user_id * 7919 + position) % args.vocab),
+                    rng.randint(0, 5),
+                    position,
+                    rng.randint(0, 20),
+                    rng.randint(0, 10),
+                    rng.randint(0, 3),
+                    [rng.random() > 0.3 for _ in range(5)],
+                    None,
+                ]
+            )
+        cur.execute(upsert_sql, params)
+        conn.commit()
+
+    def read() -> None:
+        cur.execute(read_sql, (rng.randint(1, users),))
+        cur.fetchall()
+        conn.commit()
+
+    samples = measure(f"{table} upsert x{UPSERT_BATCH}", upsert, iterations=args.iterations)
+    print(f"{'':<48} {UPSERT_BATCH * 1000 * len(samples) / sum(samples):,.0f} rows/s")
+    measure(f"{table} per-user read ({args.per_user} rows)", read, iterations=args.iterations)
+
+    cur.execute(SIZE_SQL, {"table": table})
+    table_bytes, index_bytes = cur.fetchone()
+    conn.commit()
+    print(f"{'':<48} table={table_bytes / 2**30:.2f}GiB  indexes={index_bytes / 2**30:.2f}GiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000_000)
+    parser.add_argument("--per-user", type=int, default=100, help="progress rows per user")
+    parser.add_argument("--vocab", type=int, default=50_000, help="distinct vocabulary ids")
+    parser.add_argument("--batch-users", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reuse", action="store_true", help="keep existing scratch tables instead of rebuilding")
+    parser.add_argument("--keep", action="store_true", help="leave the scratch tables behind")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    try:
+        for table in LAYOUTS:
+            if not (args.reuse and table_exists(conn, table)):
+                build(conn, table, args)
+        for table in LAYOUTS:
+            run(conn, table, args)
+    finally:
+        if not args.keep:
+            with conn.cursor() as cur:
+                for table in LAYOUTS:
+                    cur.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Refresh-token rotation and purge against a large refresh_tokens table.
+
+Needs a migrated main database. Run from apps/backend:
+python benchmarks/bench_refresh_tokens.py [--rows N] [--rotations N]
+"""
+
+import argparse
+import time
+
+from common import measure
+from core.auth_helpers import (
+    build_access_token,
+    create_and_store_refresh_token,
+    purge_refresh_tokens,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from core.database import execute_write_transaction, init_pools, query_db
+from core.security import verify_refresh_token
+
+BENCH_USERNAME = "bench_refresh_tokens"
+
+# One third expired, one third revoked two days ago, one third still valid
+SEED_SQL = """
+    INSERT INTO refresh_tokens (user_id, token_hash, expires_at, revoked_at)
+    SELECT %s,
+           'bench-' || md5(i::text) || i,
+           CASE WHEN i % 3 = 0 THEN NOW() - INTERVAL '1 day' ELSE NOW() + INTERVAL '7 days' END,
+           CASE WHEN i % 3 = 1 THEN NOW() - INTERVAL '2 days' END
+    FROM generate_series(1, %s) AS i
+"""
+
+
+def legacy_refresh(token: str) -> str:
+    user_data = verify_refresh_token(token)
+    user = query_db("SELECT id, username, is_admin FROM users WHERE id = %s", (user_data["user_id"],), one=True)
+    build_access_token(user["id"], user["username"], user["is_admin"])
+    revoke_refresh_token(token)
+    result: str = create_and_store_refresh_token(user["id"])
+    return result
+
+
+def rotating_refresh(token: str) -> str:
+    user, new_token = rotate_refresh_token(token)
+    build_access_token(user["id"], user["username"], user["is_admin"])
+    return new_token
+
+
+def run_chain(label: str, user_id: int, refresh, rotations: int) -> None:
+    token = create_and_store_refresh_token(user_id)
+
+    def step() -> None:
+        nonlocal token
+        token = refresh(token)
+
+    measure(label, step, iterations=rotations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=3_000_000, help="seeded refresh_tokens rows")
+    parser.add_argument("--rotations", type=int, default=500)
+    args = parser.parse_args()
+
+    init_pools()
+
+    execute_write_transaction("DELETE FROM users WHERE username = %s", (BENCH_USERNAME,))
+    user = execute_write_transaction(
+        "INSERT INTO users (username, password) VALUES (%s, 'x') RETURNING id",
+        (BENCH_USERNAME,),
+        fetch_results=True,
+        one=True,
+    )
+    user_id = user["id"]
+
+    try:
+        start = time.perf_counter()
+        execute_write_transaction(SEED_SQL, (user_id, args.rows))
+        execute_write_transaction("ANALYZE refresh_tokens")
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        run_chain("refresh: verify + select + revoke + insert", user_id, legacy_refresh, args.rotations)
+        run_chain("refresh: single CTE round-trip", user_id, rotating_refresh, args.rotations)
+
+        start = time.perf_counter()
+        purged = purge_refresh_tokens()
+        print(f"purged {purged} rows in {time.perf_counter() - start:.1f}s")
+
+        run_chain("refresh after purge: single CTE round-trip", user_id, rotating_refresh, args.rotations)
+    finally:
+        execute_write_transaction("DELETE FROM users WHERE id = %s", (user_id,))
+
+
+if __name__ == "__main__":
+    main()
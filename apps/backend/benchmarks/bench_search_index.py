@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Admin typeahead latency against the in-memory trigram index built from data/vocabularies.
+
+Run from apps/backend: python benchmarks/bench_search_index.py [--iterations N]
+"""
+
+import argparse
+import json
+from pathlib import Path
+import time
+import uuid
+
+from common import measure
+from core.search_index import TrigramIndex
+
+VOCABULARY_DIR = Path(__file__).parent.parent.parent.parent / "data" / "vocabularies"
+QUERIES = ("hous", "casa", "Haus", "дом", "wrld", "a")
+
+
+def load_items() -> list[dict]:
+    items = []
+    for path in sorted(VOCABULARY_DIR.glob("*.json")):
+        data = json.loads(path.read_text())
+        for word in data.get("words", []):
+            items.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "source_text": word.get("sourceText", ""),
+                    "target_text": word.get("targetText", ""),
+                    "list_name": data.get("listName", path.stem),
+                    "is_active": True,
+                }
+            )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    items = load_items()
+    start = time.perf_counter()
+    index = TrigramIndex(items)
+    print(f"indexed {len(items)} items in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    for query in QUERIES:
+        measure(f"typeahead: {query!r}", lambda query=query: index.search(query, 10), iterations=args.iterations, warmup=50)
+
+
+if __name__ == "__main__":
+    main()
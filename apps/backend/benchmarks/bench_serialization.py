@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Per-endpoint serialization benchmark: validated models vs trusted database rows.
+
+Run from apps/backend: python benchmarks/bench_serialization.py [--rows N]
+"""
+
+import argparse
+import uuid
+
+from common import measure
+from core.database import serialize_rows, serialize_trusted_rows
+from core.json_encoder import CustomJSONResponse
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from generated.schemas import UserProgressResponse, VocabularyItemResponse
+
+TRANSLATION_COLUMNS = [
+    "id",
+    "source_text",
+    "source_language",
+    "target_text",
+    "target_language",
+    "list_name",
+    "difficulty_level",
+    "source_usage_example",
+    "target_usage_example",
+]
+PROGRESS_COLUMNS = [
+    "vocabulary_item_id",
+    "level",
+    "queue_position",
+    "correct_count",
+    "incorrect_count",
+    "consecutive_correct",
+    "recent_history",
+    "last_practiced",
+    "pronunciation_passed",
+    "source_text",
+    "source_language",
+    "target_language",
+]
+
+
+def build_translation_rows(count: int) -> list[tuple]:
+    return [
+        (str(uuid.uuid4()), f"word_{i}", "en", f"слово_{i}", "ru", "english-russian-a1", "a1", f"Example {i}", f"Пример {i}") for i in range(count)
+    ]
+
+
+def build_progress_rows(count: int) -> list[tuple]:
+    return [
+        (str(uuid.uuid4()), i % 6, i, i % 7, i % 3, i % 4, [True, False, True], "2026-01-01T00:00:00Z", False, f"word_{i}", "en", "ru")
+        for i in range(count)
+    ]
+
+
+def build_app(translations: list[tuple], progress: list[tuple]) -> FastAPI:
+    app = FastAPI(default_response_class=CustomJSONResponse)
+    translation_dicts = [dict(zip(TRANSLATION_COLUMNS, row, strict=True)) for row in translations]
+    progress_dicts = [dict(zip(PROGRESS_COLUMNS, row, strict=True)) for row in progress]
+
+    @app.get("/validated/translations")
+    def validated_translations() -> list[VocabularyItemResponse]:
+        return serialize_rows(translation_dicts, VocabularyItemResponse) or []
+
+    @app.get("/trusted/translations", response_model=list[VocabularyItemResponse])
+    def trusted_translations() -> Response:
+        return serialize_trusted_rows(TRANSLATION_COLUMNS, translations, VocabularyItemResponse)
+
+    @app.get("/validated/progress")
+    def validated_progress() -> list[UserProgressResponse]:
+        return serialize_rows(progress_dicts, UserProgressResponse) or []
+
+    @app.get("/trusted/progress", response_model=list[UserProgressResponse])
+    def trusted_progress() -> Response:
+        return serialize_trusted_rows(PROGRESS_COLUMNS, progress, UserProgressResponse)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000, help="rows per response")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(build_translation_rows(args.rows), build_progress_rows(args.rows)))
+    for endpoint in ("translations", "progress"):
+        validated = client.get(f"/validated/{endpoint}").json()
+        trusted = client.get(f"/trusted/{endpoint}").json()
+        if validated != trusted:
+            raise SystemExit(f"Trusted {endpoint} payload differs from validated payload")
+
+        print(f"/api/{endpoint} ({args.rows} rows)")
+        measure("  validated (model_validate + response model)", lambda e=endpoint: client.get(f"/validated/{e}"), args.iterations)
+        measure("  trusted (tuple rows, pre-encoded JSON)", lambda e=endpoint: client.get(f"/trusted/{e}"), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
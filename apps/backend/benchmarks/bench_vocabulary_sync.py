@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Wall time and WAL volume of sync_vocabulary.sync() over the full data/vocabularies corpus.
+
+Scenarios: a full resync of unchanged content (manifest cleared), a no-op run, a one-word edit and
+its revert. Every sync that builds a version first copies the whole live version, so the copy alone
+is also measured (in a rolled-back transaction); it is the floor under any non-no-op sync.
+
+While each sync runs, a second connection keeps updating one live row the way the admin API does and
+the longest wait is reported: admin writes block on the sync's table lock from the copy until the
+new version is activated. Readers never block.
+
+Needs a migrated words database that the benchmark may write to. Run from apps/backend:
+python benchmarks/bench_vocabulary_sync.py
+"""
+
+import argparse
+import contextlib
+import io
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+
+from common import BACKEND_DIR
+import psycopg2
+import sync_vocabulary
+
+VOCABULARY_DIR = BACKEND_DIR.parent.parent / "data" / "vocabularies"
+
+STATS_SQL = """
+    SELECT pg_current_wal_lsn(), n_tup_ins, n_tup_upd, n_tup_del
+    FROM pg_stat_user_tables WHERE relname = 'vocabulary_items'
+"""
+
+
+def snapshot(conn) -> tuple:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_stat_force_next_flush()")
+        cur.execute(STATS_SQL)
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+ADMIN_WRITE_SQL = """
+    UPDATE vocabulary_items SET rank = rank
+    WHERE version_id = (SELECT id FROM content_versions WHERE is_active) AND id = %s
+"""
+
+
+def connect():
+    return psycopg2.connect(
+        host=sync_vocabulary.WORDS_DB_HOST,
+        port=sync_vocabulary.WORDS_DB_PORT,
+        dbname=sync_vocabulary.WORDS_DB_NAME,
+        user=sync_vocabulary.WORDS_DB_USER,
+        password=sync_vocabulary.WORDS_DB_PASSWORD,
+    )
+
+
+@contextlib.contextmanager
+def admin_writes(item_id):
+    waits: list[float] = []
+    if item_id is None:
+        yield waits
+        return
+    stop = threading.Event()
+
+    def write() -> None:
+        conn = connect()
+        try:
+            with conn.cursor() as cur:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    cur.execute(ADMIN_WRITE_SQL, (item_id,))
+                    conn.commit()
+                    waits.append((time.perf_counter() - start) * 1000)
+                    time.sleep(0.005)
+        finally:
+            conn.close()
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    try:
+        yield waits
+    finally:
+        stop.set()
+        writer.join()
+
+
+def wal_since(conn, before) -> int:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (before,))
+        wal_bytes = int(cur.fetchone()[0])
+    conn.commit()
+    return wal_bytes
+
+
+def run(conn, label: str, vocabulary_dir: Path, item_id) -> None:
+    before = snapshot(conn)
+    output = io.StringIO()
+    with admin_writes(item_id) as waits:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            sync_vocabulary.sync(conn, str(vocabulary_dir))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    after = snapshot(conn)
+
+    wal_bytes = wal_since(conn, before[0])
+    inserted, updated, deleted = (after[i] - before[i] for i in (1, 2, 3))
+    print(
+        f"{label:<36} {elapsed_ms:9.1f}ms  wal={wal_bytes / 1024:9.1f}KiB  ins={inserted} upd={updated} del={deleted}"
+        f"  admin write max wait={max(waits, default=0.0):8.1f}ms"
+    )
+
+
+def run_copy(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM content_versions WHERE is_active")
+        previous_version_id = cur.fetchone()[0]
+        cur.execute("SELECT pg_current_wal_lsn()")
+        before = cur.fetchone()[0]
+        start = time.perf_counter()
+        cur.execute(sync_vocabulary.CREATE_VERSION_SQL, ("bench",))
+        params = {"version_id": cur.fetchone()[0], "previous_version_id": previous_version_id}
+        cur.execute(sync_vocabulary.COPY_VERSION_ITEMS_SQL, params)
+        copied = cur.rowcount
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    conn.rollback()
+    wal_bytes = wal_since(conn, before)
+    print(f"{'copy of live version (rolled back)':<36} {elapsed_ms:9.1f}ms  wal={wal_bytes / 1024:9.1f}KiB  ins={copied}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocabulary-dir", type=Path, default=VOCABULARY_DIR)
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        run(conn, "initial sync", args.vocabulary_dir, None)
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM vocabulary_items WHERE version_id = (SELECT id FROM content_versions WHERE is_active) LIMIT 1")
+            item_id = cur.fetchone()[0]
+        conn.commit()
+        run_copy(conn)
+
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM vocabulary_file_manifest")
+            cur.execute("UPDATE content_versions SET description = NULL WHERE is_active")
+        conn.commit()
+        run(conn, "full resync, content unchanged", args.vocabulary_dir, item_id)
+        run(conn, "no-op (hash unchanged)", args.vocabulary_dir, item_id)
+
+        with tempfile.TemporaryDirectory() as edited:
+            edited_dir = Path(edited)
+            for path in args.vocabulary_dir.glob("*.json"):
+                shutil.copy(path, edited_dir / path.name)
+            target = sorted(edited_dir.glob("*.json"))[0]
+            data = json.loads(target.read_text())
+            data["words"][0]["targetText"] += " (bench)"
+            target.write_text(json.dumps(data, ensure_ascii=False, indent=2))
+            run(conn, f"one word changed in {target.name}", edited_dir, item_id)
+        run(conn, "revert one-word change", args.vocabulary_dir, item_id)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+import statistics
+import sys
+import time
+
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-not-for-production-use")  # pragma: allowlist secret
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+LOADTEST_USER_PREFIX = "loadtest_user_"
+LOADTEST_PASSWORD = "LoadTest-Passw0rd!"  # pragma: allowlist secret
+
+BACKEND_DIR = Path(__file__).parent.parent
+BACKEND_SRC = BACKEND_DIR / "src"
+for path in (BACKEND_DIR, BACKEND_SRC):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+def measure(label: str, func, iterations: int = 200, warmup: int = 10) -> list[float]:
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    report(label, samples)
+    return samples
+
+
+def report(label: str, samples_ms: list[float]) -> None:
+    ordered = sorted(samples_ms)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<48} median={statistics.median(ordered):8.3f}ms  p95={p95:8.3f}ms  n={len(ordered)}")
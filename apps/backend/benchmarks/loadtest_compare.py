@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Compare two loadtest_run.py reports and flag latency or throughput regressions.
+
+Run from apps/backend: python benchmarks/loadtest_compare.py baseline.json candidate.json [--threshold 0.1]
+Exits non-zero when any journey's p95/p99 grows, or its RPS drops, by more than the threshold.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def relative_change(baseline: float, candidate: float) -> float:
+    return (candidate - baseline) / baseline if baseline else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative regression")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"baseline={baseline['commit'] or 'unknown'} candidate={candidate['commit'] or 'unknown'}")
+    print(f"{'journey':<20}{'metric':>8}{'baseline':>12}{'candidate':>12}{'change':>10}")
+
+    regressions = []
+    for name, before in baseline["journeys"].items():
+        after = candidate["journeys"].get(name)
+        if after is None:
+            continue
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("rps", False)):
+            change = relative_change(before[metric], after[metric])
+            regressed = metric != "p50_ms" and (change > args.threshold if higher_is_worse else change < -args.threshold)
+            marker = "  <-- regression" if regressed else ""
+            print(f"{name:<20}{metric:>8}{before[metric]:>12.1f}{after[metric]:>12.1f}{change:>+10.1%}{marker}")
+            if regressed:
+                regressions.append(f"{name} {metric}")
+
+    if regressions:
+        raise SystemExit(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Drive scripted user journeys against a running backend and write a latency/RPS report.
+
+Each virtual user logs in as a seeded load-test user, then loops over weighted journeys:
+word lists, translations, progress reads, bulk progress saves, TTS synthesis and re-login.
+The JSON report holds p50/p95/p99 and RPS per journey and can be diffed with loadtest_compare.py.
+
+Run from apps/backend: python benchmarks/loadtest_run.py --base-url http://localhost:9000 [--users N] [--duration S]
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+import datetime
+import json
+from pathlib import Path
+import random
+import statistics
+import subprocess  # nosec B404
+import time
+
+from common import LOADTEST_PASSWORD, LOADTEST_USER_PREFIX
+import httpx
+
+JOURNEY_WEIGHTS = {
+    "word_lists": 10,
+    "translations": 25,
+    "progress_read": 25,
+    "progress_bulk_save": 25,
+    "tts": 10,
+    "login": 5,
+}
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def timed(self, name: str, request) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, username: str) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.username = username
+        self.headers: dict[str, str] = {}
+        self.list_names: list[str] = []
+        self.items: list[dict] = []
+
+    async def login(self) -> bool:
+        response = await self.recorder.timed(
+            "login", self.client.post("/api/auth/login", json={"username": self.username, "password": LOADTEST_PASSWORD})
+        )
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        return True
+
+    async def word_lists(self) -> None:
+        response = await self.recorder.timed("word_lists", self.client.get("/api/word-lists", headers=self.headers))
+        if response is not None and response.status_code == 200:
+            self.list_names = [item["listName"] for item in response.json()]
+
+    async def translations(self) -> None:
+        if not self.list_names:
+            await self.word_lists()
+            return
+        params = {"list_name": random.choice(self.list_names)}  # nosec B311
+        response = await self.recorder.timed("translations", self.client.get("/api/translations", params=params, headers=self.headers))
+        if response is not None and response.status_code == 200:
+            self.items = response.json()
+
+    async def progress_read(self) -> None:
+        await self.recorder.timed("progress_read", self.client.get("/api/user/progress", headers=self.headers))
+
+    async def progress_bulk_save(self) -> None:
+        if not self.items:
+            await self.translations()
+            return
+        batch = random.sample(self.items, min(20, len(self.items)))  # nosec B311
+        payload = {
+            "items": [
+                {
+                    "vocabularyItemId": item["id"],
+                    "level": random.randint(0, 5),  # nosec B311
+                    "queuePosition": position,
+                    "correctCount": random.randint(0, 20),  # nosec B311
+                    "incorrectCount": random.randint(0, 10),  # nosec B311
+                    "consecutiveCorrect": random.randint(0, 3),  # nosec B311
+                    "recentHistory": [random.random() > 0.3 for _ in range(5)],  # nosec B311
+                }
+                for position, item in enumerate(batch)
+            ]
+        }
+        await self.recorder.timed("progress_bulk_save", self.client.post("/api/user/progress/bulk", json=payload, headers=self.headers))
+
+    async def tts(self) -> None:
+        if not self.items:
+            await self.translations()
+            return
+        item = random.choice(self.items)  # nosec B311
+        payload = {"text": item["sourceText"], "language": item["sourceLanguage"]}
+        await self.recorder.timed("tts", self.client.post("/api/tts/synthesize", json=payload, headers=self.headers))
+
+    async def run(self, deadline: float) -> None:
+        if not await self.login():
+            return
+        journeys = list(JOURNEY_WEIGHTS)
+        weights = list(JOURNEY_WEIGHTS.values())
+        while time.perf_counter() < deadline:
+            await getattr(self, random.choices(journeys, weights)[0])()  # nosec B311
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def build_report(recorder: Recorder, elapsed: float, args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False).stdout.strip()  # nosec B603 B607
+    except OSError:
+        commit = ""
+
+    journeys = {}
+    for name, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        journeys[name] = {
+            "requests": len(ordered),
+            "errors": recorder.errors[name],
+            "rps": round(len(ordered) / elapsed, 2),
+            "p50_ms": round(statistics.median(ordered), 2),
+            "p95_ms": round(percentile(ordered, 0.95), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+        }
+
+    total = sum(journey["requests"] for journey in journeys.values())
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "config": {"base_url": args.base_url, "users": args.users, "duration_s": args.duration, "seed": args.seed},
+        "elapsed_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_rps": round(total / elapsed, 2),
+        "journeys": journeys,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"commit={report['commit'] or 'unknown'} requests={report['total_requests']} rps={report['total_rps']}")
+    print(f"{'journey':<20}{'requests':>10}{'errors':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, journey in report["journeys"].items():
+        print(
+            f"{name:<20}{journey['requests']:>10}{journey['errors']:>8}{journey['rps']:>10.1f}"
+            f"{journey['p50_ms']:>10.1f}{journey['p95_ms']:>10.1f}{journey['p99_ms']:>10.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> dict:
+    random.seed(args.seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    headers = {"Origin": args.origin}
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        usernames = [f"{LOADTEST_USER_PREFIX}{random.randint(1, args.seeded_users)}" for _ in range(args.users)]  # nosec B311
+        await asyncio.gather(*(VirtualUser(client, recorder, username).run(deadline) for username in usernames))
+        elapsed = time.perf_counter() - start
+    return build_report(recorder, elapsed, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--origin", default="http://localhost:8080", help="must be in the backend's CORS_ALLOWED_ORIGINS")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--seeded-users", type=int, default=100_000, help="users created by loadtest_seed.py")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
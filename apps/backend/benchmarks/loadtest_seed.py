@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Seed the main database with load-test users and progress rows.
+
+Vocabulary comes from sync_vocabulary.py (all of data/vocabularies), which the backend runs at
+startup with SYNC_VOCABULARY=true. This script adds LOADTEST users sharing one password and
+spreads progress rows across them using the active vocabulary ids from the words database.
+
+Run from apps/backend: python benchmarks/loadtest_seed.py [--users N] [--progress-rows N]
+"""
+
+import argparse
+import time
+
+import bcrypt
+from common import LOADTEST_PASSWORD, LOADTEST_USER_PREFIX
+from core.config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_PORT,
+    DB_USER,
+    WORDS_DB_HOST,
+    WORDS_DB_NAME,
+    WORDS_DB_PASSWORD,
+    WORDS_DB_PORT,
+    WORDS_DB_USER,
+)
+import psycopg2
+from psycopg2.extras import execute_values
+
+SEED_USERS_SQL = """
+    INSERT INTO users (username, password)
+    SELECT %s || i, %s FROM generate_series(1, %s) AS i
+    ON CONFLICT (username) DO NOTHING
+"""
+
+# Each user gets a deterministic, user-specific window of vocabulary ids
+SEED_PROGRESS_SQL = """
+    INSERT INTO user_progress
+        (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count,
+         consecutive_correct, recent_history, last_practiced_at)
+    SELECT u.id, v.id,
+           (random() * 5)::int, g, (random() * 20)::int, (random() * 10)::int,
+           (random() * 3)::int, ARRAY[random() > 0.3, random() > 0.3, random() > 0.3],
+           NOW() - random() * INTERVAL '90 days'
+    FROM users u
+    CROSS JOIN generate_series(0, %(per_user)s - 1) AS g
+    JOIN loadtest_vocab v ON v.idx = (u.id * 7919 + g) %% %(vocab_count)s
+    WHERE u.username LIKE %(prefix)s AND u.id BETWEEN %(low)s AND %(high)s
+    ON CONFLICT (user_id, vocabulary_item_id) DO NOTHING
+"""
+
+# Seeded rows bypass the progress writer, so their summaries are rebuilt on the first stats request
+FLAG_SUMMARIES_SQL = "UPDATE users SET progress_summary_ready = FALSE WHERE username LIKE %s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--progress-rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-users", type=int, default=5_000)
+    args = parser.parse_args()
+
+    words_conn = psycopg2.connect(host=WORDS_DB_HOST, port=WORDS_DB_PORT, dbname=WORDS_DB_NAME, user=WORDS_DB_USER, password=WORDS_DB_PASSWORD)
+    with words_conn, words_conn.cursor() as cur:
+        cur.execute(
+            """SELECT vi.id FROM vocabulary_items vi
+               JOIN content_versions cv ON cv.id = vi.version_id AND cv.is_active
+               WHERE vi.is_active ORDER BY vi.id"""
+        )
+        vocab_ids = [row[0] for row in cur.fetchall()]
+    words_conn.close()
+    if not vocab_ids:
+        raise SystemExit("No active vocabulary; run sync_vocabulary.py first")
+
+    per_user = min(len(vocab_ids), max(1, args.progress_rows // args.users))
+    print(f"{len(vocab_ids)} vocabulary items, {per_user} progress rows per user")
+
+    conn = psycopg2.connect(host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    try:
+        with conn.cursor() as cur:
+            start = time.perf_counter()
+            password_hash = bcrypt.hashpw(LOADTEST_PASSWORD.encode(), bcrypt.gensalt()).decode()
+            cur.execute(SEED_USERS_SQL, (LOADTEST_USER_PREFIX, password_hash, args.users))
+            conn.commit()
+            print(f"users: {cur.rowcount} inserted in {time.perf_counter() - start:.1f}s")
+
+            cur.execute("CREATE TEMP TABLE loadtest_vocab (idx INTEGER PRIMARY KEY, id UUID NOT NULL)")
+            execute_values(cur, "INSERT INTO loadtest_vocab (idx, id) VALUES %s", list(enumerate(vocab_ids)), page_size=1000)
+
+            cur.execute("SELECT MIN(id), MAX(id) FROM users WHERE username LIKE %s", (f"{LOADTEST_USER_PREFIX}%",))
+            low_id, high_id = cur.fetchone()
+            start = time.perf_counter()
+            inserted = 0
+            for low in range(low_id, high_id + 1, args.batch_users):
+                cur.execute(
+                    SEED_PROGRESS_SQL,
+                    {
+                        "per_user": per_user,
+                        "vocab_count": len(vocab_ids),
+                        "prefix": f"{LOADTEST_USER_PREFIX}%",
+                        "low": low,
+                        "high": low + args.batch_users - 1,
+                    },
+                )
+                conn.commit()
+                inserted += cur.rowcount
+                print(f"progress: {inserted} rows ({time.perf_counter() - start:.0f}s)", flush=True)
+
+            cur.execute(FLAG_SUMMARIES_SQL, (f"{LOADTEST_USER_PREFIX}%",))
+            conn.commit()
+
+            cur.execute("ANALYZE users")
+            cur.execute("ANALYZE user_progress")
+            conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
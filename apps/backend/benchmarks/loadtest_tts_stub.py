@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Stand-in for the Azure TTS endpoint: accepts any SSML POST and returns fixed MP3 bytes.
+
+Point the backend at it with AZURE_TTS_ENDPOINT=http://<host>:<port>/cognitiveservices/v1 and a
+non-empty AZURE_SPEECH_API_KEY. STUB_LATENCY_MS adds a fixed delay to mimic the upstream.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import time
+
+PORT = int(os.getenv("STUB_PORT", "9100"))
+LATENCY_SECONDS = float(os.getenv("STUB_LATENCY_MS", "80")) / 1000
+# MPEG-1 Layer III frame header followed by silence
+AUDIO = b"\xff\xfb\x90\x64" + b"\x00" * 4096
+
+
+class TTSStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(LATENCY_SECONDS)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(AUDIO)))
+        self.end_headers()
+        self.wfile.write(AUDIO)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    ThreadingHTTPServer(("0.0.0.0", PORT), TTSStubHandler).serve_forever()  # nosec B104
@@ -0,0 +1,5 @@
+#!/bin/bash
+set -e
+
+# Allow the replica profile's standby (postgres-replica) to stream WAL from this server
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
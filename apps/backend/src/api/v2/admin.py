@@ -1,18 +1,39 @@
+import base64
+import json
 from typing import Annotated
-
-from core.database import execute_words_write_transaction, query_words_db, serialize_rows
+from uuid import UUID
+
+from core.base_model import APIBaseModel
+from core.config import VOCABULARY_BULK_MAX_OPERATIONS, VOCABULARY_EXPORT_BATCH_SIZE, VOCABULARY_SEARCH_TIMEOUT_MS
+from core.database import (
+    execute_words_write_transaction,
+    query_words_db,
+    serialize_rows,
+    serialize_trusted_ndjson,
+    stream_words_db_tuples,
+)
 from core.dependencies import ActiveVersion, CurrentAdmin
 from core.error_handler import handle_api_errors
 from core.logging import get_logger
+from core.profiling import recent_profiles
 from core.rate_limit import limiter
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from core.search_index import get_search_index, mark_search_index_stale
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from generated.schemas import VocabularyItemCreate, VocabularyItemDetailResponse, VocabularyItemUpdate
+from pydantic import Field
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 VOCABULARY_ITEM_NOT_FOUND = "Vocabulary item not found"
 
+VOCABULARY_LIST_COLUMNS = """id, source_text, source_language, target_text, target_language,
+    list_name, difficulty_level, source_usage_example, target_usage_example,
+    is_active,
+    TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
+    TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at"""
+
 
 @router.get("/vocabulary/search")
 @handle_api_errors("Search vocabulary")
@@ -27,36 +48,78 @@ def search_vocabulary(
         extra={"admin": current_admin["username"], "query": query, "limit": limit},
     )
     results = query_words_db(
-        """SELECT id, source_text, source_language, target_text, target_language,
-                  list_name, difficulty_level, source_usage_example, target_usage_example,
-                  is_active,
-                  TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
-                  TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at,
-                  ts_rank(
-                    to_tsvector('simple', source_text || ' ' || target_text),
-                    plainto_tsquery('simple', %s)
-                  ) AS rank
+        f"""SELECT {VOCABULARY_LIST_COLUMNS},
+                  ts_rank(search_vector, plainto_tsquery('simple', %(query)s)) AS search_rank,
+                  GREATEST(similarity(source_text, %(query)s), similarity(target_text, %(query)s)) AS fuzzy_rank
            FROM vocabulary_items
-           WHERE version_id = %s
+           WHERE version_id = %(version_id)s
              AND (
-               to_tsvector('simple', source_text) @@ plainto_tsquery('simple', %s)
-               OR to_tsvector('simple', target_text) @@ plainto_tsquery('simple', %s)
-               OR similarity(source_text, %s) > 0.3
-               OR similarity(target_text, %s) > 0.3
+               search_vector @@ plainto_tsquery('simple', %(query)s)
+               OR source_text %% %(query)s
+               OR target_text %% %(query)s
              )
-           ORDER BY is_active DESC, rank DESC, source_text
-           LIMIT %s""",
-        (query, version_id, query, query, query, query, limit),
+           ORDER BY is_active DESC, search_rank DESC, fuzzy_rank DESC, source_text
+           LIMIT %(limit)s""",  # nosec B608
+        {"query": query, "version_id": version_id, "limit": limit},
+        primary=True,
+        timeout_ms=VOCABULARY_SEARCH_TIMEOUT_MS,
     )
 
     return serialize_rows(results, VocabularyItemDetailResponse) or []
 
 
+@router.get("/vocabulary/typeahead")
+@handle_api_errors("Vocabulary typeahead")
+def vocabulary_typeahead(
+    query: Annotated[str, Query(min_length=1, max_length=100)],
+    current_admin: CurrentAdmin,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[VocabularyItemDetailResponse]:
+    return serialize_rows(get_search_index().search(query, limit), VocabularyItemDetailResponse) or []
+
+
+@router.get("/vocabulary/export")
+@handle_api_errors("Export vocabulary")
+def export_vocabulary(
+    current_admin: CurrentAdmin,
+    version_id: ActiveVersion,
+    list_name: str | None = None,
+    version: Annotated[int | None, Query(ge=1)] = None,
+) -> StreamingResponse:
+    export_version = version or version_id
+    logger.info(
+        "Admin vocabulary export",
+        extra={"admin": current_admin["username"], "list_name": list_name, "version_id": export_version},
+    )
+    conditions = ["version_id = %s"]
+    args: list = [export_version]
+    if list_name:
+        conditions.append("list_name = %s")
+        args.append(list_name)
+
+    batches = stream_words_db_tuples(
+        f"""SELECT {VOCABULARY_LIST_COLUMNS}
+           FROM vocabulary_items
+           WHERE {" AND ".join(conditions)}
+           ORDER BY list_name, source_text, id""",  # nosec B608
+        tuple(args),
+        batch_size=VOCABULARY_EXPORT_BATCH_SIZE,
+        primary=True,
+    )
+
+    return StreamingResponse(
+        (serialize_trusted_ndjson(columns, rows, VocabularyItemDetailResponse) for columns, rows in batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="vocabulary-v{export_version}.ndjson"'},
+    )
+
+
 @router.get("/vocabulary/{item_id}")
 @handle_api_errors("Get vocabulary item")
 def get_vocabulary_item(
     item_id: str,
     current_admin: CurrentAdmin,
+    version_id: ActiveVersion,
 ) -> VocabularyItemDetailResponse:
     item = query_words_db(
         """SELECT id, source_text, source_language, target_text, target_language,
@@ -65,9 +128,10 @@ def get_vocabulary_item(
                   TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
                   TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at
            FROM vocabulary_items
-           WHERE id = %s""",
-        (item_id,),
+           WHERE version_id = %s AND id = %s""",
+        (version_id, item_id),
         one=True,
+        primary=True,
     )
 
     if not item:
@@ -79,42 +143,52 @@ def get_vocabulary_item(
     return serialize_rows(item, VocabularyItemDetailResponse, one=True)
 
 
+def encode_vocabulary_cursor(row: dict) -> str:
+    key = json.dumps([row["list_name"], row["source_text"], str(row["id"])], ensure_ascii=False)
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_vocabulary_cursor(cursor: str) -> tuple[str, str, str]:
+    try:
+        list_name, source_text, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(list_name), str(source_text), str(UUID(item_id))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
+
+
 @router.get("/vocabulary")
 @handle_api_errors("List vocabulary")
 def list_vocabulary(
+    response: Response,
     current_admin: CurrentAdmin,
     version_id: ActiveVersion,
     list_name: str | None = None,
     limit: Annotated[int, Query(ge=1, le=1000)] = 100,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query(max_length=2048)] = None,
 ) -> list[VocabularyItemDetailResponse]:
+    conditions = ["version_id = %s"]
+    args: list = [version_id]
     if list_name:
-        results = query_words_db(
-            """SELECT id, source_text, source_language, target_text, target_language,
-                      list_name, difficulty_level, source_usage_example, target_usage_example,
-                      is_active,
-                      TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
-                      TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at
-               FROM vocabulary_items
-               WHERE version_id = %s AND list_name = %s
-               ORDER BY source_text
-               LIMIT %s OFFSET %s""",
-            (version_id, list_name, limit, offset),
-        )
-    else:
-        results = query_words_db(
-            """SELECT id, source_text, source_language, target_text, target_language,
-                      list_name, difficulty_level, source_usage_example, target_usage_example,
-                      is_active,
-                      TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
-                      TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at
-               FROM vocabulary_items
-               WHERE version_id = %s
-               ORDER BY list_name, source_text
-               LIMIT %s OFFSET %s""",
-            (version_id, limit, offset),
-        )
+        conditions.append("list_name = %s")
+        args.append(list_name)
+    if cursor:
+        conditions.append("(list_name, source_text, id) > (%s, %s, %s::uuid)")
+        args.extend(decode_vocabulary_cursor(cursor))
+        offset = 0
+
+    results = query_words_db(
+        f"""SELECT {VOCABULARY_LIST_COLUMNS}
+           FROM vocabulary_items
+           WHERE {" AND ".join(conditions)}
+           ORDER BY list_name, source_text, id
+           LIMIT %s OFFSET %s""",  # nosec B608
+        (*args, limit, offset),
+        primary=True,
+    )
 
+    if len(results) == limit:
+        response.headers["X-Next-Cursor"] = encode_vocabulary_cursor(results[-1])
     return serialize_rows(results, VocabularyItemDetailResponse) or []
 
 
@@ -139,20 +213,20 @@ def create_vocabulary_item(
     request: Request,
     item: VocabularyItemCreate,
     current_admin: CurrentAdmin,
-    version_id: ActiveVersion,
 ) -> dict[str, str]:
     logger.info(
         "Admin creating vocabulary item",
         extra={"admin": current_admin["username"], "source_text": item.source_text},
     )
+    # Writes resolve the live version in the statement itself, so one that waited on a vocabulary sync's
+    # lock lands in the version that sync activated rather than the one it retired
     result = execute_words_write_transaction(
         """INSERT INTO vocabulary_items
            (version_id, source_text, source_language, target_text, target_language,
             list_name, difficulty_level, source_usage_example, target_usage_example)
-           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+           VALUES ((SELECT id FROM content_versions WHERE is_active), %s, %s, %s, %s, %s, %s, %s, %s)
            RETURNING id""",
         (
-            version_id,
             item.source_text,
             item.source_language,
             item.target_text,
@@ -172,9 +246,239 @@ def create_vocabulary_item(
             detail="Failed to create vocabulary item",
         )
 
+    mark_search_index_stale()
     return {"id": str(result["id"]), "message": "Vocabulary item created"}
 
 
+class BulkVocabularyUpdate(VocabularyItemUpdate):
+    id: UUID
+
+
+class BulkVocabularyRequest(APIBaseModel):
+    create: list[VocabularyItemCreate] = Field(default_factory=list)
+    update: list[BulkVocabularyUpdate] = Field(default_factory=list)
+    deactivate: list[UUID] = Field(default_factory=list)
+
+
+class BulkVocabularyResult(APIBaseModel):
+    op: str
+    index: int
+    id: str | None = None
+    status: str
+
+
+class BulkVocabularyResponse(APIBaseModel):
+    results: list[BulkVocabularyResult]
+
+
+# One statement, so one transaction: creates skip existing translations, updates only touch the listed
+# fields, deactivations are soft deletes; every applied change lands in content_changelog.
+# An update whose new text key is taken by another row, a create, or an earlier update in the batch is
+# reported as a conflict instead of aborting the batch; one that changes no value is reported unchanged.
+BULK_VOCABULARY_SQL = """
+    WITH live AS (
+        SELECT id AS version_id FROM content_versions WHERE is_active
+    ),
+    create_input AS (
+        SELECT * FROM jsonb_to_recordset(%(creates)s::jsonb) AS c(
+            idx INTEGER, source_text TEXT, source_language TEXT, target_text TEXT, target_language TEXT,
+            list_name TEXT, difficulty_level TEXT, source_usage_example TEXT, target_usage_example TEXT)
+    ),
+    update_input AS (
+        SELECT * FROM jsonb_to_recordset(%(updates)s::jsonb) AS u(
+            idx INTEGER, id UUID, fields JSONB, source_text TEXT, target_text TEXT, source_usage_example TEXT,
+            target_usage_example TEXT, is_active BOOLEAN, list_name TEXT, difficulty_level TEXT)
+    ),
+    deactivate_input AS (
+        SELECT * FROM jsonb_to_recordset(%(deactivations)s::jsonb) AS d(idx INTEGER, id UUID)
+    ),
+    previous AS (
+        SELECT * FROM vocabulary_items
+        WHERE version_id = (SELECT version_id FROM live)
+          AND id IN (SELECT id FROM update_input UNION ALL SELECT id FROM deactivate_input)
+    ),
+    inserted AS (
+        INSERT INTO vocabulary_items
+            (version_id, source_text, source_language, target_text, target_language,
+             list_name, difficulty_level, source_usage_example, target_usage_example)
+        SELECT (SELECT version_id FROM live), source_text, source_language, target_text, target_language,
+               list_name, difficulty_level, source_usage_example, target_usage_example
+        FROM create_input
+        ON CONFLICT (version_id, source_text, source_language, target_language) DO NOTHING
+        RETURNING *
+    ),
+    proposed AS (
+        SELECT u.idx, p.id, p.source_language, p.target_language,
+               CASE WHEN u.fields ? 'source_text' THEN u.source_text ELSE p.source_text END AS source_text,
+               CASE WHEN u.fields ? 'target_text' THEN u.target_text ELSE p.target_text END AS target_text,
+               CASE WHEN u.fields ? 'source_usage_example'
+                    THEN u.source_usage_example ELSE p.source_usage_example END AS source_usage_example,
+               CASE WHEN u.fields ? 'target_usage_example'
+                    THEN u.target_usage_example ELSE p.target_usage_example END AS target_usage_example,
+               CASE WHEN u.fields ? 'is_active' THEN u.is_active ELSE p.is_active END AS is_active,
+               CASE WHEN u.fields ? 'list_name' THEN u.list_name ELSE p.list_name END AS list_name,
+               CASE WHEN u.fields ? 'difficulty_level' THEN u.difficulty_level ELSE p.difficulty_level END AS difficulty_level
+        FROM update_input u
+        JOIN previous p ON p.id = u.id
+    ),
+    conflicting AS (
+        SELECT r.id FROM proposed r
+        WHERE EXISTS (
+                SELECT 1 FROM vocabulary_items v
+                WHERE v.version_id = (SELECT version_id FROM live) AND v.id != r.id
+                  AND v.source_text = r.source_text
+                  AND v.source_language = r.source_language
+                  AND v.target_language = r.target_language)
+           OR EXISTS (
+                SELECT 1 FROM create_input c
+                WHERE c.source_text = r.source_text
+                  AND c.source_language = r.source_language
+                  AND c.target_language = r.target_language)
+           OR EXISTS (
+                SELECT 1 FROM proposed o
+                WHERE o.idx < r.idx
+                  AND o.source_text = r.source_text
+                  AND o.source_language = r.source_language
+                  AND o.target_language = r.target_language)
+    ),
+    updated AS (
+        UPDATE vocabulary_items v SET
+            source_text = r.source_text,
+            target_text = r.target_text,
+            source_usage_example = r.source_usage_example,
+            target_usage_example = r.target_usage_example,
+            is_active = r.is_active,
+            list_name = r.list_name,
+            difficulty_level = r.difficulty_level
+        FROM proposed r
+        WHERE v.version_id = (SELECT version_id FROM live) AND v.id = r.id
+          AND r.id NOT IN (SELECT id FROM conflicting)
+          AND (v.source_text, v.target_text, v.source_usage_example, v.target_usage_example,
+               v.is_active, v.list_name, v.difficulty_level)
+              IS DISTINCT FROM (r.source_text, r.target_text, r.source_usage_example, r.target_usage_example,
+                                r.is_active, r.list_name, r.difficulty_level)
+        RETURNING v.*
+    ),
+    deactivated AS (
+        UPDATE vocabulary_items v SET is_active = FALSE
+        FROM deactivate_input d
+        WHERE v.version_id = (SELECT version_id FROM live) AND v.id = d.id AND v.is_active
+        RETURNING v.id, v.version_id
+    ),
+    changelog AS (
+        INSERT INTO content_changelog (version_id, change_type, vocabulary_item_id, old_values, new_values, changed_by)
+        SELECT i.version_id, 'ADD', i.id, NULL::jsonb,
+               to_jsonb(i) - 'id' - 'version_id' - 'created_at' - 'updated_at' - 'search_vector', %(changed_by)s
+        FROM inserted i
+        UNION ALL
+        SELECT n.version_id, 'UPDATE', n.id,
+               (SELECT jsonb_object_agg(key, value) FROM jsonb_each(to_jsonb(p)) WHERE u.fields ? key),
+               (SELECT jsonb_object_agg(key, value) FROM jsonb_each(to_jsonb(n)) WHERE u.fields ? key),
+               %(changed_by)s
+        FROM updated n
+        JOIN previous p ON p.id = n.id
+        JOIN update_input u ON u.id = n.id
+        UNION ALL
+        SELECT x.version_id, 'DELETE', x.id, '{"is_active": true}'::jsonb, '{"is_active": false}'::jsonb, %(changed_by)s
+        FROM deactivated x
+    )
+    SELECT 'create' AS op, c.idx, i.id,
+           CASE WHEN i.id IS NULL THEN 'duplicate' ELSE 'created' END AS status
+    FROM create_input c
+    LEFT JOIN inserted i ON i.source_text = c.source_text
+                        AND i.source_language = c.source_language
+                        AND i.target_language = c.target_language
+    UNION ALL
+    SELECT 'update', u.idx, u.id,
+           CASE WHEN n.id IS NOT NULL THEN 'updated'
+                WHEN p.id IS NULL THEN 'not_found'
+                WHEN u.id IN (SELECT id FROM conflicting) THEN 'conflict'
+                ELSE 'unchanged' END
+    FROM update_input u
+    LEFT JOIN updated n ON n.id = u.id
+    LEFT JOIN previous p ON p.id = u.id
+    UNION ALL
+    SELECT 'deactivate', d.idx, d.id,
+           CASE WHEN x.id IS NOT NULL THEN 'deactivated' WHEN p.id IS NOT NULL THEN 'unchanged' ELSE 'not_found' END
+    FROM deactivate_input d
+    LEFT JOIN deactivated x ON x.id = d.id
+    LEFT JOIN previous p ON p.id = d.id
+    ORDER BY op, idx
+"""
+
+
+@router.post("/vocabulary/bulk")
+@limiter.limit("10/minute")
+@handle_api_errors("Bulk vocabulary changes")
+def bulk_vocabulary_changes(
+    request: Request,
+    changes: BulkVocabularyRequest,
+    current_admin: CurrentAdmin,
+) -> BulkVocabularyResponse:
+    operation_count = len(changes.create) + len(changes.update) + len(changes.deactivate)
+    if operation_count > VOCABULARY_BULK_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {VOCABULARY_BULK_MAX_OPERATIONS} operations per request",
+        )
+
+    touched_ids = [item.id for item in changes.update] + changes.deactivate
+    if len(set(touched_ids)) != len(touched_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each vocabulary item may appear in only one update or deactivate operation",
+        )
+
+    results: list[BulkVocabularyResult] = []
+    creates = []
+    seen_keys: set[tuple[str, str, str]] = set()
+    for index, create in enumerate(changes.create):
+        key = (create.source_text, create.source_language, create.target_language)
+        if key in seen_keys:
+            results.append(BulkVocabularyResult(op="create", index=index, status="duplicate"))
+            continue
+        seen_keys.add(key)
+        creates.append({"idx": index, **create.model_dump()})
+
+    updates = []
+    for index, update in enumerate(changes.update):
+        fields = update.model_dump(exclude_unset=True, exclude={"id"})
+        if not fields:
+            results.append(BulkVocabularyResult(op="update", index=index, id=str(update.id), status="unchanged"))
+            continue
+        updates.append({"idx": index, "id": str(update.id), "fields": list(fields), **fields})
+
+    deactivations = [{"idx": index, "id": str(item_id)} for index, item_id in enumerate(changes.deactivate)]
+
+    logger.info(
+        "Admin bulk vocabulary changes",
+        extra={
+            "admin": current_admin["username"],
+            "create": len(creates),
+            "update": len(updates),
+            "deactivate": len(deactivations),
+        },
+    )
+    if creates or updates or deactivations:
+        rows = execute_words_write_transaction(
+            BULK_VOCABULARY_SQL,
+            {
+                "creates": json.dumps(creates, ensure_ascii=False),
+                "updates": json.dumps(updates, ensure_ascii=False),
+                "deactivations": json.dumps(deactivations),
+                "changed_by": current_admin["username"],
+            },
+            fetch_results=True,
+        )
+        mark_search_index_stale()
+        results.extend(
+            BulkVocabularyResult(op=row["op"], index=row["idx"], id=str(row["id"]) if row["id"] else None, status=row["status"]) for row in rows
+        )
+
+    results.sort(key=lambda result: (result.op, result.index))
+    return BulkVocabularyResponse(results=results)
+
+
 @router.put("/vocabulary/{item_id}")
 @limiter.limit("30/minute")
 @handle_api_errors("Update vocabulary item")
@@ -210,7 +514,10 @@ def update_vocabulary_item(
     set_clauses.append("updated_at = NOW()")
     values.append(item_id)
 
-    query = f"UPDATE vocabulary_items SET {', '.join(set_clauses)} WHERE id = %s"  # nosec B608
+    query = (
+        f"UPDATE vocabulary_items SET {', '.join(set_clauses)} "  # nosec B608
+        "WHERE version_id = (SELECT id FROM content_versions WHERE is_active) AND id = %s"
+    )
     logger.info(
         "Admin updating vocabulary item",
         extra={"admin": current_admin["username"], "item_id": item_id, "fields": list(updates.keys())},
@@ -224,6 +531,7 @@ def update_vocabulary_item(
             detail=VOCABULARY_ITEM_NOT_FOUND,
         )
 
+    mark_search_index_stale()
     return {"message": "Vocabulary item updated"}
 
 
@@ -241,7 +549,7 @@ def delete_vocabulary_item(
     )
 
     row_count = execute_words_write_transaction(
-        "DELETE FROM vocabulary_items WHERE id = %s",
+        "DELETE FROM vocabulary_items WHERE version_id = (SELECT id FROM content_versions WHERE is_active) AND id = %s",
         (item_id,),
     )
 
@@ -251,4 +559,15 @@ def delete_vocabulary_item(
             detail=VOCABULARY_ITEM_NOT_FOUND,
         )
 
+    mark_search_index_stale()
     return {"message": "Vocabulary item deleted"}
+
+
+@router.get("/profiles")
+@handle_api_errors("List request profiles")
+def list_request_profiles(
+    current_admin: CurrentAdmin,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 50,
+) -> list[dict]:
+    profiles: list[dict] = recent_profiles()[-limit:]
+    return profiles
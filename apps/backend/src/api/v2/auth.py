@@ -1,13 +1,18 @@
 import re
 
-from core.auth_helpers import build_access_token, create_and_store_refresh_token, revoke_refresh_token
-from core.config import RATE_LIMIT_ENABLED
+from core.auth_helpers import build_access_token, create_and_store_refresh_token, rotate_refresh_token
 from core.database import execute_write_transaction, query_db
 from core.dependencies import CurrentUser
 from core.error_handler import handle_api_errors
 from core.logging import get_logger, user_id_var
-from core.rate_limit import limiter
-from core.security import hash_password, verify_password, verify_refresh_token
+from core.prepared import prepared_statement
+from core.rate_limit import create_limiter, limiter
+from core.security import (
+    TIMING_SAFE_DUMMY_HASH,
+    hash_password,
+    invalidate_admin_authorization,
+    verify_password,
+)
 from fastapi import APIRouter, HTTPException, Request, status
 from generated.schemas import (
     PasswordChangeRequest,
@@ -17,14 +22,15 @@ from generated.schemas import (
     UserRegistration,
     UserResponse,
 )
-from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 PASSWORD_COMPLEXITY_ERROR = "Password does not meet security requirements"  # pragma: allowlist secret
-TIMING_SAFE_DUMMY_HASH = hash_password("dummy-password-for-timing-safety")
+
+USER_BY_USERNAME = prepared_statement("user_by_username", ("text",), "SELECT id, username, password, is_admin FROM users WHERE username = $1")
 
 
 def get_username_for_rate_limit(request: Request) -> str:
@@ -37,7 +43,7 @@ def get_username_for_rate_limit(request: Request) -> str:
         return f"ip:{get_remote_address(request)}"
 
 
-login_limiter = Limiter(key_func=get_username_for_rate_limit, enabled=RATE_LIMIT_ENABLED)
+login_limiter = create_limiter(get_username_for_rate_limit)
 
 
 def validate_password_complexity(password: str) -> None:
@@ -69,20 +75,21 @@ def validate_password_complexity(password: str) -> None:
 )
 @limiter.limit("3/minute;10/hour")
 @handle_api_errors("Registration")
-def register_user(request: Request, user_data: UserRegistration) -> TokenResponse:
+async def register_user(request: Request, user_data: UserRegistration) -> TokenResponse:
     logger.info(f"Starting registration for user: {user_data.username}")
 
     validate_password_complexity(user_data.password)
 
-    existing_user = query_db("SELECT id FROM users WHERE username = %s", (user_data.username,), one=True)
+    existing_user = await run_in_threadpool(query_db, "SELECT id FROM users WHERE username = %s", (user_data.username,), one=True)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Registration failed",
         )
 
-    hashed_password = hash_password(user_data.password)
-    result = execute_write_transaction(
+    hashed_password = await hash_password(user_data.password)
+    result = await run_in_threadpool(
+        execute_write_transaction,
         "INSERT INTO users (username, password) VALUES (%s, %s) RETURNING id, is_admin",
         (user_data.username, hashed_password),
         fetch_results=True,
@@ -101,7 +108,7 @@ def register_user(request: Request, user_data: UserRegistration) -> TokenRespons
     logger.info(f"Successfully created user {user_data.username}")
 
     token = build_access_token(user_id, user_data.username, is_admin)
-    refresh_token = create_and_store_refresh_token(user_id)
+    refresh_token = await run_in_threadpool(create_and_store_refresh_token, user_id)
 
     return TokenResponse(
         token=token,
@@ -114,17 +121,13 @@ def register_user(request: Request, user_data: UserRegistration) -> TokenRespons
 @router.post("/login")
 @login_limiter.limit("5/minute;10/hour")
 @handle_api_errors("Login")
-def login_user(request: Request, user_data: UserLogin) -> TokenResponse:
+async def login_user(request: Request, user_data: UserLogin) -> TokenResponse:
     request.state.username = user_data.username
     logger.info(f"Login attempt for user: {user_data.username}")
-    user = query_db(
-        "SELECT id, username, password, is_admin FROM users WHERE username = %s",
-        (user_data.username,),
-        one=True,
-    )
+    user = await run_in_threadpool(query_db, USER_BY_USERNAME, (user_data.username,), one=True)
 
     password_hash = user["password"] if user else TIMING_SAFE_DUMMY_HASH
-    password_valid = verify_password(user_data.password, password_hash)
+    password_valid = await verify_password(user_data.password, password_hash)
 
     if not user or not password_valid:
         client_ip = request.client.host if request.client else "unknown"
@@ -137,7 +140,7 @@ def login_user(request: Request, user_data: UserLogin) -> TokenResponse:
     is_admin = user.get("is_admin", False)
     user_id_var.set(str(user["id"]))
     token = build_access_token(user["id"], user["username"], is_admin)
-    refresh_token = create_and_store_refresh_token(user["id"])
+    refresh_token = await run_in_threadpool(create_and_store_refresh_token, user["id"])
 
     logger.info("Successful login")
 
@@ -154,23 +157,11 @@ def login_user(request: Request, user_data: UserLogin) -> TokenResponse:
 @handle_api_errors("Token refresh")
 def refresh_access_token(request: Request, refresh_request: RefreshTokenRequest) -> TokenResponse:
     logger.info("Access token refresh attempt")
-    user_data = verify_refresh_token(refresh_request.refresh_token)
-
-    user = query_db(
-        "SELECT id, username, is_admin FROM users WHERE id = %s",
-        (user_data["user_id"],),
-        one=True,
-    )
-
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user, new_refresh_token = rotate_refresh_token(refresh_request.refresh_token)
 
     is_admin = user.get("is_admin", False)
     new_access_token = build_access_token(user["id"], user["username"], is_admin)
 
-    revoke_refresh_token(refresh_request.refresh_token)
-    new_refresh_token = create_and_store_refresh_token(user["id"])
-
     logger.info(f"Access token refreshed for user: {user['username']}")
 
     return TokenResponse(
@@ -184,7 +175,7 @@ def refresh_access_token(request: Request, refresh_request: RefreshTokenRequest)
 @router.post("/change-password")
 @limiter.limit("3/hour")
 @handle_api_errors("Password change")
-def change_password(
+async def change_password(
     request: Request,
     password_data: PasswordChangeRequest,
     current_user: CurrentUser,
@@ -193,13 +184,14 @@ def change_password(
 
     validate_password_complexity(password_data.new_password)
 
-    user = query_db(
+    user = await run_in_threadpool(
+        query_db,
         "SELECT password FROM users WHERE id = %s",
         (current_user["user_id"],),
         one=True,
     )
 
-    if not user or not verify_password(password_data.current_password, user["password"]):
+    if not user or not await verify_password(password_data.current_password, user["password"]):
         client_ip = request.client.host if request.client else "unknown"
         logger.warning(f"Password change failed - invalid current password for user: {current_user['username']} from {client_ip}")
         raise HTTPException(
@@ -207,8 +199,9 @@ def change_password(
             detail="Authentication failed",
         )
 
-    new_hashed_password = hash_password(password_data.new_password)
-    execute_write_transaction(
+    new_hashed_password = await hash_password(password_data.new_password)
+    await run_in_threadpool(
+        execute_write_transaction,
         "UPDATE users SET password = %s WHERE id = %s",
         (new_hashed_password, current_user["user_id"]),
     )
@@ -231,5 +224,6 @@ def delete_account(
         logger.warning(f"Account deletion failed - user not found: {current_user['username']}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    invalidate_admin_authorization(current_user["user_id"])
     logger.info(f"Account successfully deleted for user: {current_user['username']}")
     return {"message": "Account deleted successfully"}
@@ -0,0 +1,46 @@
+import datetime
+
+from core.health import get_readiness
+from fastapi import APIRouter, Response, status
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/api/health", tags=["Health"])
+
+
+class LivenessResponse(BaseModel):
+    status: str
+    timestamp: str
+
+
+class PoolHealth(BaseModel):
+    status: str
+    in_use: int
+    max_size: int
+    saturation: float
+    latency_ms: float | None = None
+
+
+class ReplicaHealth(BaseModel):
+    status: str
+    lag_seconds: float | None = None
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    checked_at: str | None = None
+    age_seconds: float | None = None
+    pools: dict[str, PoolHealth]
+    replicas: dict[str, ReplicaHealth] = {}
+
+
+@router.get("/live")
+async def liveness() -> LivenessResponse:
+    return LivenessResponse(status="ok", timestamp=datetime.datetime.now(datetime.UTC).isoformat())
+
+
+@router.get("/ready")
+async def readiness(response: Response) -> ReadinessResponse:
+    readiness = ReadinessResponse.model_validate(get_readiness())
+    if readiness.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
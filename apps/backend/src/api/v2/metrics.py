@@ -0,0 +1,57 @@
+from collections.abc import Iterator
+
+from core.config import METRICS_ENABLED
+from core.database import get_pools, pool_usage
+from core.logging import log_queue_stats
+from core.metrics import GaugeCollector, register, render_metrics, tts_cache_lookups
+from core.security import password_hashing_stats, verified_tokens
+from fastapi import APIRouter, HTTPException, Response, status
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_connections() -> Iterator[tuple[dict[str, str], float]]:
+    for name, pool in get_pools().items():
+        if pool is None:
+            continue
+        in_use, max_size = pool_usage(pool)
+        yield {"pool": name, "state": "in_use"}, in_use
+        yield {"pool": name, "state": "max"}, max_size
+
+
+def _tts_cache_hit_ratio() -> Iterator[tuple[dict[str, str], float]]:
+    hits = tts_cache_lookups.value("hit")
+    lookups = hits + tts_cache_lookups.value("miss")
+    yield {}, hits / lookups if lookups else 0.0
+
+
+def _verified_token_cache() -> Iterator[tuple[dict[str, str], float]]:
+    stats = verified_tokens.stats()
+    for key in ("hits", "misses", "size", "hit_ratio"):
+        yield {"stat": key}, stats[key]
+
+
+def _password_hashing() -> Iterator[tuple[dict[str, str], float]]:
+    for key, value in password_hashing_stats.stats().items():
+        yield {"stat": key}, value
+
+
+def _log_queue() -> Iterator[tuple[dict[str, str], float]]:
+    for key, value in log_queue_stats().items():
+        yield {"stat": key}, value
+
+
+register(GaugeCollector("db_pool_connections", "Connections per database pool.", _pool_connections))
+register(GaugeCollector("tts_cache_hit_ratio", "Share of TTS cache lookups served from storage.", _tts_cache_hit_ratio))
+register(GaugeCollector("jwt_verified_cache", "Verified access-token cache statistics.", _verified_token_cache))
+register(GaugeCollector("password_hashing", "bcrypt executor statistics.", _password_hashing))
+register(GaugeCollector("log_queue", "Asynchronous log queue depth and dropped records.", _log_queue))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,78 +1,136 @@
-from core.database import execute_write_transaction, get_active_version, query_db, query_words_db, serialize_rows
+from datetime import datetime
+from typing import Annotated
+
+from core.base_model import APIBaseModel
+from core.database import get_active_version, query_db_tuples, query_words_db_tuples, serialize_trusted_rows
 from core.dependencies import CurrentUser
 from core.error_handler import handle_api_errors
 from core.logging import get_logger
+from core.prepared import prepared_statement
+from core.progress_writer import LEVEL_COUNT_COLUMNS, ProgressRow, rebuild_summary, write_progress
 from core.rate_limit import limiter
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from generated.schemas import BulkProgressUpdateRequest, ProgressUpdateRequest, UserProgressResponse
+from pydantic import Field
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/user", tags=["Progress"])
 
-
-@router.get("/progress")
+PROGRESS_READ = prepared_statement(
+    "progress_read",
+    ("integer",),
+    """SELECT vocabulary_item_id, level, queue_position,
+              correct_count, incorrect_count, consecutive_correct,
+              COALESCE(recent_history, '{}') as recent_history,
+              TO_CHAR(last_practiced_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as last_practiced,
+              pronunciation_passed
+       FROM user_progress
+       WHERE user_id = $1
+       ORDER BY last_practiced_at DESC""",
+)
+
+# A NULL list name matches every list
+PROGRESS_VOCABULARY = prepared_statement(
+    "progress_vocabulary",
+    ("uuid[]", "integer", "text"),
+    """SELECT id, source_text, source_language, target_language
+       FROM vocabulary_items
+       WHERE version_id = $2 AND id = ANY($1) AND is_active = TRUE AND ($3 IS NULL OR list_name = $3)""",
+)
+
+SUMMARY_SQL = f"""
+    SELECT u.progress_summary_ready, u.progress_summary_version, s.list_name, {", ".join(f"s.{column}" for column in LEVEL_COUNT_COLUMNS)},
+           s.correct_count, s.incorrect_count, s.last_practiced_at
+    FROM users u
+    LEFT JOIN user_progress_summary s ON s.user_id = u.id AND (%(list_name)s::text IS NULL OR s.list_name = %(list_name)s)
+    WHERE u.id = %(user_id)s
+    ORDER BY s.list_name
+"""  # nosec B608
+
+
+class ProgressStatsResponse(APIBaseModel):
+    list_name: Annotated[str, Field(alias="listName")]
+    level_counts: Annotated[list[int], Field(alias="levelCounts")]
+    correct_count: Annotated[int, Field(alias="correctCount")]
+    incorrect_count: Annotated[int, Field(alias="incorrectCount")]
+    last_practiced_at: Annotated[datetime | None, Field(None, alias="lastPracticedAt")]
+
+
+@router.get("/progress", response_model=list[UserProgressResponse])
 @limiter.limit("100/minute")
 @handle_api_errors("Get user progress")
 def get_user_progress(
     request: Request,
     current_user: CurrentUser,
     list_name: str | None = None,
-) -> list[UserProgressResponse]:
+) -> Response:
     logger.debug(
         "Fetching user progress",
         extra={"user_id": current_user["user_id"], "list_name": list_name},
     )
-    progress_data = query_db(
-        """SELECT vocabulary_item_id, level, queue_position,
-                  correct_count, incorrect_count, consecutive_correct,
-                  COALESCE(recent_history, '{}') as recent_history,
-                  TO_CHAR(last_practiced_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as last_practiced,
-                  pronunciation_passed
-           FROM user_progress
-           WHERE user_id = %s
-           ORDER BY last_practiced_at DESC""",
-        (current_user["user_id"],),
-    )
+    progress_columns, progress_data = query_db_tuples(PROGRESS_READ, (current_user["user_id"],))
 
+    columns = [*progress_columns, "source_text", "source_language", "target_language"]
     if not progress_data:
-        return []
-
-    vocab_item_ids = [item["vocabulary_item_id"] for item in progress_data]
-    placeholders = ", ".join(["%s"] * len(vocab_item_ids))
-
-    if list_name:
-        version_id = get_active_version()
-        vocab_items = query_words_db(
-            f"""SELECT id, source_text, source_language, target_language, list_name
-               FROM vocabulary_items
-               WHERE id IN ({placeholders}) AND list_name = %s AND version_id = %s AND is_active = TRUE""",  # nosec B608
-            (*tuple(vocab_item_ids), list_name, version_id),
-        )
-    else:
-        vocab_items = query_words_db(
-            f"""SELECT id, source_text, source_language, target_language, list_name
-               FROM vocabulary_items
-               WHERE id IN ({placeholders}) AND is_active = TRUE""",  # nosec B608
-            tuple(vocab_item_ids),
-        )
+        empty_response: Response = serialize_trusted_rows(columns, [], UserProgressResponse)
+        return empty_response
 
-    vocab_map = {str(item["id"]): item for item in vocab_items}
+    _, vocab_items = query_words_db_tuples(PROGRESS_VOCABULARY, ([str(row[0]) for row in progress_data], get_active_version(), list_name or None))
+
+    vocab_map = {str(item[0]): item[1:] for item in vocab_items}
 
     combined_results = []
-    for progress_item in progress_data:
-        vocab_id = str(progress_item["vocabulary_item_id"])
-        if vocab_id in vocab_map:
-            vocab_item = vocab_map[vocab_id]
-            combined_results.append(
-                {
-                    **progress_item,
-                    "source_text": vocab_item["source_text"],
-                    "source_language": vocab_item["source_language"],
-                    "target_language": vocab_item["target_language"],
-                }
-            )
-
-    return serialize_rows(combined_results, UserProgressResponse) or []
+    for progress_row in progress_data:
+        vocab_fields = vocab_map.get(str(progress_row[0]))
+        if vocab_fields is not None:
+            combined_results.append((*progress_row, *vocab_fields))
+
+    response: Response = serialize_trusted_rows(columns, combined_results, UserProgressResponse)
+    return response
+
+
+@router.get("/progress/stats", response_model=list[ProgressStatsResponse])
+@limiter.limit("100/minute")
+@handle_api_errors("Get progress stats")
+def get_progress_stats(
+    request: Request,
+    current_user: CurrentUser,
+    list_name: str | None = None,
+) -> list[ProgressStatsResponse]:
+    params = {"user_id": current_user["user_id"], "list_name": list_name}
+    _, rows = query_db_tuples(SUMMARY_SQL, params)
+    # Lists are attributed per content version, so a sync that moved words invalidates the summary
+    version_id = get_active_version()
+    if rows and (not rows[0][0] or rows[0][1] != version_id):
+        logger.info("Rebuilding progress summary", extra={"user_id": current_user["user_id"], "version_id": version_id})
+        rebuild_summary(current_user["user_id"], version_id)
+        _, rows = query_db_tuples(SUMMARY_SQL, params)
+
+    return [
+        ProgressStatsResponse(
+            list_name=row[2],
+            level_counts=list(row[3:9]),
+            correct_count=row[9],
+            incorrect_count=row[10],
+            last_practiced_at=row[11],
+        )
+        for row in rows
+        # A list every counted word has moved out of keeps a row of zeros until the next rebuild
+        if row[2] is not None and any(row[3:9])
+    ]
+
+
+def progress_row(item: ProgressUpdateRequest) -> ProgressRow:
+    return ProgressRow(
+        item.vocabulary_item_id,
+        item.level,
+        item.queue_position,
+        item.correct_count,
+        item.incorrect_count,
+        item.consecutive_correct,
+        item.recent_history,
+        item.pronunciation_passed,
+    )
 
 
 @router.post("/progress")
@@ -91,32 +149,7 @@ def save_user_progress(
             "level": progress_data.level,
         },
     )
-    execute_write_transaction(
-        """INSERT INTO user_progress
-               (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, recent_history, pronunciation_passed, last_practiced_at)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, FALSE), NOW())
-               ON CONFLICT (user_id, vocabulary_item_id)
-               DO UPDATE SET
-                   level = EXCLUDED.level,
-                   queue_position = EXCLUDED.queue_position,
-                   correct_count = EXCLUDED.correct_count,
-                   incorrect_count = EXCLUDED.incorrect_count,
-                   consecutive_correct = EXCLUDED.consecutive_correct,
-                   recent_history = EXCLUDED.recent_history,
-                   pronunciation_passed = COALESCE(EXCLUDED.pronunciation_passed, user_progress.pronunciation_passed),
-                   last_practiced_at = EXCLUDED.last_practiced_at""",
-        (
-            current_user["user_id"],
-            progress_data.vocabulary_item_id,
-            progress_data.level,
-            progress_data.queue_position,
-            progress_data.correct_count,
-            progress_data.incorrect_count,
-            progress_data.consecutive_correct,
-            progress_data.recent_history,
-            progress_data.pronunciation_passed,
-        ),
-    )
+    write_progress(current_user["user_id"], [progress_row(progress_data)])
 
     return {"message": "Progress updated successfully"}
 
@@ -137,41 +170,6 @@ def save_bulk_progress(
     if not bulk_data.items:
         return {"message": "No items to update"}
 
-    values_placeholders = []
-    params = []
-
-    for item in bulk_data.items:
-        values_placeholders.append("(%s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, FALSE), NOW())")
-        params.extend(
-            [
-                current_user["user_id"],
-                item.vocabulary_item_id,
-                item.level,
-                item.queue_position,
-                item.correct_count,
-                item.incorrect_count,
-                item.consecutive_correct,
-                item.recent_history,
-                item.pronunciation_passed,
-            ]
-        )
-
-    query = f"""
-        INSERT INTO user_progress
-        (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, recent_history, pronunciation_passed, last_practiced_at)
-        VALUES {", ".join(values_placeholders)}
-        ON CONFLICT (user_id, vocabulary_item_id)
-        DO UPDATE SET
-            level = EXCLUDED.level,
-            queue_position = EXCLUDED.queue_position,
-            correct_count = EXCLUDED.correct_count,
-            incorrect_count = EXCLUDED.incorrect_count,
-            consecutive_correct = EXCLUDED.consecutive_correct,
-            recent_history = EXCLUDED.recent_history,
-            pronunciation_passed = COALESCE(EXCLUDED.pronunciation_passed, user_progress.pronunciation_passed),
-            last_practiced_at = EXCLUDED.last_practiced_at
-    """  # nosec B608
-
-    execute_write_transaction(query, tuple(params))
+    write_progress(current_user["user_id"], [progress_row(item) for item in bulk_data.items])
 
     return {"message": f"Successfully updated {len(bulk_data.items)} progress items"}
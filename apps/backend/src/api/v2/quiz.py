@@ -0,0 +1,104 @@
+from typing import Annotated
+
+from core.base_model import APIBaseModel
+from core.dependencies import ActiveVersion, CurrentUser
+from core.error_handler import handle_api_errors
+from core.logging import get_logger
+from core.quiz_engine import flush_session, get_session, issue_question
+from core.rate_limit import limiter
+from fastapi import APIRouter, HTTPException, Request, status
+from pydantic import Field
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/api/quiz", tags=["Quiz"])
+
+# A progress write from another worker or client makes the first attempt replay on a rebuilt session
+ANSWER_ATTEMPTS = 2
+
+
+class QuizNextRequest(APIBaseModel):
+    list_name: Annotated[str, Field(alias="listName", min_length=1)]
+    level: Annotated[int | None, Field(None, ge=1, le=4)]
+
+
+class QuizQuestionResponse(APIBaseModel):
+    translation_id: Annotated[str, Field(alias="translationId")]
+    question_text: Annotated[str, Field(alias="questionText")]
+    level: int
+    direction: str
+    source_language: Annotated[str, Field(alias="sourceLanguage")]
+    target_language: Annotated[str, Field(alias="targetLanguage")]
+    question_type: Annotated[str, Field(alias="questionType")]
+    usage_example: Annotated[str | None, Field(None, alias="usageExample")]
+
+
+class QuizNextResponse(APIBaseModel):
+    question: QuizQuestionResponse | None
+    level: int
+
+
+class QuizAnswerRequest(APIBaseModel):
+    list_name: Annotated[str, Field(alias="listName", min_length=1)]
+    translation_id: Annotated[str, Field(alias="translationId", min_length=1)]
+    # Omitted answer reveals the solution and counts as a miss
+    answer: Annotated[str | None, Field(None, max_length=500)]
+
+
+class QuizLevelChange(APIBaseModel):
+    from_level: Annotated[int, Field(alias="from")]
+    to_level: Annotated[int, Field(alias="to")]
+
+
+class QuizAnswerResponse(APIBaseModel):
+    is_correct: Annotated[bool, Field(alias="isCorrect")]
+    correct_answer_text: Annotated[str, Field(alias="correctAnswerText")]
+    submitted_answer_text: Annotated[str | None, Field(None, alias="submittedAnswerText")]
+    level_change: Annotated[QuizLevelChange | None, Field(None, alias="levelChange")]
+
+
+@router.post("/next", response_model=QuizNextResponse)
+@limiter.limit("200/minute")
+@handle_api_errors("Get next quiz question")
+def next_question(
+    request: Request,
+    body: QuizNextRequest,
+    current_user: CurrentUser,
+    version_id: ActiveVersion,
+) -> QuizNextResponse:
+    session = get_session(current_user["user_id"], body.list_name, version_id)
+    if not session.vocabulary.ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word list not found")
+
+    with session.lock:
+        if body.level is not None:
+            session.set_level(body.level)
+        question = session.next_question()
+        level = session.current_level
+        if question is not None:
+            issue_question(current_user["user_id"], question["translation_id"], question["level"])
+
+    return QuizNextResponse(question=question, level=level)
+
+
+@router.post("/answer", response_model=QuizAnswerResponse)
+@limiter.limit("200/minute")
+@handle_api_errors("Submit quiz answer")
+def submit_answer(
+    request: Request,
+    body: QuizAnswerRequest,
+    current_user: CurrentUser,
+    version_id: ActiveVersion,
+) -> QuizAnswerResponse:
+    for _ in range(ANSWER_ATTEMPTS):
+        session = get_session(current_user["user_id"], body.list_name, version_id)
+        if body.translation_id not in session.vocabulary.words:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Translation not found in this word list")
+
+        with session.lock:
+            result = session.answer(body.translation_id, body.answer)
+            if result is None:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This is not the current question. Please fetch the next one.")
+            if flush_session(session, body.translation_id):
+                return QuizAnswerResponse(**result)
+
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Progress changed while answering. Please try again.")
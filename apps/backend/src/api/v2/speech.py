@@ -1,10 +1,13 @@
 import base64
+import time
 from typing import Annotated
 
 from core.config import AZURE_SPEECH_API_KEY, AZURE_SPEECH_REGION
 from core.dependencies import CurrentUser
 from core.error_handler import handle_api_errors
 from core.logging import get_logger
+from core.metrics import upstream_request_duration
+from core.profiling import record_upstream
 from core.rate_limit import limiter
 from fastapi import APIRouter, File, HTTPException, Request, UploadFile, status
 from generated.schemas import (
@@ -192,8 +195,16 @@ async def assess_pronunciation(
         "Pronunciation-Assessment": _build_pronunciation_config(text),
     }
 
-    async with httpx.AsyncClient(timeout=AZURE_API_TIMEOUT) as client:
-        response = await client.post(url, headers=headers, content=audio_data)
+    start_time = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(timeout=AZURE_API_TIMEOUT) as client:
+            response = await client.post(url, headers=headers, content=audio_data)
+    except httpx.HTTPError:
+        upstream_request_duration.observe(time.perf_counter() - start_time, "azure_speech", "error")
+        raise
+    finally:
+        record_upstream((time.perf_counter() - start_time) * 1000)
+    upstream_request_duration.observe(time.perf_counter() - start_time, "azure_speech", "success" if response.status_code == 200 else "error")
 
     if response.status_code != 200:
         logger.error(
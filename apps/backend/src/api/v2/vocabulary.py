@@ -1,36 +1,51 @@
-from core.database import query_words_db, serialize_rows
+from core.database import query_words_db_tuples, serialize_trusted_rows
 from core.dependencies import ActiveVersion, CurrentUser
 from core.error_handler import handle_api_errors
 from core.logging import get_logger
+from core.prepared import prepared_statement
 from core.rate_limit import limiter
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from generated.schemas import VocabularyItemResponse, WordListResponse
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["Vocabulary"])
 
+WORD_LISTS = prepared_statement(
+    "word_lists",
+    ("integer",),
+    """SELECT list_name, COUNT(*) as word_count
+       FROM vocabulary_items
+       WHERE version_id = $1 AND is_active = TRUE
+       GROUP BY list_name
+       ORDER BY list_name""",
+)
 
-@router.get("/word-lists")
+TRANSLATIONS = prepared_statement(
+    "translations",
+    ("text", "integer"),
+    """SELECT id, source_text, source_language, target_text, target_language,
+              list_name, difficulty_level, source_usage_example, target_usage_example
+       FROM vocabulary_items
+       WHERE list_name = $1 AND version_id = $2 AND is_active = TRUE
+       ORDER BY rank, source_text""",
+)
+
+
+@router.get("/word-lists", response_model=list[WordListResponse])
 @limiter.limit("100/minute")
 @handle_api_errors("Get word lists")
 def get_word_lists(
     request: Request,
     current_user: CurrentUser,
     version_id: ActiveVersion,
-) -> list[WordListResponse]:
+) -> Response:
     logger.debug(f"Fetching word lists for user: {current_user['username']}")
-    lists = query_words_db(
-        """SELECT list_name, COUNT(*) as word_count
-           FROM vocabulary_items
-           WHERE version_id = %s AND is_active = TRUE
-           GROUP BY list_name
-           ORDER BY list_name""",
-        (version_id,),
-    )
-    return serialize_rows(lists, WordListResponse) or []
-
-
-@router.get("/translations")
+    columns, lists = query_words_db_tuples(WORD_LISTS, (version_id,))
+    response: Response = serialize_trusted_rows(columns, lists, WordListResponse)
+    return response
+
+
+@router.get("/translations", response_model=list[VocabularyItemResponse])
 @limiter.limit("100/minute")
 @handle_api_errors("Get translations")
 def get_translations(
@@ -38,14 +53,8 @@ def get_translations(
     list_name: str,
     current_user: CurrentUser,
     version_id: ActiveVersion,
-) -> list[VocabularyItemResponse]:
-    translations = query_words_db(
-        """SELECT id, source_text, source_language, target_text, target_language,
-                  list_name, difficulty_level, source_usage_example, target_usage_example
-           FROM vocabulary_items
-           WHERE list_name = %s AND version_id = %s AND is_active = TRUE
-           ORDER BY rank, source_text""",
-        (list_name, version_id),
-    )
-
-    return serialize_rows(translations, VocabularyItemResponse) or []
+) -> Response:
+    columns, translations = query_words_db_tuples(TRANSLATIONS, (list_name, version_id))
+
+    response: Response = serialize_trusted_rows(columns, translations, VocabularyItemResponse)
+    return response
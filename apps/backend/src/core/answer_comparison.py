@@ -0,0 +1,99 @@
+import re
+import unicodedata
+
+# Mirrors packages/core/src/answer-comparison.ts; keep the two in step
+LATIN_TO_CYRILLIC = str.maketrans("aAcCeEoOpPxXyY", "аАсСеЕоОрРхХуУ")  # noqa: RUF001
+
+LATIN_DIACRITICS = re.compile(r"[àáâãäåæçèéêëìíîïñòóôõöøùúûüýÿ]")
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+WHITESPACE = re.compile(r"\s+")
+CYRILLIC = re.compile(r"[а-яё]", re.IGNORECASE)  # noqa: RUF001
+ONLY_LOOKALIKES = re.compile(r"^[aceopsxy]+$", re.IGNORECASE)
+OPTIONAL_PART = re.compile(r"^(.*?)(\[(.*?)\])(.*)$")
+GERMAN_COLLAPSE = (("ä", "a"), ("ö", "o"), ("ü", "u"), ("Ä", "a"), ("Ö", "o"), ("Ü", "u"), ("ß", "ss"), ("ae", "a"), ("oe", "o"), ("ue", "u"))
+
+
+def _strip_latin_diacritics(text: str) -> str:
+    return LATIN_DIACRITICS.sub(lambda m: COMBINING_MARKS.sub("", unicodedata.normalize("NFD", m.group())), text)
+
+
+def _collapse_german(text: str) -> str:
+    for umlaut, replacement in GERMAN_COLLAPSE:
+        text = text.replace(umlaut, replacement)
+    return text
+
+
+def normalize(text: str) -> str:
+    if text == "":
+        return ""
+    result = _collapse_german(_strip_latin_diacritics(WHITESPACE.sub("", text.strip().lower())))
+
+    if CYRILLIC.search(result):
+        result = result.translate(LATIN_TO_CYRILLIC)
+
+    if ONLY_LOOKALIKES.match(result) and len(result) <= 3 and ("py" in result or "op" in result or "po" in result):
+        result = result.translate(LATIN_TO_CYRILLIC)
+
+    return result.replace("ё", "е")  # noqa: RUF001
+
+
+def _split_top_level_commas(text: str) -> list[str]:
+    parts = []
+    current = ""
+    depth_par = depth_br = 0
+    for ch in text:
+        if ch == "(":
+            depth_par += 1
+        elif ch == ")":
+            depth_par = max(0, depth_par - 1)
+        elif ch == "[":
+            depth_br += 1
+        elif ch == "]":
+            depth_br = max(0, depth_br - 1)
+
+        if ch == "," and depth_par == 0 and depth_br == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += ch
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _expand_group(group: str) -> list[str]:
+    group = group.strip()
+    if group.startswith("(") and group.endswith(")") and "|" in group:
+        group = group[1:-1]
+
+    match = OPTIONAL_PART.match(group)
+    base_variants = [group] if match is None else [f"{match[1]}{match[3]}{match[4]}", f"{match[1]}{match[4]}"]
+
+    alternatives: list[str] = []
+    for base in base_variants:
+        if "|" in base:
+            alternatives.extend(part.strip() for part in base.split("|") if part.strip())
+        elif base:
+            alternatives.append(base)
+    return list(dict.fromkeys(alternatives))
+
+
+def check_answer(user_answer: str, correct_answer: str) -> bool:
+    if normalize(user_answer) == "" and normalize(correct_answer) == "":
+        return True
+
+    groups = [{normalize(alternative) for alternative in _expand_group(group)} for group in _split_top_level_commas(correct_answer)]
+    if len(groups) == 1:
+        return normalize(user_answer) in groups[0]
+
+    tokens = [normalize(token) for token in _split_top_level_commas(user_answer)]
+    if len(tokens) != len(groups):
+        return False
+
+    used: set[int] = set()
+    for token in tokens:
+        match = next((i for i, group in enumerate(groups) if i not in used and token in group), None)
+        if match is None:
+            return False
+        used.add(match)
+    return True
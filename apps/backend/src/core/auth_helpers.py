@@ -1,7 +1,44 @@
 import hashlib
 
+from core.config import REFRESH_TOKEN_PURGE_BATCH_SIZE, REFRESH_TOKEN_REVOKED_RETENTION_HOURS
 from core.database import execute_write_transaction
-from core.security import create_access_token, create_refresh_token
+from core.logging import get_logger
+from core.prepared import prepared_statement
+from core.security import create_access_token, create_refresh_token, verify_refresh_token
+from fastapi import HTTPException, status
+
+logger = get_logger(__name__)
+
+# Revokes the presented token and stores its replacement in one round-trip; no row means the token was unusable
+ROTATE_REFRESH_TOKEN = prepared_statement(
+    "rotate_refresh_token",
+    ("text", "text", "timestamptz"),
+    """
+    WITH revoked AS (
+        UPDATE refresh_tokens SET revoked_at = NOW()
+        WHERE token_hash = $1 AND revoked_at IS NULL AND expires_at > NOW()
+        RETURNING user_id
+    ),
+    inserted AS (
+        INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
+        SELECT user_id, $2, $3 FROM revoked
+        RETURNING user_id
+    )
+    SELECT u.id, u.username, u.is_admin
+    FROM inserted JOIN users u ON u.id = inserted.user_id
+    """,
+)
+
+PURGE_REFRESH_TOKENS_SQL = """
+    DELETE FROM refresh_tokens
+    WHERE id IN (
+        SELECT id FROM refresh_tokens
+        WHERE expires_at < NOW()
+           OR revoked_at < NOW() - make_interval(hours => %s)
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+"""
 
 
 def create_and_store_refresh_token(user_id: int) -> str:
@@ -14,6 +51,23 @@ def create_and_store_refresh_token(user_id: int) -> str:
     return result
 
 
+def rotate_refresh_token(refresh_token_value: str) -> tuple[dict, str]:
+    old_hash = hashlib.sha256(refresh_token_value.encode()).hexdigest()
+    new_token, new_hash, expires_at = create_refresh_token()
+    user = execute_write_transaction(
+        ROTATE_REFRESH_TOKEN,
+        (old_hash, new_hash, expires_at),
+        fetch_results=True,
+        one=True,
+    )
+
+    if not user:
+        verify_refresh_token(refresh_token_value)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    return user, new_token
+
+
 def build_access_token(user_id: int, username: str, is_admin: bool = False) -> str:
     result: str = create_access_token(
         data={
@@ -31,3 +85,16 @@ def revoke_refresh_token(refresh_token_value: str) -> None:
         "UPDATE refresh_tokens SET revoked_at = NOW() WHERE token_hash = %s",
         (token_hash,),
     )
+
+
+def purge_refresh_tokens(batch_size: int = REFRESH_TOKEN_PURGE_BATCH_SIZE) -> int:
+    purged = 0
+    while True:
+        deleted: int = execute_write_transaction(PURGE_REFRESH_TOKENS_SQL, (REFRESH_TOKEN_REVOKED_RETENTION_HOURS, batch_size))
+        purged += deleted
+        if deleted < batch_size:
+            break
+
+    if purged:
+        logger.info("Purged refresh tokens", extra={"purged": purged})
+    return purged
@@ -0,0 +1,41 @@
+from collections.abc import Callable
+import threading
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], object], run_immediately: bool = False):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_immediately = run_immediately
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> None:
+        try:
+            self.func()
+        except Exception as e:
+            logger.error(f"Background task {self.name} failed: {e}")
+
+    def _run(self) -> None:
+        if self.run_immediately:
+            self.run_once()
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
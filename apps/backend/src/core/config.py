@@ -31,6 +31,37 @@ WORDS_DB_PASSWORD = os.getenv("WORDS_DB_PASSWORD", DB_PASSWORD)
 WORDS_DB_POOL_MIN_SIZE = int(os.getenv("WORDS_DB_POOL_MIN_SIZE", "5"))
 WORDS_DB_POOL_MAX_SIZE = int(os.getenv("WORDS_DB_POOL_MAX_SIZE", "20"))
 
+# Pools are created in the app lifespan and connect on demand; *_POOL_MIN_SIZE caps the idle connections each pool
+# keeps, and startup opens up to this many per pool in the background (readiness reports "starting" until it is done)
+DB_POOL_WARMUP_SIZE = int(os.getenv("DB_POOL_WARMUP_SIZE", "2"))
+
+# Optional streaming replicas of the words database as comma-separated host[:port]; reads go to the primary whenever
+# no replica is healthy and within the lag limit, and a replica that fails a query is skipped for the retry period
+WORDS_DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("WORDS_DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+WORDS_DB_REPLICA_POOL_MIN_SIZE = int(os.getenv("WORDS_DB_REPLICA_POOL_MIN_SIZE", "2"))
+WORDS_DB_REPLICA_POOL_MAX_SIZE = int(os.getenv("WORDS_DB_REPLICA_POOL_MAX_SIZE", str(WORDS_DB_POOL_MAX_SIZE)))
+WORDS_DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("WORDS_DB_REPLICA_MAX_LAG_SECONDS", "5"))
+WORDS_DB_REPLICA_RETRY_SECONDS = float(os.getenv("WORDS_DB_REPLICA_RETRY_SECONDS", "30"))
+
+# Rows fetched per round trip by the server-side cursor behind the admin NDJSON export
+VOCABULARY_EXPORT_BATCH_SIZE = int(os.getenv("VOCABULARY_EXPORT_BATCH_SIZE", "2000"))
+# Upper bound on create/update/deactivate operations in one admin bulk request
+VOCABULARY_BULK_MAX_OPERATIONS = int(os.getenv("VOCABULARY_BULK_MAX_OPERATIONS", "5000"))
+# In-memory trigram index over the active version for admin typeahead (interval 0 disables background refresh)
+VOCABULARY_SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("VOCABULARY_SEARCH_INDEX_REFRESH_SECONDS", "60"))
+VOCABULARY_SEARCH_SIMILARITY_THRESHOLD = float(os.getenv("VOCABULARY_SEARCH_SIMILARITY_THRESHOLD", "0.3"))
+# Server-side quiz: one in-memory session per user, rebuilt from user_progress after idling out or on eviction
+QUIZ_SESSION_MAX_COUNT = int(os.getenv("QUIZ_SESSION_MAX_COUNT", "10000"))
+QUIZ_SESSION_IDLE_SECONDS = float(os.getenv("QUIZ_SESSION_IDLE_SECONDS", "1800"))
+# Word lists cached per (content version, list) for building quiz sessions; after the TTL the list's latest
+# updated_at and row count are re-read, and a change (an admin edit to the active version) reloads it
+QUIZ_VOCABULARY_CACHE_SIZE = int(os.getenv("QUIZ_VOCABULARY_CACHE_SIZE", "64"))
+QUIZ_VOCABULARY_TTL_SECONDS = float(os.getenv("QUIZ_VOCABULARY_TTL_SECONDS", "30"))
+
+# Background pool probe behind /api/health; readiness fails once the last probe is older than the stale limit
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "5"))
+HEALTH_PROBE_STALE_SECONDS = float(os.getenv("HEALTH_PROBE_STALE_SECONDS", str(HEALTH_PROBE_INTERVAL_SECONDS * 3)))
+
 # JWT configuration
 
 
@@ -64,6 +95,21 @@ JWT_ACCESS_TOKEN_EXPIRES_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES_MINUT
 JWT_REFRESH_TOKEN_EXPIRES_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS", "7"))
 JWT_EXPIRES_IN = f"{JWT_ACCESS_TOKEN_EXPIRES_MINUTES}m"
 
+# Background purge of expired and revoked refresh tokens (interval 0 disables it)
+REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = int(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+REFRESH_TOKEN_PURGE_BATCH_SIZE = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "5000"))
+REFRESH_TOKEN_REVOKED_RETENTION_HOURS = int(os.getenv("REFRESH_TOKEN_REVOKED_RETENTION_HOURS", "24"))
+
+# bcrypt runs on its own bounded executor; requests beyond workers + queue get 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+
+# Per-worker LRU of verified access-token claims (0 disables caching)
+JWT_VERIFIED_CACHE_SIZE = int(os.getenv("JWT_VERIFIED_CACHE_SIZE", "10000"))
+
+# Per-worker cache of confirmed admin grants (0 disables caching)
+ADMIN_AUTH_CACHE_TTL_SECONDS = float(os.getenv("ADMIN_AUTH_CACHE_TTL_SECONDS", "30"))
+
 # Server configuration
 PORT = int(os.getenv("PORT", 9000))
 
@@ -81,6 +127,44 @@ RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
 if not RATE_LIMIT_ENABLED:
     logger.warning("Rate limiting is DISABLED - this is insecure for production!")
 
+# shm:// keeps counters in a fixed-size table shared by all workers on the node.
+# Multi-node deployments can point this at any limits backend, e.g. redis://host:6379
+# Each slot is 24 bytes and holds one (limit, client, route) window; keep it well above the distinct
+# pairs seen per window, since keys that find no free slot are let through uncounted
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "shm://")
+RATE_LIMIT_SHM_SLOTS = int(os.getenv("RATE_LIMIT_SHM_SLOTS", "65536"))
+
+# Admission control per route group; limits are in-flight requests per worker, group=limit pairs
+LOAD_SHED_ENABLED = os.getenv("LOAD_SHED_ENABLED", "true").lower() in ("true", "1", "yes")
+LOAD_SHED_GROUP_LIMITS = {
+    group.strip(): int(limit)
+    for group, _, limit in (pair.partition("=") for pair in os.getenv("LOAD_SHED_GROUP_LIMITS", "tts=8,speech=4,admin=4,default=64").split(","))
+    if group.strip() and limit.strip()
+}
+LOAD_SHED_PROTECTED_GROUPS = {group.strip() for group in os.getenv("LOAD_SHED_PROTECTED_GROUPS", "auth,progress").split(",") if group.strip()}
+LOAD_SHED_LOW_PRIORITY_GROUPS = {
+    group.strip() for group in os.getenv("LOAD_SHED_LOW_PRIORITY_GROUPS", "tts,speech,admin").split(",") if group.strip()
+}
+# Saturation (0-1) of the busiest DB pool a route group uses, or the threadpool, at which low-priority, then all unprotected, work is shed
+LOAD_SHED_LOW_PRIORITY_SATURATION = float(os.getenv("LOAD_SHED_LOW_PRIORITY_SATURATION", "0.8"))
+LOAD_SHED_SATURATION = float(os.getenv("LOAD_SHED_SATURATION", "0.95"))
+LOAD_SHED_RETRY_AFTER_SECONDS = int(os.getenv("LOAD_SHED_RETRY_AFTER_SECONDS", "2"))
+
+# statement_timeout (ms) set per query with SET LOCAL, by the route group of the request (group=ms pairs,
+# "default" for ungrouped routes); queries outside a request (startup, background jobs) use the background value. 0 disables
+STATEMENT_TIMEOUT_GROUP_MS = {
+    group.strip(): int(timeout)
+    for group, _, timeout in (
+        pair.partition("=")
+        for pair in os.getenv("STATEMENT_TIMEOUT_GROUP_MS", "auth=2000,progress=3000,tts=3000,speech=3000,admin=30000,default=2000").split(",")
+    )
+    if group.strip() and timeout.strip()
+}
+STATEMENT_TIMEOUT_BACKGROUND_MS = int(os.getenv("STATEMENT_TIMEOUT_BACKGROUND_MS", "0"))
+STATEMENT_TIMEOUT_RETRY_AFTER_SECONDS = int(os.getenv("STATEMENT_TIMEOUT_RETRY_AFTER_SECONDS", "2"))
+# Admin search is interactive, so it gets a tighter limit than the rest of the admin group
+VOCABULARY_SEARCH_TIMEOUT_MS = int(os.getenv("VOCABULARY_SEARCH_TIMEOUT_MS", "5000"))
+
 # Application version (injected at Docker build time)
 APP_VERSION = os.getenv("APP_VERSION", "dev")
 APP_ENVIRONMENT = os.getenv("APP_ENVIRONMENT", "development")
@@ -94,9 +178,25 @@ LOG_JSON_FORMAT = os.getenv("LOG_JSON_FORMAT", "false").lower() in ("true", "1",
 if APP_ENVIRONMENT in ("production", "staging"):
     LOG_JSON_FORMAT = True
 
+# Records are formatted and written on a background thread; 0 logs synchronously. Full queue drops records.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Fraction of successful request log lines kept; 4xx/5xx are always logged
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+
 # Slow query threshold (milliseconds)
 SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
 
+# Request profiling: sample a fraction of requests, or admin requests sending PROFILING_HEADER ("stack" adds stack samples)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.0"))
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")
+PROFILING_HISTORY_SIZE = int(os.getenv("PROFILING_HISTORY_SIZE", "100"))
+PROFILING_STACK_INTERVAL_MS = float(os.getenv("PROFILING_STACK_INTERVAL_MS", "5"))
+
+# Prometheus-style /metrics (served on the app port, not proxied by nginx)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes")
+
 # Azure Speech Services configuration (TTS + pronunciation assessment)
 AZURE_SPEECH_API_KEY = os.getenv("AZURE_SPEECH_API_KEY", "")
 AZURE_SPEECH_REGION = os.getenv("AZURE_SPEECH_REGION", "eastus")
+# Overridable so load tests can point synthesis at a local stub
+AZURE_TTS_ENDPOINT = os.getenv("AZURE_TTS_ENDPOINT", f"https://{AZURE_SPEECH_REGION}.tts.speech.microsoft.com/cognitiveservices/v1")
@@ -1,5 +1,9 @@
-from collections.abc import Callable
-import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+import itertools
+import threading
 import time
 from typing import Any, cast
 
@@ -9,6 +13,7 @@ from core.config import (
     DB_PASSWORD,
     DB_POOL_MAX_SIZE,
     DB_POOL_MIN_SIZE,
+    DB_POOL_WARMUP_SIZE,
     DB_PORT,
     DB_USER,
     SLOW_QUERY_THRESHOLD_MS,
@@ -25,10 +30,22 @@ from core.config import (
     WORDS_DB_POOL_MAX_SIZE,
     WORDS_DB_POOL_MIN_SIZE,
     WORDS_DB_PORT,
+    WORDS_DB_REPLICA_HOSTS,
+    WORDS_DB_REPLICA_MAX_LAG_SECONDS,
+    WORDS_DB_REPLICA_POOL_MAX_SIZE,
+    WORDS_DB_REPLICA_POOL_MIN_SIZE,
+    WORDS_DB_REPLICA_RETRY_SECONDS,
     WORDS_DB_USER,
 )
+from core.json_encoder import PreEncodedJSONResponse, dump_json
+from core.load_shedding import record_pool_wait
 from core.logging import get_logger
+from core.metrics import GaugeCollector, db_query_duration, register
+from core.prepared import PreparedConnection, PreparedStatement, prepared_statement
+from core.profiling import record_db
+from core.statement_timeout import cancellable, record_cancellation, statement_timeout_ms
 import psycopg2
+import psycopg2.errors
 from psycopg2.extras import RealDictCursor
 import psycopg2.pool
 from psycopg2.pool import SimpleConnectionPool
@@ -38,6 +55,8 @@ logger = get_logger(__name__)
 
 WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER", "TRUNCATE")
 
+ACTIVE_VERSION = prepared_statement("active_version", (), "SELECT get_active_version_id()")
+
 
 def _get_query_fingerprint(query: str, max_length: int = 50) -> str:
     normalized = " ".join(query.split())
@@ -106,8 +125,31 @@ def _handle_query_error(e: Exception, db_name: str, query_fingerprint: str, star
     _safe_rollback(conn)
 
 
+def _timeout_prefix(timeout_ms: int | None) -> str:
+    timeout = statement_timeout_ms(timeout_ms)
+    return f"SET LOCAL statement_timeout = {int(timeout)}; " if timeout else ""
+
+
+def _execute(cur, conn, query: str | PreparedStatement, args, prefix: str = "") -> None:
+    if not isinstance(query, PreparedStatement):
+        cur.execute(prefix + query, args)
+        return
+
+    # Prepared lazily per connection; a new connection starts empty, and a server that dropped
+    # its statements (DISCARD ALL, pooler reset) gets them again on the retry
+    if query.name not in conn.prepared:
+        cur.execute(query.prepare_sql)
+        conn.prepared.add(query.name)
+    try:
+        cur.execute(prefix + query.execute_sql, args)
+    except psycopg2.errors.InvalidSqlStatementName:
+        conn.rollback()
+        conn.prepared.clear()
+        _execute(cur, conn, query, args, prefix)
+
+
 def _execute_query(
-    query: str,
+    query: str | PreparedStatement,
     args: tuple,
     get_conn: Callable,
     put_conn: Callable,
@@ -115,33 +157,46 @@ def _execute_query(
     one: bool = False,
     is_write: bool = False,
     fetch_results: bool = False,
+    as_tuples: bool = False,
+    timeout_ms: int | None = None,
 ):
-    query_upper = query.strip().upper()
+    query_upper = (query.sql if isinstance(query, PreparedStatement) else query).strip().upper()
 
     if not is_write:
         _validate_read_query(query_upper)
 
     conn = None
     start_time = time.perf_counter()
-    query_fingerprint = _get_query_fingerprint(query)
+    query_fingerprint = query.name if isinstance(query, PreparedStatement) else _get_query_fingerprint(query)
 
     try:
         conn = get_conn()
+        record_pool_wait(db_name, time.perf_counter() - start_time)
         if not conn:
             raise RuntimeError(f"Failed to get {db_name} database connection")
 
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, args)
+        with conn.cursor(cursor_factory=None if as_tuples else RealDictCursor) as cur:
+            with cancellable(conn):
+                _execute(cur, conn, query, args, _timeout_prefix(timeout_ms))
 
             if is_write:
                 result, log_extra = _execute_write(cur, conn, one, fetch_results)
             else:
                 result, log_extra = _execute_read(cur, one)
 
+            if as_tuples:
+                result = ([column.name for column in cur.description], result)
+
             duration_ms = (time.perf_counter() - start_time) * 1000
+            db_query_duration.observe(duration_ms / 1000, db_name, query_fingerprint)
+            record_db(db_name, duration_ms)
             _log_slow_query(query_fingerprint, duration_ms, db_name, **log_extra)
             return result
 
+    except psycopg2.errors.QueryCanceled as e:
+        record_cancellation(db_name, query_fingerprint)
+        _handle_query_error(e, db_name, query_fingerprint, start_time, conn, is_write)
+        raise
     except psycopg2.OperationalError as e:
         _handle_query_error(e, db_name, query_fingerprint, start_time, conn, is_write)
         _safe_close(conn)
@@ -159,7 +214,63 @@ def _execute_query(
                 _safe_close(conn)
 
 
-KEEPALIVE_PARAMS = {
+def _stream_query(
+    query: str, args: tuple, get_conn: Callable, put_conn: Callable, db_name: str, batch_size: int, timeout_ms: int | None = None
+) -> Iterator[tuple[list[str], list[tuple]]]:
+    _validate_read_query(query.strip().upper())
+
+    conn = None
+    start_time = time.perf_counter()
+    query_fingerprint = _get_query_fingerprint(query)
+    row_count = 0
+
+    try:
+        conn = get_conn()
+        record_pool_wait(db_name, time.perf_counter() - start_time)
+        if not conn:
+            raise RuntimeError(f"Failed to get {db_name} database connection")
+
+        # SET LOCAL holds for every FETCH of the server-side cursor, so the limit applies per batch
+        if prefix := _timeout_prefix(timeout_ms):
+            with conn.cursor() as setup:
+                setup.execute(prefix)
+        with cancellable(conn), conn.cursor(name="stream_cursor") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, args)
+            while rows := cur.fetchmany(batch_size):
+                row_count += len(rows)
+                yield [column.name for column in cur.description], rows
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        db_query_duration.observe(duration_ms / 1000, db_name, query_fingerprint)
+        logger.info(
+            "Streamed query finished", extra={"query": query_fingerprint, "duration_ms": round(duration_ms, 2), "db": db_name, "row_count": row_count}
+        )
+
+    except psycopg2.errors.QueryCanceled as e:
+        record_cancellation(db_name, query_fingerprint)
+        _handle_query_error(e, db_name, query_fingerprint, start_time, conn, False)
+        raise
+    except psycopg2.OperationalError as e:
+        _handle_query_error(e, db_name, query_fingerprint, start_time, conn, False)
+        _safe_close(conn)
+        conn = None
+        raise
+    except Exception as e:
+        _handle_query_error(e, db_name, query_fingerprint, start_time, conn, False)
+        raise
+    finally:
+        if conn:
+            _safe_rollback(conn)
+            try:
+                put_conn(conn)
+            except Exception as e:
+                logger.critical(f"Failed to return {db_name} connection to pool: {e}")
+                _safe_close(conn)
+
+
+CONNECTION_PARAMS = {
+    "connection_factory": PreparedConnection,
     "keepalives": 1,
     "keepalives_idle": 30,
     "keepalives_interval": 10,
@@ -167,15 +278,63 @@ KEEPALIVE_PARAMS = {
     "connect_timeout": 10,
 }
 
-SKIP_DB_INIT = os.getenv("SKIP_DB_INIT", "false").lower() in {"1", "true", "yes"}
+PRIMARY_WAL_LSN_SQL = "SELECT pg_current_wal_lsn()::text"
+
+# Lag is measured against the primary's WAL position read just before, not against what the standby has received,
+# so a standby that lost its WAL stream falls behind as soon as the primary writes. Zero once replayed up to that
+# position, otherwise seconds since the last replayed transaction; NULL (unusable) on a server that is not a standby.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN NULL
+        WHEN pg_last_wal_replay_lsn() >= %s::pg_lsn THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+@dataclass
+class WordsReplica:
+    name: str
+    pool: SimpleConnectionPool
+    lag_seconds: float | None = None
+    down_until: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.lag_seconds is not None and self.lag_seconds <= WORDS_DB_REPLICA_MAX_LAG_SECONDS and now >= self.down_until
+
+    def mark_down(self, error: Exception) -> None:
+        self.down_until = time.monotonic() + WORDS_DB_REPLICA_RETRY_SECONDS
+        logger.warning("Words replica marked down", extra={"replica": self.name, "error": str(error)})
+
+
+class LazyConnectionPool(SimpleConnectionPool):
+    # Opens nothing up front; minconn only caps how many idle connections are kept after use
+    def __init__(self, minconn: int, maxconn: int, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = int(minconn)
+
+    def add_idle(self) -> None:
+        conn = psycopg2.connect(*self._args, **self._kwargs)
+        if len(self._pool) < self.minconn and len(self._pool) + len(self._used) < self.maxconn:
+            self._pool.append(conn)
+        else:
+            conn.close()
+
 
-if SKIP_DB_INIT:
-    logger.info("Skipping database pool initialization because SKIP_DB_INIT is set")
-    db_pool = None
-    tts_db_pool = None
-    words_db_pool = None
-else:
-    db_pool = SimpleConnectionPool(
+db_pool: LazyConnectionPool | None = None
+tts_db_pool: LazyConnectionPool | None = None
+words_db_pool: LazyConnectionPool | None = None
+words_replicas: list[WordsReplica] = []
+_pools_warm = threading.Event()
+
+
+# Called from the app lifespan (or a script's main); importing this module never touches a database
+def init_pools() -> None:
+    global db_pool, tts_db_pool, words_db_pool
+    if db_pool is not None:
+        return
+
+    db_pool = LazyConnectionPool(
         DB_POOL_MIN_SIZE,
         DB_POOL_MAX_SIZE,
         host=DB_HOST,
@@ -183,10 +342,10 @@ else:
         database=DB_NAME,
         user=DB_USER,
         password=DB_PASSWORD,
-        **KEEPALIVE_PARAMS,
+        **CONNECTION_PARAMS,
     )
 
-    tts_db_pool = SimpleConnectionPool(
+    tts_db_pool = LazyConnectionPool(
         TTS_DB_POOL_MIN_SIZE,
         TTS_DB_POOL_MAX_SIZE,
         host=TTS_DB_HOST,
@@ -194,11 +353,11 @@ else:
         database=TTS_DB_NAME,
         user=TTS_DB_USER,
         password=TTS_DB_PASSWORD,
-        **KEEPALIVE_PARAMS,
+        **CONNECTION_PARAMS,
     )
     logger.info("TTS database pool initialized (host=%s, db=%s)", TTS_DB_HOST, TTS_DB_NAME)
 
-    words_db_pool = SimpleConnectionPool(
+    words_db_pool = LazyConnectionPool(
         WORDS_DB_POOL_MIN_SIZE,
         WORDS_DB_POOL_MAX_SIZE,
         host=WORDS_DB_HOST,
@@ -206,10 +365,67 @@ else:
         database=WORDS_DB_NAME,
         user=WORDS_DB_USER,
         password=WORDS_DB_PASSWORD,
-        **KEEPALIVE_PARAMS,
+        **CONNECTION_PARAMS,
     )
     logger.info("Words database pool initialized (host=%s, db=%s)", WORDS_DB_HOST, WORDS_DB_NAME)
 
+    for replica_host in WORDS_DB_REPLICA_HOSTS:
+        host, _, port = replica_host.partition(":")
+        words_replicas.append(
+            WordsReplica(
+                replica_host,
+                LazyConnectionPool(
+                    WORDS_DB_REPLICA_POOL_MIN_SIZE,
+                    WORDS_DB_REPLICA_POOL_MAX_SIZE,
+                    host=host,
+                    port=int(port or WORDS_DB_PORT),
+                    database=WORDS_DB_NAME,
+                    user=WORDS_DB_USER,
+                    password=WORDS_DB_PASSWORD,
+                    **CONNECTION_PARAMS,
+                ),
+            )
+        )
+        logger.info("Words replica pool initialized (host=%s, db=%s)", replica_host, WORDS_DB_NAME)
+
+
+# Opens the first few idle connections of every pool concurrently; requests that arrive meanwhile connect on demand
+def warm_pools() -> None:
+    pools: list[Any] = [pool for pool in get_pools().values() if pool is not None] + [replica.pool for replica in words_replicas]
+    jobs = [pool for pool in pools for _ in range(min(DB_POOL_WARMUP_SIZE, pool.minconn))]
+    start = time.perf_counter()
+    failures = 0
+    if jobs:
+        with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="db-pool-warmup") as executor:
+            for future in [executor.submit(pool.add_idle) for pool in jobs]:
+                try:
+                    future.result()
+                except Exception as e:
+                    failures += 1
+                    logger.warning(f"Database pool warm-up connection failed: {e}")
+    _pools_warm.set()
+    logger.info(
+        "Database pools warmed up",
+        extra={"connections": len(jobs) - failures, "failures": failures, "duration_ms": round((time.perf_counter() - start) * 1000, 2)},
+    )
+
+
+def pools_warm() -> bool:
+    return _pools_warm.is_set()
+
+
+def close_pools() -> None:
+    global db_pool, tts_db_pool, words_db_pool
+    for pool in [db_pool, tts_db_pool, words_db_pool, *(replica.pool for replica in words_replicas)]:
+        if pool is not None and not pool.closed:
+            pool.closeall()
+    db_pool = tts_db_pool = words_db_pool = None
+    words_replicas.clear()
+    _pools_warm.clear()
+
+
+_replica_turn = itertools.count()
+
 
 def get_db():
     if db_pool is None:
@@ -235,26 +451,146 @@ def put_words_db(conn):
     words_db_pool.putconn(conn)
 
 
-def query_db(query, args=(), one=False):
-    return _execute_query(query, args, get_db, put_db, "main", one=one)
+def _pick_words_replica() -> WordsReplica | None:
+    now = time.monotonic()
+    candidates = [replica for replica in words_replicas if replica.available(now)]
+    return candidates[next(_replica_turn) % len(candidates)] if candidates else None
+
+
+def _words_read(primary: bool, run: Callable[[Callable, Callable, str], Any]) -> Any:
+    replica = None if primary else _pick_words_replica()
+    if replica is None:
+        return run(get_words_db, put_words_db, "words")
+    try:
+        return run(replica.pool.getconn, replica.pool.putconn, "words_replica")
+    except psycopg2.errors.QueryCanceled:
+        raise
+    except (psycopg2.OperationalError, psycopg2.pool.PoolError) as e:
+        replica.mark_down(e)
+        return run(get_words_db, put_words_db, "words")
+
+
+def _primary_wal_lsn() -> str:
+    conn = get_words_db()
+    close = False
+    try:
+        with conn.cursor() as cur:
+            cur.execute(PRIMARY_WAL_LSN_SQL)
+            lsn = cur.fetchone()[0]
+        conn.rollback()
+        return str(lsn)
+    except Exception:
+        close = True
+        raise
+    finally:
+        cast(SimpleConnectionPool, words_db_pool).putconn(conn, close=close)
+
+
+def probe_words_replicas() -> dict[str, dict]:
+    if not words_replicas:
+        return {}
+    try:
+        primary_lsn = _primary_wal_lsn()
+    except psycopg2.pool.PoolError:
+        return {replica.name: {"status": "saturated", "lag_seconds": replica.lag_seconds, "error": None} for replica in words_replicas}
+    except Exception as e:
+        # Without the primary's position no replica can be shown to be caught up
+        for replica in words_replicas:
+            replica.lag_seconds = None
+        return {replica.name: {"status": "error", "lag_seconds": None, "error": f"primary WAL position: {e}"} for replica in words_replicas}
+
+    results = {}
+    for replica in words_replicas:
+        conn = None
+        close = False
+        try:
+            conn = replica.pool.getconn()
+            with conn.cursor() as cur:
+                cur.execute(REPLICA_LAG_SQL, (primary_lsn,))
+                lag = cur.fetchone()[0]
+            conn.rollback()
+            replica.lag_seconds = None if lag is None else float(lag)
+            results[replica.name] = {
+                "status": "ok" if replica.available(time.monotonic()) else "skipped",
+                "lag_seconds": replica.lag_seconds,
+                "error": None,
+            }
+        except psycopg2.pool.PoolError:
+            results[replica.name] = {"status": "saturated", "lag_seconds": replica.lag_seconds, "error": None}
+        except Exception as e:
+            close = True
+            replica.lag_seconds = None
+            results[replica.name] = {"status": "error", "lag_seconds": None, "error": str(e)}
+        finally:
+            if conn is not None:
+                replica.pool.putconn(conn, close=close)
+    return results
+
+
+def _replica_samples() -> Iterator[tuple[dict[str, str], float]]:
+    for replica in words_replicas:
+        yield {"replica": replica.name, "measure": "lag_seconds"}, -1.0 if replica.lag_seconds is None else replica.lag_seconds
+        yield {"replica": replica.name, "measure": "available"}, float(replica.available(time.monotonic()))
 
 
-def execute_write_transaction(query, args=(), fetch_results=False, one=False):
-    return _execute_query(query, args, get_db, put_db, "main", one=one, is_write=True, fetch_results=fetch_results)
+register(GaugeCollector("words_replica", "Words database replica lag (-1 when unknown) and routing availability.", _replica_samples))
 
 
-def query_words_db(query, args=(), one=False):
-    return _execute_query(query, args, get_words_db, put_words_db, "words", one=one)
+def get_pools() -> dict[str, SimpleConnectionPool | None]:
+    return {"main": db_pool, "words": words_db_pool, "tts": tts_db_pool}
 
 
-def execute_words_write_transaction(query, args=(), fetch_results=False, one=False):
-    return _execute_query(query, args, get_words_db, put_words_db, "words", one=one, is_write=True, fetch_results=fetch_results)
+def pool_usage(pool: SimpleConnectionPool) -> tuple[int, int]:
+    return len(pool._used), pool.maxconn
+
+
+# timeout_ms overrides the statement_timeout of the request's route group for this one call
+def query_db(query, args=(), one=False, timeout_ms=None):
+    return _execute_query(query, args, get_db, put_db, "main", one=one, timeout_ms=timeout_ms)
+
+
+def query_db_tuples(query, args=(), timeout_ms=None) -> tuple[list[str], list[tuple]]:
+    return cast(tuple[list[str], list[tuple]], _execute_query(query, args, get_db, put_db, "main", as_tuples=True, timeout_ms=timeout_ms))
+
+
+def execute_write_transaction(query, args=(), fetch_results=False, one=False, timeout_ms=None):
+    return _execute_query(query, args, get_db, put_db, "main", one=one, is_write=True, fetch_results=fetch_results, timeout_ms=timeout_ms)
+
+
+# Words reads go to a healthy replica unless primary=True; use it to read back admin writes
+def query_words_db(query, args=(), one=False, primary=False, timeout_ms=None):
+    return _words_read(
+        primary, lambda get_conn, put_conn, db_name: _execute_query(query, args, get_conn, put_conn, db_name, one=one, timeout_ms=timeout_ms)
+    )
+
+
+def query_words_db_tuples(query, args=(), primary=False, timeout_ms=None) -> tuple[list[str], list[tuple]]:
+    return cast(
+        tuple[list[str], list[tuple]],
+        _words_read(
+            primary,
+            lambda get_conn, put_conn, db_name: _execute_query(query, args, get_conn, put_conn, db_name, as_tuples=True, timeout_ms=timeout_ms),
+        ),
+    )
+
+
+def stream_words_db_tuples(query, args=(), batch_size: int = 1000, primary=False, timeout_ms=None) -> Iterator[tuple[list[str], list[tuple]]]:
+    replica = None if primary else _pick_words_replica()
+    if replica is None:
+        return _stream_query(query, args, get_words_db, put_words_db, "words", batch_size, timeout_ms)
+    return _stream_query(query, args, replica.pool.getconn, replica.pool.putconn, "words_replica", batch_size, timeout_ms)
+
+
+def execute_words_write_transaction(query, args=(), fetch_results=False, one=False, timeout_ms=None):
+    return _execute_query(
+        query, args, get_words_db, put_words_db, "words", one=one, is_write=True, fetch_results=fetch_results, timeout_ms=timeout_ms
+    )
 
 
 def get_active_version() -> int:
     from fastapi import HTTPException, status
 
-    result = query_words_db("SELECT get_active_version_id()", one=True)
+    result = query_words_db(ACTIVE_VERSION, one=True)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -271,3 +607,24 @@ def serialize_rows[T: BaseModel](results: Any, model: type[T], one: bool = False
         return cast(T, model.model_validate(dict(results)))
 
     return cast(list[T], [model.model_validate(dict(item)) for item in results])
+
+
+@cache
+def _response_keys(model: type[BaseModel]) -> dict[str, str]:
+    return {name: field.alias or name for name, field in model.model_fields.items()}
+
+
+def serialize_trusted_rows(columns: Sequence[str], rows: Iterable[Sequence], model: type[BaseModel]) -> PreEncodedJSONResponse:
+    response_keys = _response_keys(model)
+    missing = [name for name, field in model.model_fields.items() if field.is_required() and name not in columns]
+    if missing:
+        raise RuntimeError(f"Trusted rows for {model.__name__} are missing columns: {', '.join(missing)}")
+
+    keys = [response_keys[column] for column in columns]
+    return PreEncodedJSONResponse(content=dump_json([dict(zip(keys, row, strict=True)) for row in rows]))
+
+
+def serialize_trusted_ndjson(columns: Sequence[str], rows: Iterable[Sequence], model: type[BaseModel]) -> bytes:
+    response_keys = _response_keys(model)
+    keys = [response_keys[column] for column in columns]
+    return b"".join(dump_json(dict(zip(keys, row, strict=True))) + b"\n" for row in rows)
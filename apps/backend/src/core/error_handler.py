@@ -2,15 +2,20 @@ from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
+from core.config import LOAD_SHED_RETRY_AFTER_SECONDS, STATEMENT_TIMEOUT_RETRY_AFTER_SECONDS
 from core.logging import get_logger
 from fastapi import HTTPException
 import psycopg2
+import psycopg2.errors
+import psycopg2.pool
 
 T = TypeVar("T")
 
 logger = get_logger(__name__)
 
 GENERIC_ERROR = "An error occurred"
+POOL_EXHAUSTED_ERROR = "Server is busy. Please try again shortly."
+QUERY_TIMEOUT_ERROR = "Request took too long. Please try again shortly."
 
 
 def handle_api_errors(
@@ -23,6 +28,12 @@ def handle_api_errors(
                 return await func(*args, **kwargs)  # type: ignore[misc,no-any-return]
             except HTTPException:
                 raise
+            except psycopg2.pool.PoolError as e:
+                logger.warning(f"{operation_name} connection pool exhausted: {e}")
+                raise HTTPException(status_code=503, detail=POOL_EXHAUSTED_ERROR, headers={"Retry-After": str(LOAD_SHED_RETRY_AFTER_SECONDS)})
+            except psycopg2.errors.QueryCanceled as e:
+                logger.warning(f"{operation_name} query cancelled: {e}")
+                raise HTTPException(status_code=503, detail=QUERY_TIMEOUT_ERROR, headers={"Retry-After": str(STATEMENT_TIMEOUT_RETRY_AFTER_SECONDS)})
             except (psycopg2.DataError, psycopg2.IntegrityError, psycopg2.OperationalError, ValueError, TypeError) as e:
                 logger.warning(f"{operation_name} bad input: {e}")
                 raise HTTPException(status_code=400, detail=GENERIC_ERROR)
@@ -36,6 +47,12 @@ def handle_api_errors(
                 return func(*args, **kwargs)
             except HTTPException:
                 raise
+            except psycopg2.pool.PoolError as e:
+                logger.warning(f"{operation_name} connection pool exhausted: {e}")
+                raise HTTPException(status_code=503, detail=POOL_EXHAUSTED_ERROR, headers={"Retry-After": str(LOAD_SHED_RETRY_AFTER_SECONDS)})
+            except psycopg2.errors.QueryCanceled as e:
+                logger.warning(f"{operation_name} query cancelled: {e}")
+                raise HTTPException(status_code=503, detail=QUERY_TIMEOUT_ERROR, headers={"Retry-After": str(STATEMENT_TIMEOUT_RETRY_AFTER_SECONDS)})
             except (psycopg2.DataError, psycopg2.IntegrityError, psycopg2.OperationalError, ValueError, TypeError) as e:
                 logger.warning(f"{operation_name} bad input: {e}")
                 raise HTTPException(status_code=400, detail=GENERIC_ERROR)
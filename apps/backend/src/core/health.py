@@ -0,0 +1,96 @@
+import datetime
+import threading
+import time
+
+from core.background import PeriodicTask
+from core.config import HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_PROBE_STALE_SECONDS
+from core.database import get_pools, pool_usage, pools_warm, probe_words_replicas
+from core.logging import get_logger
+import psycopg2
+from psycopg2.pool import SimpleConnectionPool
+
+logger = get_logger(__name__)
+
+READY_STATUSES = {"ok", "saturated"}
+
+_snapshot: dict | None = None
+_snapshot_lock = threading.Lock()
+
+
+def _probe_pool(pool: SimpleConnectionPool | None) -> dict:
+    if pool is None:
+        return {"status": "unavailable", "in_use": 0, "max_size": 0, "saturation": 0.0, "latency_ms": None, "error": "Pool is not initialized"}
+
+    in_use, max_size = pool_usage(pool)
+    result: dict = {
+        "status": "ok",
+        "in_use": in_use,
+        "max_size": max_size,
+        "saturation": round(in_use / max_size, 3),
+        "latency_ms": None,
+        "error": None,
+    }
+
+    start = time.perf_counter()
+    try:
+        conn = pool.getconn()
+    except psycopg2.pool.PoolError:
+        result["status"] = "saturated"
+        return result
+    except Exception as e:
+        result.update(status="error", error=str(e))
+        return result
+
+    close = False
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    except Exception as e:
+        close = True
+        result.update(status="error", error=str(e))
+    finally:
+        pool.putconn(conn, close=close)
+
+    return result
+
+
+def probe_pools() -> None:
+    global _snapshot
+
+    pools = {name: _probe_pool(pool) for name, pool in get_pools().items()}
+    for name, pool in pools.items():
+        if pool["status"] not in READY_STATUSES:
+            logger.warning("Database pool probe failed", extra={"pool": name, "status": pool["status"], "error": pool["error"]})
+
+    # Replicas are reported but never gate readiness; reads fall back to the primary without them
+    replicas = probe_words_replicas()
+    for name, replica in replicas.items():
+        if replica["status"] == "error":
+            logger.warning("Words replica probe failed", extra={"replica": name, "error": replica["error"]})
+
+    with _snapshot_lock:
+        _snapshot = {"pools": pools, "replicas": replicas, "checked_at": time.time()}
+
+
+def get_readiness() -> dict:
+    with _snapshot_lock:
+        snapshot = _snapshot
+
+    if snapshot is None or not pools_warm():
+        return {"status": "starting", "checked_at": None, "age_seconds": None, "pools": {}}
+
+    age = time.time() - snapshot["checked_at"]
+    pools = snapshot["pools"]
+    ready = age <= HEALTH_PROBE_STALE_SECONDS and all(pool["status"] in READY_STATUSES for pool in pools.values())
+    return {
+        "status": "ready" if ready else "stale" if age > HEALTH_PROBE_STALE_SECONDS else "not_ready",
+        "checked_at": datetime.datetime.fromtimestamp(snapshot["checked_at"], datetime.UTC).isoformat(),
+        "age_seconds": round(age, 3),
+        "pools": pools,
+        "replicas": snapshot["replicas"],
+    }
+
+
+health_probe = PeriodicTask("db-health-probe", HEALTH_PROBE_INTERVAL_SECONDS, probe_pools, run_immediately=True)
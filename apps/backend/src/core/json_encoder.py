@@ -1,8 +1,11 @@
 from datetime import datetime
+import json
+import time
 from typing import Any
 from uuid import UUID
 
-from fastapi.responses import JSONResponse
+from core.profiling import record_serialization
+from fastapi.responses import JSONResponse, Response
 
 
 def encode_json_value(obj: Any) -> Any:
@@ -13,15 +16,24 @@ def encode_json_value(obj: Any) -> Any:
     raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
+def dump_json(content: Any) -> bytes:
+    start = time.perf_counter()
+    encoded = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=encode_json_value,
+    ).encode("utf-8")
+    record_serialization((time.perf_counter() - start) * 1000)
+    return encoded
+
+
 class CustomJSONResponse(JSONResponse):
     def render(self, content: Any) -> bytes:
-        import json
-
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-            default=encode_json_value,
-        ).encode("utf-8")
+        return dump_json(content)
+
+
+class PreEncodedJSONResponse(Response):
+    media_type = "application/json"
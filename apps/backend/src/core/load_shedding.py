@@ -0,0 +1,123 @@
+from collections.abc import Iterator
+from contextvars import ContextVar
+
+from anyio.to_thread import current_default_thread_limiter
+from core.config import (
+    LOAD_SHED_ENABLED,
+    LOAD_SHED_GROUP_LIMITS,
+    LOAD_SHED_LOW_PRIORITY_GROUPS,
+    LOAD_SHED_LOW_PRIORITY_SATURATION,
+    LOAD_SHED_PROTECTED_GROUPS,
+    LOAD_SHED_RETRY_AFTER_SECONDS,
+    LOAD_SHED_SATURATION,
+)
+from core.logging import get_logger
+from core.metrics import Counter, GaugeCollector, Histogram, register
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+logger = get_logger(__name__)
+
+ROUTE_GROUPS = (
+    ("/api/auth", "auth"),
+    ("/api/user/progress", "progress"),
+    ("/api/tts", "tts"),
+    ("/api/speech", "speech"),
+    ("/api/admin", "admin"),
+)
+
+# Database pools each group's requests check out from, so a saturated pool only sheds the groups that wait on it;
+# every group also runs on the shared threadpool
+ROUTE_GROUP_POOLS = {
+    "auth": ("main",),
+    "progress": ("main", "words"),
+    "tts": ("tts",),
+    "speech": (),
+    "admin": ("main", "words"),
+    "default": ("main", "words"),
+}
+
+POOL_WAIT_BUCKETS_SECONDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+_in_flight: dict[str, int] = {}
+_route_group: ContextVar[str] = ContextVar("route_group", default="default")
+
+load_shed_rejections = register(Counter("load_shed_rejections_total", "Requests rejected by admission control.", ("group", "reason")))
+db_pool_wait = register(
+    Histogram("db_pool_wait_seconds", "Time to check out a pooled connection by route group.", ("db", "group"), POOL_WAIT_BUCKETS_SECONDS)
+)
+
+
+def route_group(path: str) -> str:
+    for prefix, group in ROUTE_GROUPS:
+        if path.startswith(prefix):
+            return group
+    return "default"
+
+
+def record_pool_wait(db_name: str, wait_seconds: float) -> None:
+    db_pool_wait.observe(wait_seconds, db_name, _route_group.get())
+
+
+def _in_flight_samples() -> Iterator[tuple[dict[str, str], float]]:
+    for group, count in _in_flight.items():
+        yield {"group": group}, count
+
+
+register(GaugeCollector("http_requests_in_flight", "In-flight requests per route group.", _in_flight_samples))
+
+
+def current_saturation(group: str) -> float:
+    from core.database import get_pools, pool_usage
+
+    limiter = current_default_thread_limiter()
+    saturation = limiter.borrowed_tokens / limiter.total_tokens if limiter.total_tokens else 0.0
+    pools = get_pools()
+    for name in ROUTE_GROUP_POOLS.get(group, tuple(pools)):
+        pool = pools.get(name)
+        if pool is not None:
+            in_use, max_size = pool_usage(pool)
+            saturation = max(saturation, in_use / max_size)
+    return float(saturation)
+
+
+def _rejection_reason(group: str) -> str | None:
+    if group in LOAD_SHED_PROTECTED_GROUPS:
+        return None
+
+    limit = LOAD_SHED_GROUP_LIMITS.get(group)
+    if limit is not None and _in_flight.get(group, 0) >= limit:
+        return "group_limit"
+
+    threshold = LOAD_SHED_LOW_PRIORITY_SATURATION if group in LOAD_SHED_LOW_PRIORITY_GROUPS else LOAD_SHED_SATURATION
+    if current_saturation(group) >= threshold:
+        return "saturation"
+    return None
+
+
+class LoadSheddingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if not LOAD_SHED_ENABLED or not request.url.path.startswith("/api/") or request.url.path.startswith("/api/health"):
+            response: Response = await call_next(request)
+            return response
+
+        group = route_group(request.url.path)
+        reason = _rejection_reason(group)
+        if reason is not None:
+            load_shed_rejections.inc(group, reason)
+            logger.warning("Request shed", extra={"path": request.url.path, "method": request.method, "group": group, "reason": reason})
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy. Please try again shortly."},
+                headers={"Retry-After": str(LOAD_SHED_RETRY_AFTER_SECONDS)},
+            )
+
+        _in_flight[group] = _in_flight.get(group, 0) + 1
+        token = _route_group.set(group)
+        try:
+            response = await call_next(request)
+        finally:
+            _route_group.reset(token)
+            _in_flight[group] -= 1
+        return response
@@ -1,5 +1,10 @@
+import atexit
 from contextvars import ContextVar
+import copy
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
 import re
 import sys
 import time
@@ -11,21 +16,25 @@ user_id_var: ContextVar[str] = ContextVar("user_id", default="")
 
 MASKED_REPLACEMENT = r"\1***"
 
+# Applied in order, each over the previous one's output (the passes overlap, e.g. "Bearer token: xyz");
+# a pass only runs when its keyword appears in the message
 SENSITIVE_PATTERNS = [
-    (re.compile(r"(password[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(secret[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(token[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(api[_-]?key[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(authorization[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(bearer\s+)[^\s\"']+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"(basic\s+)[^\s\"']+", re.IGNORECASE), MASKED_REPLACEMENT),
-    (re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"), "***@***.***"),
+    ("password", re.compile(r"(password[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("secret", re.compile(r"(secret[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("token", re.compile(r"(token[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("api", re.compile(r"(api[_-]?key[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("authorization", re.compile(r"(authorization[\"']?\s*[:=]\s*[\"']?)[^\"'\s,}]+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("bearer", re.compile(r"(bearer\s+)[^\s\"']+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("basic", re.compile(r"(basic\s+)[^\s\"']+", re.IGNORECASE), MASKED_REPLACEMENT),
+    ("@", re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"), "***@***.***"),
 ]
 
 
 def mask_sensitive_data(message: str) -> str:
-    for pattern, replacement in SENSITIVE_PATTERNS:
-        message = pattern.sub(replacement, message)
+    lowered = message.lower()
+    for keyword, pattern, replacement in SENSITIVE_PATTERNS:
+        if keyword in lowered:
+            message = pattern.sub(replacement, message)
     return message
 
 
@@ -47,8 +56,6 @@ class ContextFilter(logging.Filter):
 
 class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
-        import json
-
         log_data: dict[str, Any] = {
             "timestamp": self.formatTime(record, self.datefmt),
             "level": record.levelname,
@@ -114,11 +121,56 @@ class ConsoleFormatter(logging.Formatter):
         return formatted
 
 
-def configure_logging(log_level: str = "INFO", json_format: bool = False) -> None:
+class DeferredFormatQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args on the caller; masking, formatting and the write happen on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: QueueListener | None = None
+_queue_handler: DeferredFormatQueueHandler | None = None
+
+
+def _stop_listener() -> None:
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def log_queue_stats() -> dict[str, int]:
+    if _queue_handler is None:
+        return {}
+    log_queue: queue.Queue = _queue_handler.queue  # type: ignore[assignment]
+    return {"queued": log_queue.qsize(), "dropped": _queue_handler.dropped}
+
+
+def configure_logging(log_level: str = "INFO", json_format: bool = False, queue_size: int = 0) -> None:
+    global _listener, _queue_handler
+
     root_logger = logging.getLogger()
 
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_listener()
+    _queue_handler = None
 
     handler = logging.StreamHandler(sys.stdout)
 
@@ -128,9 +180,17 @@ def configure_logging(log_level: str = "INFO", json_format: bool = False) -> Non
         handler.setFormatter(ConsoleFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
 
     handler.addFilter(SensitiveDataFilter())
-    handler.addFilter(ContextFilter())
 
-    root_logger.addHandler(handler)
+    if queue_size > 0:
+        _queue_handler = DeferredFormatQueueHandler(queue.Queue(maxsize=queue_size))
+        _queue_handler.addFilter(ContextFilter())
+        _listener = QueueListener(_queue_handler.queue, handler)
+        _listener.start()
+        root_logger.addHandler(_queue_handler)
+    else:
+        handler.addFilter(ContextFilter())
+        root_logger.addHandler(handler)
+
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
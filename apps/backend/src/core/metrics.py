@@ -0,0 +1,114 @@
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+import threading
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(_format_sample(self.name, dict(zip(self.label_names, labels, strict=True)), value) for labels, value in values.items())
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts, then +Inf count, then sum
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in snapshot.items():
+            base = dict(zip(self.label_names, labels, strict=True))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1], strict=True):
+                cumulative += count
+                lines.append(_format_sample(f"{self.name}_bucket", {**base, "le": str(bound)}, cumulative))
+            lines.append(_format_sample(f"{self.name}_sum", base, series[-1]))
+            lines.append(_format_sample(f"{self.name}_count", base, cumulative))
+        return lines
+
+
+class GaugeCollector:
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Iterable[tuple[dict[str, str], float]]]):
+        self.name = name
+        self.help_text = help_text
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        lines.extend(_format_sample(self.name, labels, value) for labels, value in self.collect())
+        return lines
+
+
+_registry: list[Counter | Histogram | GaugeCollector] = []
+
+
+def register[M: (Counter, Histogram, GaugeCollector)](metric: M) -> M:
+    _registry.append(metric)
+    return metric
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    return str(getattr(route, "path", "unmatched"))
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+http_request_duration = register(Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")))
+db_query_duration = register(Histogram("db_query_duration_seconds", "Database query latency by query fingerprint.", ("db", "query")))
+upstream_request_duration = register(Histogram("upstream_request_duration_seconds", "Latency of calls to upstream services.", ("service", "outcome")))
+tts_cache_lookups = register(Counter("tts_cache_lookups_total", "TTS audio cache lookups by result.", ("result",)))
+rate_limit_rejections = register(Counter("rate_limit_rejections_total", "Requests rejected by the rate limiter.", ("path",)))
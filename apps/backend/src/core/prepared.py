@@ -0,0 +1,42 @@
+from typing import NamedTuple
+
+import psycopg2.extensions
+
+
+class PreparedStatement(NamedTuple):
+    name: str
+    param_types: tuple[str, ...]
+    sql: str
+    # Plain SQL sent ahead of EXECUTE in the same round trip, for statements that cannot live inside the prepared one
+    prelude: str = ""
+
+    @property
+    def prepare_sql(self) -> str:
+        types = f" ({', '.join(self.param_types)})" if self.param_types else ""
+        return f"PREPARE {self.name}{types} AS {self.sql}"
+
+    @property
+    def execute_sql(self) -> str:
+        # Casts keep psycopg2's literals (ARRAY['...'] is text[]) from failing EXECUTE's assignment coercion
+        arguments = f" ({', '.join(f'%s::{param_type}' for param_type in self.param_types)})" if self.param_types else ""
+        return f"{self.prelude}EXECUTE {self.name}{arguments}"
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+_statements: dict[str, PreparedStatement] = {}
+
+
+def prepared_statement(name: str, param_types: tuple[str, ...], sql: str, prelude: str = "") -> PreparedStatement:
+    if name in _statements:
+        raise ValueError(f"Prepared statement '{name}' is already registered")
+    statement = _statements[name] = PreparedStatement(name, param_types, sql, prelude)
+    return statement
+
+
+def registered_statements() -> list[PreparedStatement]:
+    return list(_statements.values())
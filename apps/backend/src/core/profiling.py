@@ -0,0 +1,145 @@
+from collections import Counter, deque
+from contextvars import ContextVar
+import random
+import sys
+import threading
+import time
+import traceback
+
+from anyio import to_thread
+from core.config import PROFILING_HEADER, PROFILING_HISTORY_SIZE, PROFILING_SAMPLE_RATE, PROFILING_STACK_INTERVAL_MS
+from core.metrics import Histogram, register, route_label
+from fastapi import HTTPException, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+request_profile_duration = register(Histogram("request_profile_seconds", "Time per component for profiled requests.", ("route", "component")))
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self.db_ms: dict[str, float] = {}
+        self.db_queries = 0
+        self.serialization_ms = 0.0
+        self.upstream_ms = 0.0
+
+    def components(self, total_ms: float) -> dict[str, float]:
+        components = {f"db_{name}": duration for name, duration in self.db_ms.items()}
+        components["serialization"] = self.serialization_ms
+        components["upstream"] = self.upstream_ms
+        components["total"] = total_ms
+        return {name: round(duration, 3) for name, duration in components.items()}
+
+
+_active_profile: ContextVar[RequestProfile | None] = ContextVar("active_profile", default=None)
+_recent_profiles: deque[dict] = deque(maxlen=PROFILING_HISTORY_SIZE)
+
+
+def record_db(db_name: str, duration_ms: float) -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.db_ms[db_name] = profile.db_ms.get(db_name, 0.0) + duration_ms
+        profile.db_queries += 1
+
+
+def record_serialization(duration_ms: float) -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.serialization_ms += duration_ms
+
+
+def record_upstream(duration_ms: float) -> None:
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.upstream_ms += duration_ms
+
+
+def recent_profiles() -> list[dict]:
+    return list(_recent_profiles)
+
+
+class StackSampler:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-stack-sampler", daemon=True)
+
+    async def __aenter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    # The sampler may be mid-walk over every thread's stack; wait for it off the event loop
+    async def __aexit__(self, *_exc: object) -> None:
+        self._stop.set()
+        await to_thread.run_sync(self._thread.join)
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = traceback.extract_stack(frame)
+                self.samples[";".join(f"{entry.name} ({entry.filename}:{entry.lineno})" for entry in stack)] += 1
+
+    def collapsed(self, limit: int = 50) -> list[str]:
+        return [f"{stack} {count}" for stack, count in self.samples.most_common(limit)]
+
+
+# Same database-checked grant as the admin routes, so a revoked admin's still-valid token cannot profile;
+# blocking, so the middleware runs it in a worker thread
+def _is_admin_request(request: Request) -> bool:
+    from core.security import get_current_user, require_admin
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        require_admin(get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token)))
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        requested = request.headers.get(PROFILING_HEADER)
+        if requested and not await to_thread.run_sync(_is_admin_request, request):
+            requested = None
+        if not requested and random.random() >= PROFILING_SAMPLE_RATE:  # nosec B311
+            response: Response = await call_next(request)
+            return response
+
+        profile = RequestProfile()
+        token = _active_profile.set(profile)
+        sampler = StackSampler(PROFILING_STACK_INTERVAL_MS / 1000) if requested == "stack" else None
+        start = time.perf_counter()
+        try:
+            if sampler is not None:
+                async with sampler:
+                    response = await call_next(request)
+            else:
+                response = await call_next(request)
+        finally:
+            _active_profile.reset(token)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        route = route_label(request.scope)
+        components = profile.components(total_ms)
+        for component, duration_ms in components.items():
+            request_profile_duration.observe(duration_ms / 1000, route, component)
+
+        _recent_profiles.append(
+            {
+                "method": request.method,
+                "route": route,
+                "status_code": response.status_code,
+                "timestamp": time.time(),
+                "db_queries": profile.db_queries,
+                "components_ms": components,
+                "stacks": sampler.collapsed() if sampler is not None else [],
+            }
+        )
+        response.headers["Server-Timing"] = ", ".join(f"{name};dur={duration}" for name, duration in components.items())
+        return response
@@ -0,0 +1,188 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from core.database import execute_write_transaction, get_active_version, query_db_tuples, query_words_db_tuples
+from core.prepared import prepared_statement
+
+
+class ProgressRow(NamedTuple):
+    vocabulary_item_id: str
+    level: int
+    queue_position: int
+    correct_count: int
+    incorrect_count: int
+    consecutive_correct: int
+    recent_history: list[bool]
+    pronunciation_passed: bool | None
+
+
+# Serializes a user's progress writes so summary deltas are taken against the committed rows; it has to run
+# as its own statement ahead of the upsert so the upsert's snapshot is taken after the lock is held
+LOCK_USER_SQL = "SELECT pg_advisory_xact_lock(hashtext('user_progress'), %s); "
+
+LEVEL_COUNT_COLUMNS = [f"level_{level}_count" for level in range(6)]
+
+# incoming -> previous (committed rows) -> upserted. Each row remembers the list it is counted under
+# (summary_list_name): its previous counts come out of that list and its new counts go into the word's
+# current one, so a word that moved lists or left the active version and came back cannot drift the summary.
+# Rows whose word is not in the active version carry no list name and are counted nowhere.
+# Columns arrive as parallel arrays so one prepared plan serves any batch size; recent_history travels
+# as array literals because unnest would flatten a two-dimensional boolean array.
+# Every write bumps users.progress_version and returns it; with $11 set, nothing is written (and no row
+# comes back) unless the version still matches, which is how cached quiz sessions detect other writers.
+# A quiz answer passes its question as $12: the write also requires it to be the one issued and consumes it.
+UPSERT_PROGRESS = prepared_statement(
+    "progress_upsert",
+    ("integer", "uuid[]", "text[]", "smallint[]", "integer[]", "integer[]", "integer[]", "smallint[]", "text[]", "boolean[]", "bigint", "uuid"),
+    f"""
+    WITH bumped AS (
+        UPDATE users SET progress_version = progress_version + 1, quiz_question_id = CASE WHEN $12::uuid IS NULL THEN quiz_question_id END
+        WHERE id = $1 AND ($11::bigint IS NULL OR progress_version = $11) AND ($12::uuid IS NULL OR quiz_question_id = $12)
+        RETURNING progress_version
+    ),
+    incoming AS (
+        SELECT $1 AS user_id, i.vocabulary_item_id, i.list_name, i.level, i.queue_position, i.correct_count, i.incorrect_count,
+               i.consecutive_correct, i.recent_history::boolean[] AS recent_history, i.pronunciation_passed
+        FROM unnest($2, $3, $4, $5, $6, $7, $8, $9, $10)
+            AS i(vocabulary_item_id, list_name, level, queue_position, correct_count, incorrect_count,
+                 consecutive_correct, recent_history, pronunciation_passed)
+    ),
+    previous AS (
+        SELECT p.vocabulary_item_id, p.summary_list_name, p.level, p.correct_count, p.incorrect_count
+        FROM user_progress p
+        JOIN incoming i ON i.user_id = p.user_id AND i.vocabulary_item_id = p.vocabulary_item_id
+    ),
+    upserted AS (
+        INSERT INTO user_progress
+        (user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct, recent_history, pronunciation_passed, last_practiced_at,
+         summary_list_name)
+        SELECT user_id, vocabulary_item_id, level, queue_position, correct_count, incorrect_count, consecutive_correct,
+               recent_history, COALESCE(pronunciation_passed, FALSE), NOW(), list_name
+        FROM incoming
+        WHERE EXISTS (SELECT 1 FROM bumped)
+        ON CONFLICT (user_id, vocabulary_item_id)
+        DO UPDATE SET
+            level = EXCLUDED.level,
+            queue_position = EXCLUDED.queue_position,
+            correct_count = EXCLUDED.correct_count,
+            incorrect_count = EXCLUDED.incorrect_count,
+            consecutive_correct = EXCLUDED.consecutive_correct,
+            recent_history = EXCLUDED.recent_history,
+            pronunciation_passed = COALESCE(EXCLUDED.pronunciation_passed, user_progress.pronunciation_passed),
+            last_practiced_at = EXCLUDED.last_practiced_at,
+            summary_list_name = EXCLUDED.summary_list_name
+        RETURNING user_id, vocabulary_item_id, summary_list_name, level, correct_count, incorrect_count, last_practiced_at
+    ),
+    deltas AS (
+        SELECT user_id, summary_list_name AS list_name, level, 1 AS counted, correct_count, incorrect_count, last_practiced_at
+        FROM upserted
+        UNION ALL
+        SELECT u.user_id, pr.summary_list_name, pr.level, -1, -pr.correct_count, -pr.incorrect_count, NULL
+        FROM previous pr
+        JOIN upserted u USING (vocabulary_item_id)
+    ),
+    summarized AS (
+        INSERT INTO user_progress_summary (user_id, list_name, {", ".join(LEVEL_COUNT_COLUMNS)}, correct_count, incorrect_count, last_practiced_at)
+        SELECT d.user_id, d.list_name,
+               {", ".join(f"COALESCE(SUM(d.counted) FILTER (WHERE d.level = {level}), 0)" for level in range(6))},
+               SUM(d.correct_count),
+               SUM(d.incorrect_count),
+               MAX(d.last_practiced_at)
+        FROM deltas d
+        JOIN users ON users.id = d.user_id AND users.progress_summary_ready
+        WHERE d.list_name IS NOT NULL
+        GROUP BY d.user_id, d.list_name
+        ON CONFLICT (user_id, list_name)
+        DO UPDATE SET
+            {", ".join(f"{column} = user_progress_summary.{column} + EXCLUDED.{column}" for column in LEVEL_COUNT_COLUMNS)},
+            correct_count = user_progress_summary.correct_count + EXCLUDED.correct_count,
+            incorrect_count = user_progress_summary.incorrect_count + EXCLUDED.incorrect_count,
+            last_practiced_at = GREATEST(user_progress_summary.last_practiced_at, EXCLUDED.last_practiced_at)
+    )
+    SELECT progress_version FROM bumped
+    """,  # nosec B608
+    prelude=LOCK_USER_SQL,
+)
+
+LIST_NAMES_SQL = """
+    SELECT id, list_name FROM vocabulary_items
+    WHERE version_id = %s AND id = ANY(%s::uuid[])
+"""
+
+PROGRESS_IDS_SQL = "SELECT vocabulary_item_id FROM user_progress WHERE user_id = %s"
+
+# Re-attributes every row to its list in the given version and recounts from scratch under the writer lock;
+# the user is marked ready only if no progress row appeared after the ids were resolved, otherwise the next
+# stats request retries
+REBUILD_SUMMARY_SQL = f"""
+    SELECT pg_advisory_xact_lock(hashtext('user_progress'), %(user_id)s);
+    UPDATE user_progress p SET summary_list_name = l.list_name
+    FROM user_progress q
+    LEFT JOIN unnest(%(ids)s::uuid[], %(list_names)s::text[]) AS l(vocabulary_item_id, list_name) USING (vocabulary_item_id)
+    WHERE q.user_id = %(user_id)s AND p.user_id = q.user_id AND p.vocabulary_item_id = q.vocabulary_item_id
+      AND p.summary_list_name IS DISTINCT FROM l.list_name;
+    DELETE FROM user_progress_summary WHERE user_id = %(user_id)s;
+    INSERT INTO user_progress_summary (user_id, list_name, {", ".join(LEVEL_COUNT_COLUMNS)}, correct_count, incorrect_count, last_practiced_at)
+    SELECT user_id, summary_list_name,
+           {", ".join(f"COUNT(*) FILTER (WHERE level = {level})" for level in range(6))},
+           SUM(correct_count), SUM(incorrect_count), MAX(last_practiced_at)
+    FROM user_progress
+    WHERE user_id = %(user_id)s AND summary_list_name IS NOT NULL
+    GROUP BY user_id, summary_list_name;
+    UPDATE users SET progress_summary_version = %(version_id)s, progress_summary_ready = NOT EXISTS (
+        SELECT 1 FROM user_progress WHERE user_id = %(user_id)s AND vocabulary_item_id <> ALL(%(seen_ids)s::uuid[])
+    )
+    WHERE id = %(user_id)s;
+"""  # nosec B608
+
+
+def lookup_list_names(vocabulary_item_ids: Sequence[str], version_id: int | None = None) -> dict[str, str]:
+    if not vocabulary_item_ids:
+        return {}
+    _, rows = query_words_db_tuples(LIST_NAMES_SQL, (version_id or get_active_version(), list(vocabulary_item_ids)))
+    return {str(word_id): list_name for word_id, list_name in rows}
+
+
+# Returns the user's new progress version, or None when expected_version is stale (or answered_question is no
+# longer the issued one) and nothing was written
+def write_progress(
+    user_id: int,
+    rows: Sequence[ProgressRow],
+    list_name: str | None = None,
+    expected_version: int | None = None,
+    answered_question: str | None = None,
+) -> int | None:
+    if not rows:
+        return expected_version
+    list_names = lookup_list_names([row.vocabulary_item_id for row in rows]) if list_name is None else {}
+    written = execute_write_transaction(
+        UPSERT_PROGRESS,
+        (
+            user_id,
+            user_id,
+            [row.vocabulary_item_id for row in rows],
+            [list_name or list_names.get(str(row.vocabulary_item_id)) for row in rows],
+            [row.level for row in rows],
+            [row.queue_position for row in rows],
+            [row.correct_count for row in rows],
+            [row.incorrect_count for row in rows],
+            [row.consecutive_correct for row in rows],
+            ["{" + ",".join("t" if answer else "f" for answer in row.recent_history) + "}" for row in rows],
+            [row.pronunciation_passed for row in rows],
+            expected_version,
+            answered_question,
+        ),
+        fetch_results=True,
+        one=True,
+    )
+    return written["progress_version"] if written else None
+
+
+def rebuild_summary(user_id: int, version_id: int) -> None:
+    _, rows = query_db_tuples(PROGRESS_IDS_SQL, (user_id,))
+    seen_ids = [str(row[0]) for row in rows]
+    list_names = lookup_list_names(seen_ids, version_id)
+    execute_write_transaction(
+        REBUILD_SUMMARY_SQL,
+        {"user_id": user_id, "ids": list(list_names), "list_names": list(list_names.values()), "seen_ids": seen_ids, "version_id": version_id},
+    )
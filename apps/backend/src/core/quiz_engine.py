@@ -0,0 +1,385 @@
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import datetime
+import random
+import threading
+import time
+from typing import NamedTuple
+
+from core.answer_comparison import check_answer
+from core.config import QUIZ_SESSION_IDLE_SECONDS, QUIZ_SESSION_MAX_COUNT, QUIZ_VOCABULARY_CACHE_SIZE, QUIZ_VOCABULARY_TTL_SECONDS
+from core.database import execute_write_transaction, query_db_tuples, query_words_db_tuples
+from core.logging import get_logger
+from core.metrics import GaugeCollector, register
+from core.prepared import prepared_statement
+from core.progress_writer import ProgressRow, write_progress
+
+logger = get_logger(__name__)
+
+# Scheduling mirrors packages/core (constants.ts, QueueManager.ts, LevelEngine.ts and QuizManager in index.ts)
+F = 5
+K = 2
+T_PROMO = 3
+MISTAKE_THRESHOLD = 3
+MISTAKE_WINDOW = 10
+MAX_FOCUS_POOL_SIZE = K * F * T_PROMO
+MIN_HISTORY_FOR_DEGRADATION = 3
+MAX_QUEUE_POSITION = 10000
+BETWEEN_SESSION_DECAY_BASE = 0.9
+LEVEL_STABILITY_DAYS = {1: 3, 2: 6, 3: 9, 4: 12}
+MAX_LEVEL = 5
+LEVEL_QUEUE_MAP = {1: (1, 0), 2: (2,), 3: (3, 4, 5), 4: (3, 4, 5)}
+# Questions come from the head of the queue only, so queue positions set the spacing (QueueManager.pickFromQueue)
+PICK_WINDOW = 3
+
+VOCABULARY_SQL = """
+    SELECT id, source_text, source_language, target_text, target_language, source_usage_example, target_usage_example
+    FROM vocabulary_items
+    WHERE list_name = %s AND version_id = %s AND is_active = TRUE
+    ORDER BY rank, source_text
+"""
+
+# Changes with every insert, edit or deactivation in the list (the updated_at trigger covers in-place admin edits)
+VOCABULARY_STAMP_SQL = """
+    SELECT MAX(updated_at), COUNT(*)
+    FROM vocabulary_items
+    WHERE list_name = %s AND version_id = %s
+"""
+
+PROGRESS_SQL = """
+    SELECT vocabulary_item_id, level, queue_position, consecutive_correct, correct_count, incorrect_count,
+           COALESCE(recent_history, '{}'), pronunciation_passed, last_practiced_at
+    FROM user_progress
+    WHERE user_id = %s AND vocabulary_item_id = ANY(%s::uuid[])
+"""
+
+# Bumped by every progress write on any worker; a cached session is only reused while it still matches.
+# The question issued last comes along, since the answer may be served by a worker that did not issue it.
+PROGRESS_VERSION = prepared_statement(
+    "user_progress_version",
+    ("integer",),
+    "SELECT progress_version, quiz_question_id::text, quiz_question_level FROM users WHERE id = $1",
+)
+
+# Leaves progress_version alone so issuing a question never invalidates cached sessions
+ISSUE_QUESTION = prepared_statement(
+    "quiz_issue_question",
+    ("integer", "uuid", "smallint"),
+    "UPDATE users SET quiz_question_id = $2, quiz_question_level = $3 WHERE id = $1",
+)
+
+
+class QuizWord(NamedTuple):
+    source_text: str
+    source_language: str
+    target_text: str
+    target_language: str
+    source_usage_example: str | None
+    target_usage_example: str | None
+
+
+@dataclass(frozen=True)
+class QuizVocabulary:
+    ids: tuple[str, ...]
+    words: dict[str, QuizWord]
+    positions: dict[str, int]
+
+
+@dataclass(slots=True)
+class WordProgress:
+    level: int
+    queue_position: int
+    consecutive_correct: int = 0
+    correct_count: int = 0
+    incorrect_count: int = 0
+    recent_history: list[bool] = field(default_factory=list)
+    pronunciation_passed: bool = False
+
+
+@dataclass(slots=True)
+class CachedVocabulary:
+    vocabulary: QuizVocabulary
+    stamp: tuple
+    checked_at: float
+
+
+_vocabularies: OrderedDict[tuple[int, str], CachedVocabulary] = OrderedDict()
+_vocabularies_lock = threading.Lock()
+
+
+# The stamp is read before the words, so an edit landing in between only causes one extra reload later.
+# Empty lists are never cached: a lagging replica or a list that is still being created must not stick.
+def load_vocabulary(version_id: int, list_name: str) -> QuizVocabulary:
+    key = (version_id, list_name)
+    now = time.monotonic()
+    with _vocabularies_lock:
+        cached = _vocabularies.get(key)
+        if cached is not None and now - cached.checked_at < QUIZ_VOCABULARY_TTL_SECONDS:
+            _vocabularies.move_to_end(key)
+            return cached.vocabulary
+
+    _, stamp_rows = query_words_db_tuples(VOCABULARY_STAMP_SQL, (list_name, version_id))
+    stamp = tuple(stamp_rows[0])
+    if cached is not None and cached.stamp == stamp:
+        cached.checked_at = now
+        return cached.vocabulary
+
+    _, rows = query_words_db_tuples(VOCABULARY_SQL, (list_name, version_id))
+    words = {str(row[0]): QuizWord(*row[1:]) for row in rows}
+    ids = tuple(words)
+    vocabulary = QuizVocabulary(ids, words, {word_id: index for index, word_id in enumerate(ids)})
+    with _vocabularies_lock:
+        if ids:
+            _vocabularies[key] = CachedVocabulary(vocabulary, stamp, now)
+            _vocabularies.move_to_end(key)
+            while len(_vocabularies) > QUIZ_VOCABULARY_CACHE_SIZE:
+                _vocabularies.popitem(last=False)
+        else:
+            _vocabularies.pop(key, None)
+    return vocabulary
+
+
+def decayed_position(level: int, queue_position: int, last_practiced_at: datetime.datetime | None, now: datetime.datetime) -> int:
+    stability = LEVEL_STABILITY_DAYS.get(level)
+    if stability is None or last_practiced_at is None:
+        return queue_position
+    days_since = (now - last_practiced_at).total_seconds() / 86400
+    if days_since <= 1:
+        return queue_position
+    return max(0, int(queue_position * BETWEEN_SESSION_DECAY_BASE ** (days_since / stability)))
+
+
+class QuizSession:
+    def __init__(self, user_id: int, list_name: str, version_id: int, vocabulary: QuizVocabulary, progress_version: int, progress_rows: list[tuple]):
+        self.lock = threading.Lock()
+        self.user_id = user_id
+        self.list_name = list_name
+        self.version_id = version_id
+        self.progress_version = progress_version
+        self.vocabulary = vocabulary
+        self.current_level = 1
+        self.last_used = time.monotonic()
+        self.issued: tuple[str, int] | None = None
+        self.progress: dict[str, WordProgress] = {}
+        self.dirty: set[str] = set()
+
+        now = datetime.datetime.now(datetime.UTC)
+        for word_id, level, queue_position, consecutive, correct, incorrect, history, passed, last_practiced in progress_rows:
+            self.progress[str(word_id)] = WordProgress(
+                level, decayed_position(level, queue_position, last_practiced, now), consecutive, correct, incorrect, list(history), passed
+            )
+
+        groups: list[list[tuple[int, str]]] = [[] for _ in range(MAX_LEVEL + 1)]
+        for index, word_id in enumerate(vocabulary.ids):
+            progress = self.progress.get(word_id)
+            groups[0 if progress is None else progress.level].append((index if progress is None else progress.queue_position, word_id))
+        self.queues = [[word_id for _, word_id in sorted(group, key=lambda entry: entry[0])] for group in groups]
+
+        self.replenish_focus_pool()
+
+    def word_progress(self, word_id: str) -> WordProgress:
+        progress = self.progress.get(word_id)
+        if progress is None:
+            progress = self.progress[word_id] = WordProgress(0, self.vocabulary.positions[word_id])
+        return progress
+
+    def has_words_for_level(self, level: int) -> bool:
+        return any(self.queues[queue] for queue in LEVEL_QUEUE_MAP[level])
+
+    def lowest_available_level(self) -> int:
+        return next((level for level in LEVEL_QUEUE_MAP if self.has_words_for_level(level)), 1)
+
+    def set_level(self, level: int) -> None:
+        self.current_level = level if self.has_words_for_level(level) else self.lowest_available_level()
+
+    def insert_into_queue(self, level: int, word_id: str, position: int) -> int:
+        self.queues[level].insert(min(position, len(self.queues[level])), word_id)
+        return position
+
+    def move_word_to_level(self, word_id: str, old_level: int, new_level: int) -> int:
+        self.queues[old_level].remove(word_id)
+        self.queues[new_level].append(word_id)
+        return len(self.queues[new_level]) - 1
+
+    def replenish_focus_pool(self, exclude_id: str | None = None) -> None:
+        needed = MAX_FOCUS_POOL_SIZE - len(self.queues[1])
+        if needed <= 0:
+            return
+        promoted = [word_id for word_id in self.queues[0] if word_id != exclude_id][:needed]
+        for word_id in promoted:
+            progress = self.word_progress(word_id)
+            progress.queue_position = self.move_word_to_level(word_id, 0, 1)
+            progress.level = 1
+            self.dirty.add(word_id)
+
+    def next_question(self) -> dict | None:
+        if not self.has_words_for_level(self.current_level):
+            self.current_level = self.lowest_available_level()
+            if not self.has_words_for_level(self.current_level):
+                return None
+
+        level = self.current_level
+        queue = next(queue for queue in LEVEL_QUEUE_MAP[level] if self.queues[queue])
+        word_id = random.choice(self.queues[queue][:PICK_WINDOW])  # nosec B311
+        word = self.vocabulary.words[word_id]
+        progress = self.word_progress(word_id)
+
+        direction = "normal" if level in (1, 3) else "reverse"
+        question_type = "usage" if level in (3, 4) else "translation"
+        example = word.source_usage_example if direction == "normal" else word.target_usage_example
+        first_encounter = not progress.recent_history and progress.level == 1
+        self.issued = (word_id, level)
+        return {
+            "translation_id": word_id,
+            "question_text": word.source_text if direction == "normal" else word.target_text,
+            "level": level,
+            "direction": direction,
+            "source_language": word.source_language,
+            "target_language": word.target_language,
+            "question_type": question_type,
+            "usage_example": (example or None) if first_encounter or question_type == "usage" else None,
+        }
+
+    # None unless word_id is the question issued last; it is graded at the level it was asked at
+    def answer(self, word_id: str, user_answer: str | None) -> dict | None:
+        if self.issued is None or self.issued[0] != word_id:
+            return None
+        _, level = self.issued
+        self.issued = None
+        word = self.vocabulary.words[word_id]
+        progress = self.word_progress(word_id)
+        correct_answer = word.target_text if level in (1, 3) else word.source_text
+        is_correct = user_answer is not None and check_answer(user_answer, correct_answer)
+
+        old_level = progress.level
+        progress.recent_history = [*progress.recent_history[-(MISTAKE_WINDOW - 1) :], is_correct]
+        progress.consecutive_correct = progress.consecutive_correct + 1 if is_correct else 0
+        if is_correct:
+            progress.correct_count += 1
+        else:
+            progress.incorrect_count += 1
+
+        self.queues[old_level].remove(word_id)
+        position = K * F * progress.consecutive_correct if is_correct else F
+        progress.queue_position = self.insert_into_queue(old_level, word_id, min(position, MAX_QUEUE_POSITION))
+
+        new_level = None
+        if progress.consecutive_correct >= T_PROMO:
+            new_level = old_level + 1 if old_level < MAX_LEVEL else None
+        elif progress.recent_history.count(False) >= MISTAKE_THRESHOLD and len(progress.recent_history) >= MIN_HISTORY_FOR_DEGRADATION:
+            new_level = old_level - 1 if old_level > 0 else None
+        if new_level is not None:
+            progress.queue_position = self.move_word_to_level(word_id, old_level, new_level)
+            progress.level = new_level
+            progress.consecutive_correct = 0
+            if new_level < old_level:
+                progress.recent_history = []
+
+        self.dirty.add(word_id)
+        self.replenish_focus_pool(word_id if progress.level == 0 else None)
+        return {
+            "is_correct": is_correct,
+            "correct_answer_text": correct_answer,
+            "submitted_answer_text": user_answer,
+            "level_change": {"from_level": old_level, "to_level": progress.level} if progress.level != old_level else None,
+        }
+
+    def dirty_rows(self) -> list[ProgressRow]:
+        rows = []
+        for word_id in sorted(self.dirty):
+            p = self.progress[word_id]
+            rows.append(
+                ProgressRow(
+                    word_id,
+                    p.level,
+                    p.queue_position,
+                    p.correct_count,
+                    p.incorrect_count,
+                    p.consecutive_correct,
+                    p.recent_history,
+                    p.pronunciation_passed,
+                )
+            )
+        return rows
+
+
+_sessions: OrderedDict[int, QuizSession] = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _session_count() -> Iterator[tuple[dict[str, str], float]]:
+    yield {}, len(_sessions)
+
+
+register(GaugeCollector("quiz_sessions", "Server-side quiz sessions held in memory.", _session_count))
+
+
+def current_progress_version(user_id: int) -> tuple[int, tuple[str, int] | None]:
+    _, rows = query_db_tuples(PROGRESS_VERSION, (user_id,))
+    if not rows:
+        return 0, None
+    progress_version, question_id, question_level = rows[0]
+    return int(progress_version), (question_id, question_level) if question_id is not None else None
+
+
+def issue_question(user_id: int, word_id: str, level: int) -> None:
+    execute_write_transaction(ISSUE_QUESTION, (user_id, word_id, level))
+
+
+# The version is read before the rows, so a write landing in between makes the session's first flush fail rather than lose it
+def build_session(user_id: int, list_name: str, version_id: int, vocabulary: QuizVocabulary, progress_version: int) -> QuizSession:
+    _, progress_rows = query_db_tuples(PROGRESS_SQL, (user_id, list(vocabulary.ids))) if vocabulary.ids else ([], [])
+    return QuizSession(user_id, list_name, version_id, vocabulary, progress_version, progress_rows)
+
+
+# A session is reused only while both its progress version and its word list are still current
+def get_session(user_id: int, list_name: str, version_id: int) -> QuizSession:
+    vocabulary = load_vocabulary(version_id, list_name)
+    progress_version, issued = current_progress_version(user_id)
+    now = time.monotonic()
+    with _sessions_lock:
+        session = _sessions.get(user_id)
+        if (
+            session is not None
+            and (session.list_name, session.version_id, session.progress_version) == (list_name, version_id, progress_version)
+            and session.vocabulary is vocabulary
+            and now - session.last_used < QUIZ_SESSION_IDLE_SECONDS
+        ):
+            _sessions.move_to_end(user_id)
+            session.last_used = now
+            session.issued = issued
+            return session
+
+    session = build_session(user_id, list_name, version_id, vocabulary, progress_version)
+    session.issued = issued
+    with _sessions_lock:
+        _sessions[user_id] = session
+        _sessions.move_to_end(user_id)
+        while len(_sessions) > QUIZ_SESSION_MAX_COUNT:
+            _sessions.popitem(last=False)
+    logger.debug("Built quiz session", extra={"user_id": user_id, "list_name": list_name, "words": len(session.vocabulary.ids)})
+    return session
+
+
+def drop_session(user_id: int) -> None:
+    with _sessions_lock:
+        _sessions.pop(user_id, None)
+
+
+# False when another worker wrote this user's progress (or consumed answered_question) since the session was
+# built; the session is dropped and the caller replays its answer against a fresh one
+def flush_session(session: QuizSession, answered_question: str | None = None) -> bool:
+    if not session.dirty:
+        return True
+    try:
+        written = write_progress(session.user_id, session.dirty_rows(), session.list_name, session.progress_version, answered_question)
+    except Exception:
+        drop_session(session.user_id)
+        raise
+    if written is None:
+        drop_session(session.user_id)
+        return False
+    session.progress_version = written
+    session.dirty.clear()
+    return True
@@ -1,5 +1,168 @@
-from core.config import RATE_LIMIT_ENABLED
+from collections.abc import Callable
+import fcntl
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import secrets
+import struct
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from core.config import RATE_LIMIT_ENABLED, RATE_LIMIT_SHM_SLOTS, RATE_LIMIT_STORAGE_URI
+from core.logging import get_logger
+from core.metrics import Counter, register
+from limits.storage import Storage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address, enabled=RATE_LIMIT_ENABLED)
+SLOT = struct.Struct("<Qdq")
+HEADER = struct.Struct("<8s16s8x")
+MAGIC = b"lqrl\x00\x00\x00\x02"
+logger = get_logger(__name__)
+
+PROBE_LIMIT = 8
+TABLE_FULL_WARNING_INTERVAL_SECONDS = 60.0
+DEFAULT_SHM_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())  # nosec B108
+
+
+# Fixed-window counters in an mmap-backed open-addressing table shared by every worker on the node.
+# Memory is fixed at slots * SLOT.size bytes plus a header holding the magic and a random per-file hash key,
+# so clients cannot pick keys that collide. Live counters are never evicted; a key whose probe window is full
+# of other live windows is not counted and fails open. Failing closed would let anyone with enough addresses fill
+# the table and reject every new client, while evicting would hand the same attacker a way to reset anyone's
+# counter. Size RATE_LIMIT_SHM_SLOTS so this never happens in normal traffic; rate_limit_table_full_total shows
+# when it does.
+class SharedMemoryStorage(Storage):
+    STORAGE_SCHEME = ["shm"]  # noqa: RUF012 - declared as an instance attribute on limits.storage.Storage
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, slots: int = RATE_LIMIT_SHM_SLOTS, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = urlparse(uri or "shm://").path
+        self.path = Path(path) if path else DEFAULT_SHM_DIR / "lingua-quiz-rate-limits"
+        self.slots = slots
+        size = HEADER.size + slots * SLOT.size
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+        self._last_full_warning = 0.0
+        with self._locked():
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+            self._table = mmap.mmap(self._fd, size)
+            magic, self._secret = HEADER.unpack_from(self._table, 0)
+            if magic != MAGIC:
+                self._secret = secrets.token_bytes(16)
+                self._table[:] = bytes(size)
+                HEADER.pack_into(self._table, 0, MAGIC, self._secret)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return OSError
+
+    def _locked(self):
+        return _FileLock(self._fd, self._thread_lock)
+
+    def _key_hash(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8, key=self._secret).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER.size + (index % self.slots) * SLOT.size
+
+    # Returns the key's own slot, else the first empty or expired one, else None
+    def _find_slot(self, key_hash: int, now: float) -> tuple[int | None, bool]:
+        start = key_hash % self.slots
+        candidate = None
+        for probe in range(PROBE_LIMIT):
+            offset = self._slot_offset(start + probe)
+            slot_hash, expiry, _ = SLOT.unpack_from(self._table, offset)
+            if slot_hash == key_hash:
+                return offset, expiry > now
+            if candidate is None and (slot_hash == 0 or expiry <= now):
+                candidate = offset
+        return candidate, False
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        key_hash = self._key_hash(key)
+        with self._locked():
+            now = time.time()
+            offset, live = self._find_slot(key_hash, now)
+            if offset is None:
+                self._table_full(now)
+                return amount
+            if live:
+                _, window_end, count = SLOT.unpack_from(self._table, offset)
+                count += amount
+            else:
+                window_end, count = now + expiry, amount
+            SLOT.pack_into(self._table, offset, key_hash, window_end, count)
+            return int(count)
+
+    def _table_full(self, now: float) -> None:
+        rate_limit_table_full.inc()
+        if now - self._last_full_warning >= TABLE_FULL_WARNING_INTERVAL_SECONDS:
+            self._last_full_warning = now
+            logger.warning("Rate limit table full, requests are not being limited", extra={"path": str(self.path), "slots": self.slots})
+
+    def get(self, key: str) -> int:
+        with self._locked():
+            offset, live = self._find_slot(self._key_hash(key), time.time())
+            return int(SLOT.unpack_from(self._table, offset)[2]) if offset is not None and live else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._locked():
+            now = time.time()
+            offset, live = self._find_slot(self._key_hash(key), now)
+            return float(SLOT.unpack_from(self._table, offset)[1]) if offset is not None and live else now
+
+    def check(self) -> bool:
+        return not self._table.closed
+
+    def reset(self) -> int | None:
+        with self._locked():
+            now = time.time()
+            cleared = sum(1 for i in range(self.slots) if SLOT.unpack_from(self._table, self._slot_offset(i))[1] > now)
+            self._table[HEADER.size :] = bytes(len(self._table) - HEADER.size)
+            return cleared
+
+    def clear(self, key: str) -> None:
+        key_hash = self._key_hash(key)
+        with self._locked():
+            offset, _ = self._find_slot(key_hash, time.time())
+            if offset is not None and SLOT.unpack_from(self._table, offset)[0] == key_hash:
+                SLOT.pack_into(self._table, offset, 0, 0.0, 0)
+
+
+rate_limit_table_full = register(
+    Counter("rate_limit_table_full_total", "Rate-limited requests let through uncounted because the shared table was full.")
+)
+
+
+class _FileLock:
+    def __init__(self, fd: int, thread_lock: threading.Lock):
+        self.fd = fd
+        self.thread_lock = thread_lock
+
+    def __enter__(self) -> None:
+        self.thread_lock.acquire()
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *_) -> None:
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.thread_lock.release()
+
+
+def create_limiter(key_func: Callable) -> Limiter:
+    return Limiter(
+        key_func=key_func,
+        enabled=RATE_LIMIT_ENABLED,
+        storage_uri=RATE_LIMIT_STORAGE_URI,
+        in_memory_fallback_enabled=True,
+    )
+
+
+limiter = create_limiter(get_remote_address)
@@ -1,6 +1,8 @@
 from collections.abc import Callable
 import logging
+import random
 
+from core.config import REQUEST_LOG_SAMPLE_RATE
 from core.logging import (
     RequestTimer,
     clear_request_context,
@@ -8,12 +10,13 @@ from core.logging import (
     request_id_var,
     user_id_var,
 )
+from core.metrics import http_request_duration, route_label
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger("lingua_quiz.request")
 
-SKIP_PATHS = {"/api/health", "/api/version", "/docs", "/redoc", "/openapi.json"}
+SKIP_PATHS = {"/api/health", "/api/health/live", "/api/health/ready", "/metrics", "/api/version", "/docs", "/redoc", "/openapi.json"}
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
@@ -28,15 +31,17 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             response: Response = await call_next(request)
         except Exception as e:
             duration_ms = timer.elapsed_ms()
+            http_request_duration.observe(duration_ms / 1000, request.method, route_label(request.scope), "500")
             self._log_request(request, 500, duration_ms, request_id, error=str(e))
             clear_request_context()
             raise
 
         duration_ms = timer.elapsed_ms()
+        http_request_duration.observe(duration_ms / 1000, request.method, route_label(request.scope), str(response.status_code))
 
         response.headers["X-Request-ID"] = request_id
 
-        if request.url.path not in SKIP_PATHS:
+        if request.url.path not in SKIP_PATHS and (response.status_code >= 400 or random.random() < REQUEST_LOG_SAMPLE_RATE):  # nosec B311
             self._log_request(request, response.status_code, duration_ms, request_id)
 
         clear_request_context()
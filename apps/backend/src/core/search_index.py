@@ -0,0 +1,139 @@
+import bisect
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from itertools import chain, count
+import re
+import threading
+import time
+
+from core.background import PeriodicTask
+from core.config import VOCABULARY_SEARCH_INDEX_REFRESH_SECONDS, VOCABULARY_SEARCH_SIMILARITY_THRESHOLD
+from core.database import query_words_db
+from core.logging import get_logger
+from core.metrics import GaugeCollector, register
+
+logger = get_logger(__name__)
+
+# pg_trgm semantics: lowercase, split on non-alphanumerics, pad each word with two leading and one trailing space
+WORD_SEPARATOR = re.compile(r"[\W_]+")
+
+SIGNATURE_SQL = """
+    SELECT get_active_version_id() AS version_id, COUNT(*) AS item_count, MAX(updated_at) AS last_updated
+    FROM vocabulary_items
+    WHERE version_id = get_active_version_id()
+"""
+
+SNAPSHOT_SQL = """
+    SELECT id::text AS id, source_text, source_language, target_text, target_language,
+           list_name, difficulty_level, source_usage_example, target_usage_example,
+           is_active,
+           TO_CHAR(created_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as created_at,
+           TO_CHAR(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS"Z"') as updated_at
+    FROM vocabulary_items
+    WHERE version_id = %s
+    ORDER BY list_name, source_text, id
+"""
+
+
+def trigrams(text: str) -> set[str]:
+    result: set[str] = set()
+    for word in WORD_SEPARATOR.split(text.lower()):
+        if word:
+            padded = f"  {word} "
+            result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex:
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._sizes: list[int] = []
+        prefixes: list[tuple[str, int]] = []
+        for position, item in enumerate(items):
+            for field_offset, text in enumerate((item["source_text"], item["target_text"])):
+                field_id = position * 2 + field_offset
+                grams = trigrams(text)
+                self._sizes.append(len(grams))
+                for gram in grams:
+                    self._postings[gram].append(field_id)
+            prefixes.extend(((item["source_text"].lower(), position), (item["target_text"].lower(), position)))
+        prefixes.sort()
+        self._prefix_keys = [key for key, _ in prefixes]
+        self._prefix_positions = [position for _, position in prefixes]
+
+    def search(self, query: str, limit: int, threshold: float = VOCABULARY_SEARCH_SIMILARITY_THRESHOLD) -> list[dict]:
+        query_grams = trigrams(query)
+        prefix = query.lower()
+        shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in query_grams))
+
+        scores: dict[int, float] = {}
+        for field_id, overlap in shared.items():
+            similarity = overlap / (len(query_grams) + self._sizes[field_id] - overlap)
+            position = field_id // 2
+            if similarity >= threshold and similarity > scores.get(position, 0.0):
+                scores[position] = similarity
+
+        start = bisect.bisect_left(self._prefix_keys, prefix)
+        for offset in range(start, min(start + limit * 4, len(self._prefix_keys))):
+            if not self._prefix_keys[offset].startswith(prefix):
+                break
+            position = self._prefix_positions[offset]
+            scores[position] = max(scores.get(position, 0.0), 2.0 if self._prefix_keys[offset] == prefix else 1.0)
+
+        ranked = sorted(scores, key=lambda position: (not self.items[position]["is_active"], -scores[position], self.items[position]["source_text"]))
+        return [self.items[position] for position in ranked[:limit]]
+
+
+_index: TrigramIndex | None = None
+_signature: tuple | None = None
+# Each stale mark takes the next generation; a build only clears the marks made before it read the signature
+_marks = count(1)
+_stale_generation = 0
+_built_generation = -1
+_build_lock = threading.Lock()
+
+
+# Reads go to the primary: a lagging replica would return the pre-edit signature after a stale mark,
+# or let a periodic refresh rebuild from rows older than the index already has
+def refresh_search_index(force: bool = False) -> TrigramIndex:
+    global _index, _signature, _built_generation
+
+    with _build_lock:
+        generation = _stale_generation
+        signature_row = query_words_db(SIGNATURE_SQL, one=True, primary=True)
+        signature = (signature_row["version_id"], signature_row["item_count"], signature_row["last_updated"])
+        if not force and _index is not None and signature == _signature:
+            _built_generation = generation
+            return _index
+
+        start = time.perf_counter()
+        items = query_words_db(SNAPSHOT_SQL, (signature_row["version_id"],), primary=True)
+        index = TrigramIndex([dict(item) for item in items])
+        _index, _signature, _built_generation = index, signature, generation
+        logger.info(
+            "Vocabulary search index built",
+            extra={"version_id": signature[0], "items": len(items), "duration_ms": round((time.perf_counter() - start) * 1000, 2)},
+        )
+        return index
+
+
+def mark_search_index_stale() -> None:
+    global _stale_generation
+    _stale_generation = next(_marks)
+
+
+def get_search_index() -> TrigramIndex:
+    index = _index
+    if index is None or _built_generation != _stale_generation:
+        index = refresh_search_index()
+    return index
+
+
+def _index_size() -> Iterator[tuple[dict[str, str], float]]:
+    yield {}, len(_index.items) if _index is not None else 0
+
+
+register(GaugeCollector("vocabulary_search_index_items", "Vocabulary items held in the in-memory typeahead index.", _index_size))
+
+search_index_refresher = PeriodicTask("vocabulary-search-index", VOCABULARY_SEARCH_INDEX_REFRESH_SECONDS, refresh_search_index)
@@ -1,11 +1,26 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import hashlib
 import secrets
+import threading
+import time
 import uuid
 
 import bcrypt
-from core.config import JWT_ACCESS_TOKEN_EXPIRES_MINUTES, JWT_REFRESH_TOKEN_EXPIRES_DAYS, JWT_SECRET
+from core.config import (
+    ADMIN_AUTH_CACHE_TTL_SECONDS,
+    JWT_ACCESS_TOKEN_EXPIRES_MINUTES,
+    JWT_REFRESH_TOKEN_EXPIRES_DAYS,
+    JWT_SECRET,
+    JWT_VERIFIED_CACHE_SIZE,
+    PASSWORD_HASH_QUEUE_LIMIT,
+    PASSWORD_HASH_WORKERS,
+)
 from core.logging import get_logger
+from core.prepared import prepared_statement
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
@@ -13,15 +28,150 @@ import jwt
 logger = get_logger("security.auth")
 security = HTTPBearer()
 
+REFRESH_TOKEN_BY_HASH = prepared_statement(
+    "refresh_token_by_hash",
+    ("text",),
+    "SELECT user_id, expires_at, revoked_at, token_hash FROM refresh_tokens WHERE token_hash = $1",
+)
+USER_IS_ADMIN = prepared_statement("user_is_admin", ("integer",), "SELECT is_admin FROM users WHERE id = $1")
 
-def hash_password(password: str) -> str:
-    hashed: bytes = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, claims: dict, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+verified_tokens = VerifiedTokenCache(JWT_VERIFIED_CACHE_SIZE)
+
+# user_id -> monotonic deadline; only grants are cached so promotions apply immediately
+_admin_grants: dict[int, float] = {}
+
+
+# Same cost factor as bcrypt.gensalt(); verifying unknown users against it keeps login timing uniform
+TIMING_SAFE_DUMMY_HASH = "$2b$12$agsIHr.Cj47BUhH7vDt1LO2WOCoW/L4f2s4P9GVOY03FJDhuW2Oui"  # pragma: allowlist secret
+
+
+class PasswordHashingStats:
+    def __init__(self) -> None:
+        self.completed = 0
+        self.rejected = 0
+        self.wait_ms_total = 0.0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait_ms: float, run_ms: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.wait_ms_total += wait_ms
+            self.run_ms_total += run_ms
+            self.run_ms_max = max(self.run_ms_max, run_ms)
+
+    def record_rejection(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_avg": self.wait_ms_total / completed,
+                "run_ms_avg": self.run_ms_total / completed,
+                "run_ms_max": self.run_ms_max,
+            }
+
+
+password_hashing_stats = PasswordHashingStats()
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT)
+
+
+# Awaited from async routes, so a waiting request holds neither the event loop nor a threadpool thread.
+# The slot is released when the bcrypt call finishes, even if the request was cancelled in the meantime.
+async def _run_password_work[R](func: Callable[[], R]) -> R:
+    if not _password_slots.acquire(blocking=False):
+        password_hashing_stats.record_rejection()
+        logger.warning("Password hashing queue full, rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    submitted_at = time.perf_counter()
+
+    def timed() -> R:
+        started_at = time.perf_counter()
+        try:
+            return func()
+        finally:
+            password_hashing_stats.record((started_at - submitted_at) * 1000, (time.perf_counter() - started_at) * 1000)
+
+    try:
+        future = _password_executor.submit(timed)
+    except BaseException:
+        _password_slots.release()
+        raise
+    future.add_done_callback(lambda _: _password_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    hashed = await _run_password_work(lambda: bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()))
     return hashed.decode("utf-8")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    result: bool = bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
-    return result
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_work(lambda: bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8")))
 
 
 def create_access_token(data: dict) -> str:
@@ -46,15 +196,7 @@ def verify_refresh_token(token: str) -> dict:
     token_hash = hashlib.sha256(token.encode()).hexdigest()
     token_prefix = token_hash[:8]
 
-    token_data = query_db(
-        """
-        SELECT user_id, expires_at, revoked_at, token_hash
-        FROM refresh_tokens
-        WHERE token_hash = %s
-        """,
-        (token_hash,),
-        one=True,
-    )
+    token_data = query_db(REFRESH_TOKEN_BY_HASH, (token_hash,), one=True)
 
     if not token_data:
         logger.warning("Invalid refresh token: token not found", extra={"token_prefix": token_prefix})
@@ -88,6 +230,10 @@ def verify_refresh_token(token: str) -> dict:
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
+    cached_user = verified_tokens.get(credentials.credentials)
+    if cached_user is not None:
+        return cached_user
+
     token_prefix = credentials.credentials[:8] if credentials.credentials else "none"
     try:
         payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
@@ -102,7 +248,10 @@ def get_current_user(
                 detail="Invalid token payload",
             )
 
-        return {"user_id": user_id, "username": username, "is_admin": is_admin}
+        user = {"user_id": user_id, "username": username, "is_admin": is_admin}
+        if isinstance(payload.get("exp"), int | float):
+            verified_tokens.put(credentials.credentials, user, payload["exp"])
+        return user
 
     except jwt.ExpiredSignatureError:
         logger.warning("Expired access token used", extra={"token_prefix": token_prefix})
@@ -112,27 +261,37 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
+def invalidate_admin_authorization(user_id: int | None = None) -> None:
+    if user_id is None:
+        _admin_grants.clear()
+    else:
+        _admin_grants.pop(user_id, None)
+
+
 def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
     from core.database import query_db
 
-    user = query_db(
-        "SELECT is_admin FROM users WHERE id = %s",
-        (current_user["user_id"],),
-        one=True,
-    )
+    user_id = current_user["user_id"]
+    if _admin_grants.get(user_id, 0.0) > time.monotonic():
+        return current_user
+
+    user = query_db(USER_IS_ADMIN, (user_id,), one=True)
 
     if not user or not user.get("is_admin"):
+        invalidate_admin_authorization(user_id)
         logger.warning(
             "Admin access denied",
-            extra={"user_id": current_user["user_id"], "username": current_user["username"]},
+            extra={"user_id": user_id, "username": current_user["username"]},
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
 
-    logger.info(
+    if ADMIN_AUTH_CACHE_TTL_SECONDS > 0:
+        _admin_grants[user_id] = time.monotonic() + ADMIN_AUTH_CACHE_TTL_SECONDS
+    logger.debug(
         "Admin access granted",
-        extra={"user_id": current_user["user_id"], "username": current_user["username"]},
+        extra={"user_id": user_id, "username": current_user["username"]},
     )
     return current_user
@@ -0,0 +1,124 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+
+from anyio import CapacityLimiter, to_thread
+from core.config import STATEMENT_TIMEOUT_BACKGROUND_MS, STATEMENT_TIMEOUT_GROUP_MS
+from core.load_shedding import route_group
+from core.logging import get_logger
+from core.metrics import Counter, register
+import psycopg2.errors
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = get_logger(__name__)
+
+statement_cancellations = register(
+    Counter("db_statement_cancellations_total", "Queries stopped by statement_timeout or a client disconnect.", ("db", "query", "reason"))
+)
+
+
+class RequestQueries:
+    def __init__(self, group: str):
+        self.group = group
+        self.disconnected = False
+        self.responded = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def attach(self, conn) -> None:
+        with self._lock:
+            self._conn = conn
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    # Called off the event loop; the lock keeps the connection from going back to the pool mid-cancel
+    def cancel(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.cancel()
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar("request_queries", default=None)
+# Cancels get threads of their own: disconnects pile up exactly when the default pool is saturated with the
+# queries they are meant to stop. Each cancel is one short round trip to the server.
+_cancel_limiter = CapacityLimiter(4)
+
+
+def statement_timeout_ms(timeout_ms: int | None = None) -> int:
+    if timeout_ms is not None:
+        return timeout_ms
+    request = _request_queries.get()
+    if request is None:
+        return int(STATEMENT_TIMEOUT_BACKGROUND_MS)
+    return int(STATEMENT_TIMEOUT_GROUP_MS.get(request.group, STATEMENT_TIMEOUT_GROUP_MS.get("default", 0)))
+
+
+# Registers the connection with the current request so a client disconnect cancels its query server-side
+@contextmanager
+def cancellable(conn) -> Iterator[None]:
+    request = _request_queries.get()
+    if request is None:
+        yield
+        return
+    if request.disconnected:
+        raise psycopg2.errors.QueryCanceled("client disconnected before the query started")
+    request.attach(conn)
+    try:
+        yield
+    finally:
+        request.detach()
+
+
+def record_cancellation(db_name: str, query_fingerprint: str) -> None:
+    request = _request_queries.get()
+    reason = "disconnect" if request is not None and request.disconnected else "timeout"
+    statement_cancellations.inc(db_name, query_fingerprint, reason)
+    logger.warning("Query cancelled", extra={"db": db_name, "query": query_fingerprint, "reason": reason})
+
+
+class QueryCancellationMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestQueries(route_group(scope["path"]))
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+
+        # Sole reader of the server's receive channel, so a disconnect is seen even while the endpoint
+        # is blocked in a worker thread and never calls receive itself
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    request.disconnected = True
+                    if not request.responded:
+                        await to_thread.run_sync(request.cancel, limiter=_cancel_limiter)
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        async def receive_message() -> Message:
+            if request.disconnected and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def send_message(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                request.responded = True
+            await send(message)
+
+        token = _request_queries.set(request)
+        watcher = asyncio.create_task(watch())
+        try:
+            await self.app(scope, receive_message, send_message)
+        finally:
+            watcher.cancel()
+            _request_queries.reset(token)
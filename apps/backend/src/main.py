@@ -1,15 +1,25 @@
 #!/usr/bin/env python3
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 import datetime
+import threading
 
-from api.v2 import admin, auth, config, progress, speech, tts, version, vocabulary
-from core.config import APP_VERSION, CORS_ALLOWED_ORIGINS, LOG_JSON_FORMAT, LOG_LEVEL, PORT
+from api.v2 import admin, auth, config, health, metrics, progress, quiz, speech, tts, version, vocabulary
+from core.auth_helpers import purge_refresh_tokens
+from core.background import PeriodicTask
+from core.config import APP_VERSION, CORS_ALLOWED_ORIGINS, LOG_JSON_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE, PORT, REFRESH_TOKEN_PURGE_INTERVAL_SECONDS
 from core.csrf import validate_origin
-from core.database import query_db
+from core.database import close_pools, init_pools, warm_pools
+from core.health import READY_STATUSES, get_readiness, health_probe
 from core.json_encoder import CustomJSONResponse
+from core.load_shedding import LoadSheddingMiddleware
 from core.logging import configure_logging, get_logger
+from core.metrics import rate_limit_rejections, route_label
+from core.profiling import ProfilingMiddleware
 from core.rate_limit import limiter
 from core.request_logging import RequestLoggingMiddleware
+from core.search_index import search_index_refresher
+from core.statement_timeout import QueryCancellationMiddleware
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,12 +29,13 @@ from pydantic import ValidationError
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-configure_logging(log_level=LOG_LEVEL, json_format=LOG_JSON_FORMAT)
+configure_logging(log_level=LOG_LEVEL, json_format=LOG_JSON_FORMAT, queue_size=LOG_QUEUE_SIZE)
 logger = get_logger(__name__)
 
 
 def rate_limit_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
     client_ip = get_remote_address(request)
+    rate_limit_rejections.inc(route_label(request.scope))
     logger.warning(
         "Rate limit exceeded",
         extra={
@@ -34,12 +45,32 @@ def rate_limit_exceeded_handler(request: Request, exc: Exception) -> JSONRespons
             "limit": str(exc.detail) if hasattr(exc, "detail") else "unknown",
         },
     )
+    # Counters are fixed windows, so a full window is the longest a client has to wait
+    retry_after = exc.limit.limit.get_expiry() if isinstance(exc, RateLimitExceeded) and exc.limit is not None else 60
     return JSONResponse(
         status_code=429,
         content={"detail": "Rate limit exceeded. Please try again later."},
+        headers={"Retry-After": str(retry_after)},
     )
 
 
+refresh_token_purger = PeriodicTask("refresh-token-purge", REFRESH_TOKEN_PURGE_INTERVAL_SECONDS, purge_refresh_tokens, run_immediately=True)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    init_pools()
+    threading.Thread(target=warm_pools, name="db-pool-warmup", daemon=True).start()
+    health_probe.start()
+    refresh_token_purger.start()
+    search_index_refresher.start()
+    yield
+    search_index_refresher.stop()
+    refresh_token_purger.stop()
+    health_probe.stop()
+    close_pools()
+
+
 app = FastAPI(
     title="LinguaQuiz API",
     description="Language learning quiz backend with automated spaced repetition",
@@ -47,8 +78,12 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     default_response_class=CustomJSONResponse,
+    lifespan=lifespan,
 )
 
+app.add_middleware(QueryCancellationMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(LoadSheddingMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 
 app.add_middleware(
@@ -106,28 +141,30 @@ app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 app.include_router(auth.router)
 app.include_router(vocabulary.router)
 app.include_router(progress.router)
+app.include_router(quiz.router)
 app.include_router(tts.router)
 app.include_router(admin.router)
 app.include_router(version.router)
 app.include_router(config.router)
 app.include_router(speech.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
 
 
 @app.get("/api/health", tags=["Health"])
 async def health_check() -> HealthResponse:
-    try:
-        query_db("SELECT 1", one=True)
-        return HealthResponse(
-            status="ok",
-            database="connected",
-            timestamp=datetime.datetime.now(datetime.UTC).isoformat(),
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+    main_pool = get_readiness()["pools"].get("main")
+    if main_pool is None or main_pool["status"] not in READY_STATUSES:
+        logger.error("Health check failed", extra={"main_pool": main_pool})
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database connection failed",
         )
+    return HealthResponse(
+        status="ok",
+        database="connected",
+        timestamp=datetime.datetime.now(datetime.UTC).isoformat(),
+    )
 
 
 @app.get("/api/version", tags=["Health"])
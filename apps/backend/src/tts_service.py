@@ -2,8 +2,10 @@ import hashlib
 import time
 from typing import ClassVar
 
-from core.config import AZURE_SPEECH_API_KEY, AZURE_SPEECH_REGION
+from core.config import AZURE_SPEECH_API_KEY, AZURE_SPEECH_REGION, AZURE_TTS_ENDPOINT
 from core.logging import get_logger
+from core.metrics import tts_cache_lookups, upstream_request_duration
+from core.profiling import record_upstream
 import httpx
 from psycopg2.extras import RealDictCursor
 
@@ -45,7 +47,7 @@ class TTSService:
         self.db_pool = db_pool
         self.api_key = AZURE_SPEECH_API_KEY
         self.region = AZURE_SPEECH_REGION
-        self.endpoint = f"https://{self.region}.tts.speech.microsoft.com/cognitiveservices/v1"
+        self.endpoint = AZURE_TTS_ENDPOINT
         self._ensure_table_exists()
 
         if self.api_key:
@@ -110,6 +112,7 @@ class TTSService:
                 result = cur.fetchone()
                 duration_ms = (time.perf_counter() - start_time) * 1000
                 if result:
+                    tts_cache_lookups.inc("hit")
                     logger.debug(
                         "TTS cache hit",
                         extra={
@@ -119,11 +122,13 @@ class TTSService:
                         },
                     )
                     return bytes(result["audio_data"])
+                tts_cache_lookups.inc("miss")
                 logger.debug(
                     "TTS cache miss",
                     extra={"language": language, "text_length": len(text)},
                 )
         except Exception as e:
+            tts_cache_lookups.inc("error")
             logger.error(f"TTS storage read error: {e}")
         finally:
             if conn:
@@ -202,6 +207,8 @@ class TTSService:
                 new_audio: bytes = bytes(response.content)
 
             duration_ms = (time.perf_counter() - start_time) * 1000
+            upstream_request_duration.observe(duration_ms / 1000, "azure_tts", "success")
+            record_upstream(duration_ms)
 
             self._save_to_storage(text, language, new_audio)
 
@@ -218,6 +225,8 @@ class TTSService:
 
         except httpx.HTTPStatusError as e:
             duration_ms = (time.perf_counter() - start_time) * 1000
+            upstream_request_duration.observe(duration_ms / 1000, "azure_tts", "error")
+            record_upstream(duration_ms)
             logger.error(
                 "TTS synthesis failed",
                 extra={
@@ -232,6 +241,8 @@ class TTSService:
             return None
         except Exception as e:
             duration_ms = (time.perf_counter() - start_time) * 1000
+            upstream_request_duration.observe(duration_ms / 1000, "azure_tts", "error")
+            record_upstream(duration_ms)
             error_type = type(e).__name__
             logger.error(
                 "TTS synthesis failed",
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import hashlib
+import io
 import json
 import os
 from pathlib import Path
@@ -15,21 +16,28 @@ WORDS_DB_USER = os.getenv("WORDS_DB_USER", os.getenv("POSTGRES_USER", "postgres"
 WORDS_DB_PASSWORD = os.getenv("WORDS_DB_PASSWORD", os.getenv("POSTGRES_PASSWORD", ""))
 
 VOCABULARY_DIR = os.getenv("VOCABULARY_DIR", "./data/vocabularies")
+# Retired versions stay readable this long so in-flight requests and cached version ids drain
+VERSION_GRACE_HOURS = float(os.getenv("VOCABULARY_VERSION_GRACE_HOURS", "24"))
 
 
-def compute_content_hash(vocabulary_dir):
+def compute_file_hashes(vocabulary_dir):
+    return {filepath.name: hashlib.sha256(filepath.read_bytes()).hexdigest() for filepath in sorted(Path(vocabulary_dir).glob("*.json"))}
+
+
+def compute_content_hash(file_hashes):
     hasher = hashlib.sha256()
-    for filepath in sorted(Path(vocabulary_dir).glob("*.json")):
-        with open(filepath, "rb") as f:
-            hasher.update(f.read())
+    for filename, file_hash in sorted(file_hashes.items()):
+        hasher.update(f"{filename}:{file_hash}\n".encode())
     return hasher.hexdigest()
 
 
-def load_words_from_files(vocabulary_dir):
+def load_words_from_files(filepaths):
     seen = {}
-    for filepath in sorted(Path(vocabulary_dir).glob("*.json")):
+    ids_by_file = {}
+    for filepath in filepaths:
         with open(filepath) as f:
             data = json.load(f)
+        ids_by_file[filepath.name] = []
         for rank, w in enumerate(data["words"]):
             dedup_key = (w["sourceText"], w["sourceLanguage"], w["targetLanguage"])
             entry = (
@@ -49,95 +57,313 @@ def load_words_from_files(vocabulary_dir):
                 print(f"Skipping duplicate: {w['sourceText']} ({w['sourceLanguage']}->{w['targetLanguage']}) in {filepath.name}")
             else:
                 seen[dedup_key] = entry
-    return list(seen.values())
+                ids_by_file[filepath.name].append(w["id"])
+    return list(seen.values()), ids_by_file
 
 
-def sync(conn, vocabulary_dir):
-    cur = conn.cursor()
+CREATE_VERSION_SQL = """
+    INSERT INTO content_versions (version_name, is_active)
+    VALUES ('file-sync-' || TO_CHAR(CLOCK_TIMESTAMP(), 'YYYYMMDD"T"HH24MISSUS') || '-' || %s, FALSE)
+    RETURNING id
+"""
 
-    content_hash = compute_content_hash(vocabulary_dir)
+# The new version starts as a copy of the live one so only changed files are merged into it. The trade-off:
+# every sync rewrites all rows of the live version, with their WAL and full btree, GIN and trigram index
+# maintenance, even for a one-word edit (benchmarks/bench_vocabulary_sync.py reports the cost), in exchange
+# for versions that never change once active. Old copies go with garbage collection of retired versions.
+COPY_VERSION_ITEMS_SQL = """
+    INSERT INTO vocabulary_items
+        (id, version_id, source_text, source_language, target_text, target_language, list_name, difficulty_level,
+         source_usage_example, target_usage_example, is_active, rank, created_at, updated_at)
+    SELECT id, %(version_id)s, source_text, source_language, target_text, target_language, list_name, difficulty_level,
+           source_usage_example, target_usage_example, is_active, rank, created_at, updated_at
+    FROM vocabulary_items
+    WHERE version_id = %(previous_version_id)s
+"""
 
-    cur.execute("SELECT id, description FROM content_versions WHERE is_active = TRUE LIMIT 1")
-    row = cur.fetchone()
-    if row:
-        version_id, description = row
-        if description and description == content_hash:
-            print(f"Content hash unchanged ({content_hash[:12]}...), skipping sync")
-            return
-    else:
-        cur.execute(
-            "INSERT INTO content_versions (version_name, is_active, description) VALUES ('file-sync', TRUE, %s) RETURNING id",
-            (content_hash,),
-        )
-        version_id = cur.fetchone()[0]
-        conn.commit()
+COPY_VERSION_MANIFEST_SQL = """
+    INSERT INTO vocabulary_file_manifest (version_id, filename, content_hash, word_ids, synced_at)
+    SELECT %(version_id)s, filename, content_hash, word_ids, synced_at
+    FROM vocabulary_file_manifest
+    WHERE version_id = %(previous_version_id)s
+"""
 
-    words = load_words_from_files(vocabulary_dir)
-    if not words:
-        print("No vocabulary files found, skipping sync")
-        return
+VALIDATE_VERSION_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM vocabulary_items WHERE version_id = %(version_id)s AND is_active) AS active_items,
+        (SELECT ARRAY_AGG(filename ORDER BY filename) FROM vocabulary_file_manifest
+         WHERE version_id = %(version_id)s) AS filenames,
+        (SELECT COUNT(*)
+         FROM vocabulary_file_manifest m, UNNEST(m.word_ids) AS word_id
+         WHERE m.version_id = %(version_id)s
+           AND NOT EXISTS (SELECT 1 FROM vocabulary_items vi WHERE vi.version_id = m.version_id AND vi.id = word_id)
+        ) AS missing_items
+"""
+
+# Held from before the copy until the flip commits: admin writes wait instead of landing in the live version
+# after it was copied (and being lost with it), and concurrently starting replicas build one at a time.
+# Readers take ACCESS SHARE and never wait.
+LOCK_ITEMS_SQL = "LOCK TABLE vocabulary_items IN SHARE ROW EXCLUSIVE MODE"
+ACTIVE_VERSION_SQL = "SELECT id, description FROM content_versions WHERE is_active = TRUE LIMIT 1"
+
+# Two statements because idx_only_one_active is checked per row; readers see the flip only at commit
+RETIRE_VERSION_SQL = "UPDATE content_versions SET is_active = FALSE, retired_at = NOW() WHERE id = %s"
+ACTIVATE_VERSION_SQL = "UPDATE content_versions SET is_active = TRUE, activated_at = NOW(), description = %s WHERE id = %s"
+
+# Also collects builds that never activated; items and manifests go with them via ON DELETE CASCADE
+COLLECT_RETIRED_VERSIONS_SQL = """
+    DELETE FROM content_versions
+    WHERE NOT is_active AND COALESCE(retired_at, created_at) < NOW() - MAKE_INTERVAL(secs => %s)
+    RETURNING id
+"""
 
-    print(f"Syncing {len(words)} words from {vocabulary_dir}...")
-
-    all_ids = [w[0] for w in words]
-
-    stale_keys = [(version_id, w[1], w[2], w[4], w[0]) for w in words]
-    execute_values(
-        cur,
-        """DELETE FROM vocabulary_items
-           WHERE id IN (
-             SELECT vi.id FROM vocabulary_items vi
-             JOIN (VALUES %s) AS src(vid, src_text, src_lang, tgt_lang, new_id)
-               ON vi.version_id = src.vid::int
-              AND vi.source_text = src.src_text
-              AND vi.source_language = src.src_lang
-              AND vi.target_language = src.tgt_lang
-              AND vi.id != src.new_id::uuid
-           )""",
-        stale_keys,
-        page_size=500,
+
+def load_manifest(cur, version_id):
+    cur.execute(
+        "SELECT filename, content_hash, word_ids::text[] FROM vocabulary_file_manifest WHERE version_id = %s",
+        (version_id,),
     )
+    return {filename: (file_hash, word_ids) for filename, file_hash, word_ids in cur.fetchall()}
+
+
+STAGING_COLUMNS = (
+    "id",
+    "source_text",
+    "source_language",
+    "target_text",
+    "target_language",
+    "list_name",
+    "difficulty_level",
+    "source_usage_example",
+    "target_usage_example",
+    "is_active",
+    "rank",
+)
+
+# Temporary tables are never WAL-logged; ON COMMIT DROP keeps concurrently starting replicas apart
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE vocabulary_sync_staging (
+        id UUID PRIMARY KEY,
+        source_text TEXT NOT NULL,
+        source_language VARCHAR(10) NOT NULL,
+        target_text TEXT NOT NULL,
+        target_language VARCHAR(10) NOT NULL,
+        list_name TEXT NOT NULL,
+        difficulty_level VARCHAR(5),
+        source_usage_example TEXT,
+        target_usage_example TEXT,
+        is_active BOOLEAN NOT NULL,
+        rank INTEGER NOT NULL
+    ) ON COMMIT DROP
+"""
+
+DROP_OWNED_ELSEWHERE_SQL = """
+    DELETE FROM vocabulary_sync_staging s
+    USING vocabulary_items vi
+    WHERE vi.version_id = %(version_id)s
+      AND vi.id = ANY(%(protected_ids)s::uuid[])
+      AND vi.source_text = s.source_text
+      AND vi.source_language = s.source_language
+      AND vi.target_language = s.target_language
+      AND vi.id != s.id
+    RETURNING s.id::text, s.source_text, s.source_language, s.target_language
+"""
+
+DELETE_STALE_KEYS_SQL = """
+    DELETE FROM vocabulary_items vi
+    USING vocabulary_sync_staging s
+    WHERE vi.version_id = %(version_id)s
+      AND vi.source_text = s.source_text
+      AND vi.source_language = s.source_language
+      AND vi.target_language = s.target_language
+      AND vi.id != s.id
+"""
+
+# Rows whose content already matches are skipped: no new tuple version, no WAL, no updated_at trigger
+MERGE_SQL = """
+    MERGE INTO vocabulary_items vi
+    USING vocabulary_sync_staging s ON vi.version_id = %(version_id)s AND vi.id = s.id
+    WHEN MATCHED AND (vi.source_text, vi.source_language, vi.target_text, vi.target_language,
+                      vi.list_name, vi.difficulty_level, vi.source_usage_example, vi.target_usage_example,
+                      vi.is_active, vi.rank)
+        IS DISTINCT FROM (s.source_text, s.source_language, s.target_text, s.target_language,
+                          s.list_name, s.difficulty_level, s.source_usage_example, s.target_usage_example,
+                          s.is_active, s.rank) THEN
+        UPDATE SET
+            source_text = s.source_text,
+            source_language = s.source_language,
+            target_text = s.target_text,
+            target_language = s.target_language,
+            list_name = s.list_name,
+            difficulty_level = s.difficulty_level,
+            source_usage_example = s.source_usage_example,
+            target_usage_example = s.target_usage_example,
+            is_active = s.is_active,
+            rank = s.rank
+    WHEN NOT MATCHED THEN
+        INSERT (id, version_id, source_text, source_language, target_text, target_language,
+                list_name, difficulty_level, source_usage_example, target_usage_example, is_active, rank)
+        VALUES (s.id, %(version_id)s, s.source_text, s.source_language, s.target_text, s.target_language,
+                s.list_name, s.difficulty_level, s.source_usage_example, s.target_usage_example, s.is_active, s.rank)
+"""
+
+# previous_ids NULL means a full pass: every active row of the version missing from the files is deactivated
+DEACTIVATE_MISSING_SQL = """
+    UPDATE vocabulary_items vi SET is_active = FALSE
+    WHERE vi.version_id = %(version_id)s
+      AND vi.is_active = TRUE
+      AND (%(previous_ids)s::uuid[] IS NULL OR vi.id = ANY(%(previous_ids)s::uuid[]))
+      AND NOT EXISTS (SELECT 1 FROM vocabulary_sync_staging s WHERE s.id = vi.id)
+"""
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_to_staging(cur, words):
+    buffer = io.StringIO()
+    for w in words:
+        buffer.write("\t".join(copy_value(value) for value in w))
+        buffer.write("\n")
+    buffer.seek(0)
+    cur.copy_expert(f"COPY vocabulary_sync_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN", buffer)
+
+
+def drop_words_owned_elsewhere(cur, version_id, protected_ids):
+    if not protected_ids:
+        return set()
+    cur.execute(DROP_OWNED_ELSEWHERE_SQL, {"version_id": version_id, "protected_ids": protected_ids})
+    dropped = set()
+    for word_id, source_text, source_language, target_language in cur.fetchall():
+        print(f"Skipping duplicate: {source_text} ({source_language}->{target_language}) already synced from another file")
+        dropped.add(word_id)
+    return dropped
+
+
+def validate_version(cur, version_id, file_hashes):
+    cur.execute(VALIDATE_VERSION_SQL, {"version_id": version_id})
+    active_items, filenames, missing_items = cur.fetchone()
+    problems = []
+    if not active_items:
+        problems.append("no active items")
+    if (filenames or []) != sorted(file_hashes):
+        problems.append("manifest does not match the vocabulary files")
+    if missing_items:
+        problems.append(f"{missing_items} manifest ids have no item")
+    if problems:
+        raise ValueError(f"Version {version_id} failed validation: {', '.join(problems)}")
+
+
+def build_version(conn, vocabulary_dir, file_hashes, content_hash, previous_version_id):
+    cur = conn.cursor()
+
+    cur.execute(CREATE_VERSION_SQL, (content_hash[:12],))
+    version_id = cur.fetchone()[0]
+    if previous_version_id is not None:
+        params = {"version_id": version_id, "previous_version_id": previous_version_id}
+        cur.execute(COPY_VERSION_ITEMS_SQL, params)
+        print(f"Building version {version_id} from {cur.rowcount} items of version {previous_version_id}")
+        cur.execute(COPY_VERSION_MANIFEST_SQL, params)
+
+    manifest = load_manifest(cur, version_id)
+    changed = [filename for filename, file_hash in file_hashes.items() if manifest.get(filename, (None, []))[0] != file_hash]
+    removed = [filename for filename in manifest if filename not in file_hashes]
+    protected_ids = [
+        word_id for filename, (_, word_ids) in manifest.items() if filename in file_hashes and filename not in changed for word_id in word_ids
+    ]
+
+    words, ids_by_file = load_words_from_files(Path(vocabulary_dir) / filename for filename in changed)
+
+    cur.execute(CREATE_STAGING_SQL)
+    copy_to_staging(cur, words)
+    dropped_ids = drop_words_owned_elsewhere(cur, version_id, protected_ids)
+    ids_by_file = {filename: [word_id for word_id in word_ids if word_id not in dropped_ids] for filename, word_ids in ids_by_file.items()}
+    staged = len(words) - len(dropped_ids)
+    cur.execute("ANALYZE vocabulary_sync_staging")
+    print(f"Syncing {staged} words from {len(changed)} changed and {len(removed)} removed file(s) in {vocabulary_dir}...")
+
+    cur.execute(DELETE_STALE_KEYS_SQL, {"version_id": version_id})
     if cur.rowcount > 0:
         print(f"Removed {cur.rowcount} stale records with conflicting text keys")
 
-    values = [(w[0], version_id, w[1], w[2], w[3], w[4], w[5], w[6], w[7], w[8], w[9], w[10]) for w in words]
-
-    execute_values(
-        cur,
-        """INSERT INTO vocabulary_items
-           (id, version_id, source_text, source_language, target_text, target_language,
-            list_name, difficulty_level, source_usage_example, target_usage_example, is_active, rank)
-           VALUES %s
-           ON CONFLICT (id) DO UPDATE SET
-             source_text = EXCLUDED.source_text,
-             target_text = EXCLUDED.target_text,
-             source_language = EXCLUDED.source_language,
-             target_language = EXCLUDED.target_language,
-             list_name = EXCLUDED.list_name,
-             difficulty_level = EXCLUDED.difficulty_level,
-             source_usage_example = EXCLUDED.source_usage_example,
-             target_usage_example = EXCLUDED.target_usage_example,
-             is_active = EXCLUDED.is_active,
-             version_id = EXCLUDED.version_id,
-             rank = EXCLUDED.rank,
-             updated_at = NOW()""",
-        values,
-        page_size=500,
-    )
+    cur.execute(MERGE_SQL, {"version_id": version_id})
+    written = cur.rowcount
 
-    cur.execute(
-        "UPDATE vocabulary_items SET is_active = FALSE, updated_at = NOW() WHERE version_id = %s AND id != ALL(%s::uuid[]) AND is_active = TRUE",
-        (version_id, all_ids),
-    )
+    previous_ids = [word_id for filename in changed + removed for word_id in manifest.get(filename, (None, []))[1]] if manifest else None
+    cur.execute(DEACTIVATE_MISSING_SQL, {"version_id": version_id, "previous_ids": previous_ids})
     deactivated = cur.rowcount
 
-    cur.execute(
-        "UPDATE content_versions SET description = %s WHERE id = %s",
-        (content_hash, version_id),
-    )
+    if changed:
+        execute_values(
+            cur,
+            """INSERT INTO vocabulary_file_manifest (version_id, filename, content_hash, word_ids)
+               VALUES %s
+               ON CONFLICT (version_id, filename) DO UPDATE SET
+                 content_hash = EXCLUDED.content_hash,
+                 word_ids = EXCLUDED.word_ids,
+                 synced_at = NOW()""",
+            [(version_id, filename, file_hashes[filename], ids_by_file[filename]) for filename in changed],
+            template="(%s, %s, %s, %s::uuid[])",
+        )
+    if removed:
+        cur.execute("DELETE FROM vocabulary_file_manifest WHERE version_id = %s AND filename = ANY(%s)", (version_id, removed))
+
+    validate_version(cur, version_id, file_hashes)
+    print(f"Built version {version_id}: {written} written, {staged - written} unchanged, {deactivated} deactivated")
+    return version_id
 
+
+def activate_version(conn, version_id, previous_version_id, content_hash):
+    cur = conn.cursor()
+    if previous_version_id is not None:
+        cur.execute(RETIRE_VERSION_SQL, (previous_version_id,))
+    cur.execute(ACTIVATE_VERSION_SQL, (content_hash, version_id))
     conn.commit()
-    print(f"Sync complete: {len(words)} upserted, {deactivated} deactivated (hash: {content_hash[:12]}...)")
+    print(f"Activated version {version_id} (hash: {content_hash[:12]}...)")
+
+
+def collect_retired_versions(conn):
+    cur = conn.cursor()
+    cur.execute(COLLECT_RETIRED_VERSIONS_SQL, (VERSION_GRACE_HOURS * 3600,))
+    collected = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    if collected:
+        print(f"Garbage-collected {len(collected)} retired version(s): {', '.join(map(str, collected))}")
+
+
+def sync(conn, vocabulary_dir):
+    cur = conn.cursor()
+
+    file_hashes = compute_file_hashes(vocabulary_dir)
+    if not file_hashes:
+        print("No vocabulary files found, skipping sync")
+        return
+    content_hash = compute_content_hash(file_hashes)
+
+    # Checked without the lock first so an unchanged startup never waits on admin writes,
+    # then again under it in case another replica activated this content meanwhile
+    cur.execute(ACTIVE_VERSION_SQL)
+    row = cur.fetchone()
+    if not (row and row[1] == content_hash):
+        cur.execute(LOCK_ITEMS_SQL)
+        cur.execute(ACTIVE_VERSION_SQL)
+        row = cur.fetchone()
+    if row and row[1] == content_hash:
+        conn.rollback()
+        print(f"Content hash unchanged ({content_hash[:12]}...), skipping sync")
+    else:
+        previous_version_id = row[0] if row else None
+        version_id = build_version(conn, vocabulary_dir, file_hashes, content_hash, previous_version_id)
+        activate_version(conn, version_id, previous_version_id, content_hash)
+
+    collect_retired_versions(conn)
 
 
 def main():
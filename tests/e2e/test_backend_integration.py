@@ -2,8 +2,12 @@
 
 # ruff: noqa: E402
 
+import json
 from pathlib import Path
+import re
 import sys
+import time
+import uuid
 
 BACKEND_DIR_LOCAL = Path(__file__).parent.parent.parent.parent / "apps" / "backend"
 BACKEND_DIR_DOCKER = Path("/home/pwuser/backend")
@@ -13,6 +17,7 @@ if str(BACKEND_SRC) not in sys.path:
     sys.path.append(str(BACKEND_SRC))
 
 from conftest import API_URL, SKIP_TTS_TESTS, AuthenticatedUser
+from core.logging import mask_sensitive_data
 from generated.schemas import (
     BulkProgressUpdateRequest,
     ContentVersionResponse,
@@ -32,6 +37,7 @@ from generated.schemas import (
     VocabularyItemUpdate,
     WordListResponse,
 )
+import psycopg2
 import pytest
 from utils import random_password, random_username
 
@@ -46,6 +52,30 @@ class TestHealthEndpoints:
         assert health.status in ["healthy", "ok"]
         assert health.timestamp
 
+    def test_liveness_endpoint(self, api_client):
+        response = api_client.get(f"{API_URL}/health/live")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+
+    def test_readiness_reports_all_pools(self, api_client):
+        response = api_client.get(f"{API_URL}/health/ready")
+        assert response.status_code == 200
+
+        readiness = response.json()
+        assert readiness["status"] == "ready"
+        assert set(readiness["pools"]) == {"main", "words", "tts"}
+        for pool in readiness["pools"].values():
+            assert pool["status"] in ["ok", "saturated"]
+            assert 0 <= pool["saturation"] <= 1
+
+    def test_metrics_endpoint(self, api_client):
+        api_client.get(f"{API_URL}/version")
+        response = api_client.get(f"{API_URL.removesuffix('/api')}/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_count{method="GET",route="/api/version"' in response.text
+        assert "db_pool_connections" in response.text
+
     def test_version_endpoint(self, api_client):
         response = api_client.get(f"{API_URL}/version")
         assert response.status_code == 200
@@ -54,6 +84,81 @@ class TestHealthEndpoints:
         assert version.version
 
 
+def wait_for_replica_status(api_client, name, status, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        replica = api_client.get(f"{API_URL}/health/ready").json()["replicas"][name]
+        if replica["status"] == status or time.monotonic() > deadline:
+            return replica
+        time.sleep(1)
+
+
+# Needs the compose 'replica' profile: a second Postgres container streaming from the first,
+# with the backend started with WORDS_DB_REPLICA_HOSTS=postgres-replica
+@pytest.mark.integration
+class TestWordsReplicas:
+    @pytest.fixture
+    def replica(self, api_client, app_db_credentials):
+        replicas = api_client.get(f"{API_URL}/health/ready").json().get("replicas", {})
+        if not replicas:
+            pytest.skip("No words replicas configured")
+        name = next(iter(replicas))
+        host, _, port = name.partition(":")
+        return name, {**app_db_credentials, "host": host, "port": int(port or app_db_credentials["port"])}
+
+    def test_streaming_replica_is_used(self, admin_api_client, replica):
+        name, _ = replica
+        status = wait_for_replica_status(admin_api_client, name, "ok")
+        assert status["status"] == "ok"
+        assert 0 <= status["lag_seconds"] <= 5
+
+        response = admin_api_client.get(f"{API_URL}/word-lists")
+        assert response.status_code == 200
+
+    def test_disconnected_replica_is_skipped(self, admin_api_client, replica):
+        name, credentials = replica
+        conn = psycopg2.connect(**credentials)
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute("SHOW primary_conninfo")
+        primary_conninfo = cursor.fetchone()[0]
+        cursor.execute("ALTER SYSTEM SET primary_conninfo = ''")
+        cursor.execute("SELECT pg_reload_conf()")
+        item_id = None
+        try:
+            create_payload = VocabularyItemCreate(
+                source_text="replica-lag-test",
+                source_language="en",
+                target_text="тест-реплики",
+                target_language="ru",
+                list_name="en-ru-a1",
+            )
+            response = admin_api_client.post(f"{API_URL}/admin/vocabulary", json=create_payload.model_dump(by_alias=True))
+            assert response.status_code == 201
+            item_id = response.json()["id"]
+
+            assert admin_api_client.get(f"{API_URL}/admin/vocabulary/{item_id}").status_code == 200
+            export = admin_api_client.get(f"{API_URL}/admin/vocabulary/export", params={"list_name": "en-ru-a1"})
+            assert export.status_code == 200
+            assert item_id in {json.loads(line)["id"] for line in export.text.splitlines() if line}
+
+            status = wait_for_replica_status(admin_api_client, name, "skipped")
+            assert status["status"] == "skipped"
+            assert status["lag_seconds"] is None or status["lag_seconds"] > 0
+
+            response = admin_api_client.get(f"{API_URL}/word-lists")
+            assert response.status_code == 200
+        finally:
+            if item_id is not None:
+                admin_api_client.delete(f"{API_URL}/admin/vocabulary/{item_id}")
+            cursor.execute("ALTER SYSTEM SET primary_conninfo = %s", (primary_conninfo,))
+            cursor.execute("SELECT pg_reload_conf()")
+            cursor.close()
+            conn.close()
+
+        assert wait_for_replica_status(admin_api_client, name, "ok")["status"] == "ok"
+
+
 @pytest.mark.integration
 class TestAuthentication:
     def test_user_registration(self, api_client):
@@ -285,6 +390,216 @@ class TestUserProgress:
         )
         assert response.status_code == 200
 
+    def test_progress_stats_follow_writes(self, authenticated_api_client):
+        lists_response = authenticated_api_client.get(f"{API_URL}/word-lists")
+        if lists_response.status_code != 200 or not lists_response.json():
+            pytest.skip("No word lists available")
+        list_name = lists_response.json()[0]["listName"]
+        vocab_response = authenticated_api_client.get(f"{API_URL}/translations", params={"list_name": list_name})
+        if vocab_response.status_code != 200 or len(vocab_response.json()) < 2:
+            pytest.skip("Not enough vocabulary items available")
+        first, second = (item["id"] for item in vocab_response.json()[:2])
+
+        def save(vocabulary_item_id, level, correct, incorrect):
+            update = ProgressUpdateRequest(
+                vocabulary_item_id=vocabulary_item_id,
+                level=level,
+                queue_position=0,
+                correct_count=correct,
+                incorrect_count=incorrect,
+                consecutive_correct=0,
+                recent_history=[],
+            )
+            response = authenticated_api_client.post(f"{API_URL}/user/progress", json=update.model_dump(by_alias=True))
+            assert response.status_code == 200
+
+        assert authenticated_api_client.get(f"{API_URL}/user/progress/stats").json() == []
+
+        save(first, 1, 1, 0)
+        save(second, 1, 0, 2)
+        save(first, 2, 3, 0)
+
+        response = authenticated_api_client.get(f"{API_URL}/user/progress/stats", params={"list_name": list_name})
+        assert response.status_code == 200
+        stats = response.json()
+        assert len(stats) == 1
+        assert stats[0]["listName"] == list_name
+        assert stats[0]["levelCounts"] == [0, 1, 1, 0, 0, 0]
+        assert stats[0]["correctCount"] == 3
+        assert stats[0]["incorrectCount"] == 2
+        assert stats[0]["lastPracticedAt"] is not None
+
+    def test_progress_stats_follow_list_moves(self, admin_api_client):
+        moved_list = f"en-ru-moved-{uuid.uuid4().hex[:8]}"
+        create_payload = VocabularyItemCreate(
+            source_text="summary-move-test",
+            source_language="en",
+            target_text="тест-переноса",
+            target_language="ru",
+            list_name="en-ru-a1",
+        )
+        response = admin_api_client.post(f"{API_URL}/admin/vocabulary", json=create_payload.model_dump(by_alias=True))
+        assert response.status_code == 201
+        item_id = response.json()["id"]
+
+        def save(level, correct):
+            update = ProgressUpdateRequest(
+                vocabulary_item_id=item_id,
+                level=level,
+                queue_position=0,
+                correct_count=correct,
+                incorrect_count=0,
+                consecutive_correct=0,
+                recent_history=[],
+            )
+            response = admin_api_client.post(f"{API_URL}/user/progress", json=update.model_dump(by_alias=True))
+            assert response.status_code == 200
+
+        def stats_by_list():
+            response = admin_api_client.get(f"{API_URL}/user/progress/stats")
+            assert response.status_code == 200
+            return {stats["listName"]: stats for stats in response.json()}
+
+        try:
+            save(1, 1)
+            assert stats_by_list()["en-ru-a1"]["levelCounts"] == [0, 1, 0, 0, 0, 0]
+
+            move_payload = VocabularyItemUpdate(list_name=moved_list)
+            response = admin_api_client.put(
+                f"{API_URL}/admin/vocabulary/{item_id}",
+                json=move_payload.model_dump(by_alias=True, exclude_none=True),
+            )
+            assert response.status_code == 200
+            save(2, 2)
+
+            stats = stats_by_list()
+            assert "en-ru-a1" not in stats
+            assert stats[moved_list]["levelCounts"] == [0, 0, 1, 0, 0, 0]
+            assert stats[moved_list]["correctCount"] == 2
+        finally:
+            admin_api_client.delete(f"{API_URL}/admin/vocabulary/{item_id}")
+
+
+def accepted_answer(target_text: str) -> str:
+    # First alternative of every comma-separated group, with optional [parts] left out
+    answers = []
+    for group in re.split(r",(?![^()\[\]]*[)\]])", target_text):
+        group = re.sub(r"\[.*?\]", "", group.strip())
+        if group.startswith("(") and group.endswith(")") and "|" in group:
+            group = group[1:-1]
+        answers.append(group.split("|")[0].strip())
+    return ", ".join(answers)
+
+
+@pytest.mark.integration
+class TestQuizSession:
+    def test_next_and_answer_persist_progress(self, authenticated_api_client):
+        lists_response = authenticated_api_client.get(f"{API_URL}/word-lists")
+        if lists_response.status_code != 200 or not lists_response.json():
+            pytest.skip("No word lists available")
+        list_name = lists_response.json()[0]["listName"]
+
+        next_response = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": list_name})
+        assert next_response.status_code == 200
+        question = next_response.json()["question"]
+        assert question["level"] == 1
+        assert question["direction"] == "normal"
+
+        reveal_response = authenticated_api_client.post(
+            f"{API_URL}/quiz/answer",
+            json={"listName": list_name, "translationId": question["translationId"]},
+        )
+        assert reveal_response.status_code == 200
+        assert reveal_response.json()["isCorrect"] is False
+        assert reveal_response.json()["correctAnswerText"]
+
+        progress = authenticated_api_client.get(f"{API_URL}/user/progress", params={"list_name": list_name}).json()
+        answered = next(item for item in progress if item["vocabularyItemId"] == question["translationId"])
+        assert answered["incorrectCount"] == 1
+        assert answered["recentHistory"] == [False]
+
+    def test_correct_answer_is_not_asked_again_right_away(self, authenticated_api_client):
+        lists_response = authenticated_api_client.get(f"{API_URL}/word-lists")
+        lists = [item for item in lists_response.json() if item["wordCount"] >= 20] if lists_response.status_code == 200 else []
+        if not lists:
+            pytest.skip("No word list large enough")
+        list_name = lists[0]["listName"]
+        answers = {
+            item["id"]: accepted_answer(item["targetText"])
+            for item in authenticated_api_client.get(f"{API_URL}/translations", params={"list_name": list_name}).json()
+        }
+
+        def answer_next() -> str:
+            question = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": list_name}).json()["question"]
+            response = authenticated_api_client.post(
+                f"{API_URL}/quiz/answer",
+                json={"listName": list_name, "translationId": question["translationId"], "answer": answers[question["translationId"]]},
+            )
+            assert response.json()["isCorrect"] is True
+            return question["translationId"]
+
+        first = answer_next()
+        assert first not in [answer_next() for _ in range(5)]
+
+    def test_progress_written_elsewhere_is_not_overwritten(self, authenticated_api_client):
+        lists_response = authenticated_api_client.get(f"{API_URL}/word-lists")
+        if lists_response.status_code != 200 or not lists_response.json():
+            pytest.skip("No word lists available")
+        list_name = lists_response.json()[0]["listName"]
+
+        question = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": list_name}).json()["question"]
+        authenticated_api_client.post(f"{API_URL}/quiz/answer", json={"listName": list_name, "translationId": question["translationId"]})
+
+        # Stands in for a write served by another worker while this one still caches the session
+        update = ProgressUpdateRequest(
+            vocabulary_item_id=question["translationId"],
+            level=2,
+            queue_position=7,
+            correct_count=9,
+            incorrect_count=4,
+            consecutive_correct=0,
+            recent_history=[True],
+        )
+        assert authenticated_api_client.post(f"{API_URL}/user/progress", json=update.model_dump(by_alias=True)).status_code == 200
+
+        next_question = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": list_name}).json()["question"]
+        response = authenticated_api_client.post(
+            f"{API_URL}/quiz/answer", json={"listName": list_name, "translationId": next_question["translationId"]}
+        )
+        assert response.status_code == 200
+
+        progress = authenticated_api_client.get(f"{API_URL}/user/progress", params={"list_name": list_name}).json()
+        written = next(item for item in progress if item["vocabularyItemId"] == question["translationId"])
+        assert (written["level"], written["correctCount"], written["incorrectCount"]) == (2, 9, 4)
+
+    def test_only_the_issued_question_can_be_answered(self, authenticated_api_client):
+        lists_response = authenticated_api_client.get(f"{API_URL}/word-lists")
+        lists = [item for item in lists_response.json() if item["wordCount"] >= 2] if lists_response.status_code == 200 else []
+        if not lists:
+            pytest.skip("No word list with two words")
+        list_name = lists[0]["listName"]
+        word_ids = [item["id"] for item in authenticated_api_client.get(f"{API_URL}/translations", params={"list_name": list_name}).json()]
+
+        question = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": list_name}).json()["question"]
+        other_id = next(word_id for word_id in word_ids if word_id != question["translationId"])
+        response = authenticated_api_client.post(f"{API_URL}/quiz/answer", json={"listName": list_name, "translationId": other_id})
+        assert response.status_code == 409
+
+        response = authenticated_api_client.post(f"{API_URL}/quiz/answer", json={"listName": list_name, "translationId": question["translationId"]})
+        assert response.status_code == 200
+        response = authenticated_api_client.post(f"{API_URL}/quiz/answer", json={"listName": list_name, "translationId": question["translationId"]})
+        assert response.status_code == 409
+
+    def test_unknown_list_and_translation(self, authenticated_api_client):
+        response = authenticated_api_client.post(f"{API_URL}/quiz/next", json={"listName": f"missing-{uuid.uuid4()}"})
+        assert response.status_code == 404
+
+        response = authenticated_api_client.post(
+            f"{API_URL}/quiz/answer",
+            json={"listName": f"missing-{uuid.uuid4()}", "translationId": str(uuid.uuid4()), "answer": "x"},
+        )
+        assert response.status_code == 404
+
 
 @pytest.mark.integration
 class TestContentVersion:
@@ -381,6 +696,36 @@ class TestAdminVocabulary:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_admin_list_vocabulary_keyset_pages(self, admin_api_client):
+        first = admin_api_client.get(f"{API_URL}/admin/vocabulary", params={"limit": 2})
+        assert first.status_code == 200
+        if "X-Next-Cursor" not in first.headers:
+            pytest.skip("Not enough vocabulary items to page")
+
+        second = admin_api_client.get(f"{API_URL}/admin/vocabulary", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+        assert second.status_code == 200
+        first_ids = {item["id"] for item in first.json()}
+        assert first_ids.isdisjoint(item["id"] for item in second.json())
+
+        bad = admin_api_client.get(f"{API_URL}/admin/vocabulary", params={"cursor": "not-a-cursor"})
+        assert bad.status_code == 400
+
+    def test_admin_export_vocabulary_ndjson(self, admin_api_client):
+        response = admin_api_client.get(f"{API_URL}/admin/vocabulary/export", params={"list_name": "en-ru-a1"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = [json.loads(line) for line in response.text.splitlines()]
+        assert all(item["listName"] == "en-ru-a1" for item in items)
+
+    def test_admin_profile_header_records_request(self, admin_api_client):
+        response = admin_api_client.get(f"{API_URL}/admin/vocabulary", headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        assert "db_words;dur=" in response.headers["Server-Timing"]
+
+        profiles = admin_api_client.get(f"{API_URL}/admin/profiles").json()
+        assert any(profile["route"] == "/api/admin/vocabulary" for profile in profiles)
+
     def test_admin_search_vocabulary(self, admin_api_client):
         response = admin_api_client.get(
             f"{API_URL}/admin/vocabulary/search",
@@ -391,6 +736,17 @@ class TestAdminVocabulary:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_admin_vocabulary_typeahead(self, admin_api_client):
+        list_response = admin_api_client.get(f"{API_URL}/admin/vocabulary", params={"limit": 1})
+        if list_response.status_code != 200 or not list_response.json():
+            pytest.skip("No vocabulary items available")
+
+        item = list_response.json()[0]
+        response = admin_api_client.get(f"{API_URL}/admin/vocabulary/typeahead", params={"query": item["sourceText"]})
+
+        assert response.status_code == 200
+        assert item["id"] in {result["id"] for result in response.json()}
+
     def test_admin_create_vocabulary(self, admin_api_client):
         create_payload = VocabularyItemCreate(
             source_text="integration-test-word",
@@ -452,6 +808,54 @@ class TestAdminVocabulary:
         get_response = admin_api_client.get(f"{API_URL}/admin/vocabulary/{item_id}")
         assert get_response.status_code == 404
 
+    def test_admin_bulk_vocabulary_changes(self, admin_api_client):
+        create = VocabularyItemCreate(
+            source_text=f"bulk-test-{random_username()}",
+            source_language="en",
+            target_text="массовый-тест",
+            target_language="ru",
+            list_name="en-ru-a1",
+        ).model_dump(by_alias=True)
+        response = admin_api_client.post(f"{API_URL}/admin/vocabulary/bulk", json={"create": [create, create]})
+        assert response.status_code == 200
+        created, duplicate = response.json()["results"]
+        assert created["status"] == "created"
+        assert duplicate["status"] == "duplicate"
+        item_id = created["id"]
+
+        response = admin_api_client.post(
+            f"{API_URL}/admin/vocabulary/bulk",
+            json={"update": [{"id": item_id, "targetText": "обновлено"}], "deactivate": [str(uuid.uuid4())]},
+        )
+        assert response.status_code == 200
+        statuses = {result["op"]: result["status"] for result in response.json()["results"]}
+        assert statuses == {"update": "updated", "deactivate": "not_found"}
+
+        other = {**create, "sourceText": f"{create['sourceText']}-other"}
+        response = admin_api_client.post(f"{API_URL}/admin/vocabulary/bulk", json={"create": [other]})
+        other_id = response.json()["results"][0]["id"]
+        response = admin_api_client.post(
+            f"{API_URL}/admin/vocabulary/bulk",
+            json={
+                "update": [
+                    {"id": item_id, "targetText": "обновлено"},
+                    {"id": other_id, "sourceText": create["sourceText"]},
+                    {"id": str(uuid.uuid4()), "targetText": "нет"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        assert [result["status"] for result in response.json()["results"]] == ["unchanged", "conflict", "not_found"]
+        admin_api_client.delete(f"{API_URL}/admin/vocabulary/{other_id}")
+
+        response = admin_api_client.post(f"{API_URL}/admin/vocabulary/bulk", json={"deactivate": [item_id]})
+        assert response.json()["results"][0]["status"] == "deactivated"
+        item = admin_api_client.get(f"{API_URL}/admin/vocabulary/{item_id}").json()
+        assert item["targetText"] == "обновлено"
+        assert item["isActive"] is False
+
+        admin_api_client.delete(f"{API_URL}/admin/vocabulary/{item_id}")
+
     def test_admin_get_vocabulary_item(self, admin_api_client):
         list_response = admin_api_client.get(f"{API_URL}/admin/vocabulary", params={"limit": 1})
         if list_response.status_code != 200 or not list_response.json():
@@ -687,6 +1091,18 @@ class TestSecurityBasic:
         if data:
             assert "<script>" not in str(data)
 
+    @pytest.mark.parametrize(
+        ("message", "masked"),
+        [
+            ("Bearer token: xyz", "Bearer *** ***"),
+            ("login password=hunter2 for bob@example.com", "login password=*** for ***@***.***"),
+            ("secret=password: x", "secret=*** ***"),
+            ("GET /api/user/progress 200", "GET /api/user/progress 200"),
+        ],
+    )
+    def test_log_masking(self, message, masked):
+        assert mask_sensitive_data(message) == masked
+
     def test_path_traversal_in_vocabulary_id(self, admin_api_client):
         response = admin_api_client.get(f"{API_URL}/admin/vocabulary/../../../etc/passwd")
         assert response.status_code in [400, 404, 422]
@@ -1,8 +1,11 @@
 # ruff: noqa: PT012
 from datetime import UTC, datetime, timedelta
+import importlib.util
+import json
 import uuid
 
 from alembic import command  # type: ignore[attr-defined]
+from conftest import BACKEND_DIR
 import psycopg2
 import pytest
 
@@ -16,6 +19,7 @@ def test_upgrade_creates_all_tables(migrated_db):
         """
         SELECT tablename FROM pg_tables
         WHERE schemaname = 'public'
+        AND tablename::regclass NOT IN (SELECT inhrelid FROM pg_inherits)
         ORDER BY tablename
     """
     )
@@ -27,6 +31,7 @@ def test_upgrade_creates_all_tables(migrated_db):
         "refresh_tokens",
         "tts_cache",
         "user_progress",
+        "user_progress_summary",
         "users",
     ]
 
@@ -51,6 +56,7 @@ def test_words_db_creates_all_tables(migrated_words_db):
         "alembic_version",
         "content_changelog",
         "content_versions",
+        "vocabulary_file_manifest",
         "vocabulary_items",
     ]
 
@@ -116,6 +122,8 @@ def test_content_versions_table_structure(migrated_words_db):
         "created_at",
         "created_by",
         "is_active",
+        "activated_at",
+        "retired_at",
     ]
     assert column_names == expected_columns
 
@@ -244,6 +252,44 @@ def test_vocabulary_items_unique_constraint(migrated_words_db):
     cursor.close()
 
 
+def test_vocabulary_item_ids_are_shared_across_versions(migrated_words_db):
+    cursor = migrated_words_db.cursor()
+
+    cursor.execute("SELECT id FROM content_versions WHERE is_active = TRUE")
+    version_id = cursor.fetchone()[0]
+    cursor.execute("INSERT INTO content_versions (version_name, is_active) VALUES ('blue-green-test', FALSE) RETURNING id")
+    next_version_id = cursor.fetchone()[0]
+
+    cursor.execute(
+        """
+        INSERT INTO vocabulary_items
+        (version_id, source_language, target_language, source_text, target_text, list_name)
+        VALUES (%s, 'en', 'ru', 'version', 'версия', 'test-list')
+        RETURNING id
+    """,
+        (version_id,),
+    )
+    vocab_id = cursor.fetchone()[0]
+
+    cursor.execute(
+        """
+        INSERT INTO vocabulary_items
+        (id, version_id, source_language, target_language, source_text, target_text, list_name)
+        VALUES (%s, %s, 'en', 'ru', 'version', 'версия', 'test-list')
+    """,
+        (vocab_id, next_version_id),
+    )
+    cursor.execute("SELECT COUNT(*) FROM vocabulary_items WHERE id = %s", (vocab_id,))
+    assert cursor.fetchone()[0] == 2
+
+    cursor.execute("DELETE FROM content_versions WHERE id = %s", (next_version_id,))
+    cursor.execute("SELECT version_id FROM vocabulary_items WHERE id = %s", (vocab_id,))
+    assert cursor.fetchall() == [(version_id,)]
+
+    migrated_words_db.rollback()
+    cursor.close()
+
+
 def test_user_progress_table(migrated_db, migrated_words_db):
     main_cursor = migrated_db.cursor()
     words_cursor = migrated_words_db.cursor()
@@ -347,6 +393,26 @@ def test_user_progress_check_constraints(migrated_db, migrated_words_db):
     words_cursor.close()
 
 
+def test_user_progress_hash_partitioned(migrated_db):
+    cursor = migrated_db.cursor()
+
+    cursor.execute(
+        """
+        SELECT pt.partstrat, COUNT(i.inhrelid)
+        FROM pg_partitioned_table pt
+        JOIN pg_inherits i ON i.inhparent = pt.partrelid
+        WHERE pt.partrelid = 'user_progress'::regclass
+        GROUP BY pt.partstrat
+    """
+    )
+
+    strategy, partitions = cursor.fetchone()
+    assert strategy == "h"
+    assert partitions == 16
+
+    cursor.close()
+
+
 def test_refresh_tokens_table(migrated_db):
     cursor = migrated_db.cursor()
 
@@ -589,10 +655,10 @@ def test_vocabulary_items_indexes_exist(migrated_words_db):
         "idx_vocab_active",
         "idx_vocab_version",
         "idx_vocab_version_fk",
-        "idx_vocab_fts_source",
-        "idx_vocab_fts_target",
+        "idx_vocab_search",
         "idx_vocab_trigram_source",
         "idx_vocab_trigram_target",
+        "idx_vocab_keyset",
     }
 
     assert expected_indexes.issubset(indexes)
@@ -623,6 +689,7 @@ def test_user_progress_indexes_exist(migrated_db):
     }
 
     assert expected_indexes.issubset(indexes)
+    assert "idx_progress_user_vocab" not in indexes
 
     cursor.close()
 
@@ -647,8 +714,167 @@ def test_refresh_tokens_indexes_exist(migrated_db):
         "idx_refresh_tokens_user",
         "idx_refresh_tokens_hash",
         "idx_refresh_tokens_expires",
+        "idx_refresh_tokens_revoked",
     }
 
     assert expected_indexes.issubset(indexes)
 
     cursor.close()
+
+
+@pytest.fixture
+def sync_vocabulary():
+    spec = importlib.util.spec_from_file_location("sync_vocabulary", BACKEND_DIR / "sync_vocabulary.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def vocabulary_words(list_name, *source_texts):
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "sourceText": source_text,
+            "sourceLanguage": "en",
+            "targetText": f"{source_text}-ru",
+            "targetLanguage": "ru",
+            "listName": list_name,
+            "difficultyLevel": "A1",
+        }
+        for source_text in source_texts
+    ]
+
+
+def write_vocabulary(directory, filename, words):
+    (directory / filename).write_text(json.dumps({"words": words}))
+
+
+def active_version_items(cursor):
+    cursor.execute(
+        """
+        SELECT vi.id::text, vi.list_name, vi.target_text, vi.is_active, vi.updated_at
+        FROM vocabulary_items vi
+        JOIN content_versions cv ON cv.id = vi.version_id AND cv.is_active
+    """
+    )
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def active_version_manifest(cursor):
+    cursor.execute(
+        """
+        SELECT m.filename, m.word_ids::text[]
+        FROM vocabulary_file_manifest m
+        JOIN content_versions cv ON cv.id = m.version_id AND cv.is_active
+        ORDER BY m.filename
+    """
+    )
+    return cursor.fetchall()
+
+
+def test_sync_vocabulary_first_full_sync(migrated_words_db, sync_vocabulary, tmp_path):
+    first = vocabulary_words("list-a", "one", "two")
+    second = vocabulary_words("list-b", "three")
+    write_vocabulary(tmp_path, "a.json", first)
+    write_vocabulary(tmp_path, "b.json", second)
+
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    cursor = migrated_words_db.cursor()
+    items = active_version_items(cursor)
+    assert {word_id: (list_name, is_active) for word_id, (list_name, _, is_active, _) in items.items()} == {
+        first[0]["id"]: ("list-a", True),
+        first[1]["id"]: ("list-a", True),
+        second[0]["id"]: ("list-b", True),
+    }
+    assert active_version_manifest(cursor) == [
+        ("a.json", [word["id"] for word in first]),
+        ("b.json", [second[0]["id"]]),
+    ]
+    migrated_words_db.rollback()
+    cursor.close()
+
+
+def test_sync_vocabulary_one_word_edit(migrated_words_db, sync_vocabulary, tmp_path, capsys):
+    first = vocabulary_words("list-a", "one", "two")
+    second = vocabulary_words("list-b", "three")
+    write_vocabulary(tmp_path, "a.json", first)
+    write_vocabulary(tmp_path, "b.json", second)
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+    cursor = migrated_words_db.cursor()
+    before = active_version_items(cursor)
+    migrated_words_db.rollback()
+    capsys.readouterr()
+
+    first[1]["targetText"] = "два"
+    write_vocabulary(tmp_path, "a.json", first)
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    assert "1 written, 1 unchanged, 0 deactivated" in capsys.readouterr().out
+    after = active_version_items(cursor)
+    assert after[first[1]["id"]][1] == "два"
+    assert {word_id for word_id in after if after[word_id][3] != before[word_id][3]} == {first[1]["id"]}
+    migrated_words_db.rollback()
+    cursor.close()
+
+
+def test_sync_vocabulary_file_removal_deactivates_its_words(migrated_words_db, sync_vocabulary, tmp_path):
+    first = vocabulary_words("list-a", "one", "two")
+    second = vocabulary_words("list-b", "three", "four")
+    write_vocabulary(tmp_path, "a.json", first)
+    write_vocabulary(tmp_path, "b.json", second)
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    (tmp_path / "b.json").unlink()
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    cursor = migrated_words_db.cursor()
+    items = active_version_items(cursor)
+    assert all(items[word["id"]][2] for word in first)
+    assert not any(items[word["id"]][2] for word in second)
+    assert active_version_manifest(cursor) == [("a.json", [word["id"] for word in first])]
+    migrated_words_db.rollback()
+    cursor.close()
+
+
+def test_sync_vocabulary_word_moved_between_files(migrated_words_db, sync_vocabulary, tmp_path):
+    first = vocabulary_words("list-a", "one", "two")
+    second = vocabulary_words("list-b", "three")
+    write_vocabulary(tmp_path, "a.json", first)
+    write_vocabulary(tmp_path, "b.json", second)
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    moved = first.pop()
+    second.append({**moved, "listName": "list-b"})
+    write_vocabulary(tmp_path, "a.json", first)
+    write_vocabulary(tmp_path, "b.json", second)
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    cursor = migrated_words_db.cursor()
+    items = active_version_items(cursor)
+    assert items[moved["id"]][0] == "list-b"
+    assert items[moved["id"]][2] is True
+    assert active_version_manifest(cursor) == [
+        ("a.json", [first[0]["id"]]),
+        ("b.json", [word["id"] for word in second]),
+    ]
+    migrated_words_db.rollback()
+    cursor.close()
+
+
+def test_sync_vocabulary_rerun_without_changes(migrated_words_db, sync_vocabulary, tmp_path, capsys):
+    write_vocabulary(tmp_path, "a.json", vocabulary_words("list-a", "one", "two"))
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+    cursor = migrated_words_db.cursor()
+    cursor.execute("SELECT COUNT(*), MAX(id) FILTER (WHERE is_active) FROM content_versions")
+    versions_before = cursor.fetchone()
+    migrated_words_db.rollback()
+    capsys.readouterr()
+
+    sync_vocabulary.sync(migrated_words_db, tmp_path)
+
+    assert "skipping sync" in capsys.readouterr().out
+    cursor.execute("SELECT COUNT(*), MAX(id) FILTER (WHERE is_active) FROM content_versions")
+    assert cursor.fetchone() == versions_before
+    migrated_words_db.rollback()
+    cursor.close()
@@ -8,7 +8,7 @@ from rich.panel import Panel
 from rich.table import Table
 
 from vocab_tools.core.api_client import get_api_client
-from vocab_tools.core.exceptions import MissingCredentialsError
+from vocab_tools.core.exceptions import MissingCredentialsError, VocabularyBulkError, VocabularyError
 from vocab_tools.core.io import extract_source_language_from_list, load_vocabulary_words, save_vocabulary_json
 from vocab_tools.core.models import VocabularyEntry
 from vocab_tools.core.repository import entry_to_dict, word_differs
@@ -98,6 +98,10 @@ def sync(
 
     console.print(f"[green]Syncing {len(list_names)} vocabulary list(s)[/green]\n")
 
+    # Pushes from every list go out together, so the bulk endpoint's rate limit is hit per 1000 changes, not per list
+    creates: list[dict] = []
+    updates: list[dict] = []
+
     for ln in list_names:
         console.print(f"[bold]Syncing: {ln}[/bold]")
 
@@ -107,19 +111,26 @@ def sync(
         local_map = {w["sourceText"].lower(): w for w in local_words}
         remote_map = {e.source_text.lower(): e for e in remote_words}
 
+        list_pushes = 0
         if not pull_only:
-            push_stats = _push_changes(client, ln, local_map, remote_map, dry_run, force)
-            stats["pushed"] += push_stats["pushed"]
+            push_stats = _collect_push_changes(ln, local_map, remote_map, force)
+            creates.extend(push_stats["create"])
+            updates.extend(push_stats["update"])
+            list_pushes = len(push_stats["create"]) + len(push_stats["update"])
             stats["conflicts"] += push_stats["conflicts"]
 
+        list_pulls = 0
         if not push_only:
             pull_stats = _pull_changes(directory, ln, local_map, remote_map, dry_run, force)
+            list_pulls = pull_stats["pulled"]
             stats["pulled"] += pull_stats["pulled"]
             stats["conflicts"] += pull_stats["conflicts"]
 
-        unchanged = len(set(local_map.keys()) & set(remote_map.keys())) - stats["pushed"] - stats["pulled"]
+        unchanged = len(set(local_map.keys()) & set(remote_map.keys())) - list_pushes - list_pulls
         stats["unchanged"] += max(0, unchanged)
 
+    stats["pushed"] = _push_changes(client, creates, updates, dry_run)
+
     _print_summary(stats, dry_run)
 
 
@@ -136,7 +147,7 @@ def _discover_lists(client, directory: Path) -> list[str]:
             pass
 
     try:
-        for entry in client.list_vocabulary(limit=10000):
+        for entry in client.export_vocabulary():
             list_names.add(entry.list_name)
     except Exception:
         pass
@@ -152,51 +163,60 @@ def _load_local_vocabulary(directory: Path, list_name: str) -> list[dict]:
 
 def _fetch_remote_vocabulary(client, list_name: str) -> list[VocabularyEntry]:
     try:
-        return client.list_vocabulary(list_name=list_name, limit=10000)
+        return list(client.export_vocabulary(list_name=list_name))
     except Exception:
         return []
 
 
-def _push_changes(client, list_name: str, local_map: dict, remote_map: dict, dry_run: bool, force: bool) -> dict:
-    stats = {"pushed": 0, "conflicts": 0}
+def _collect_push_changes(list_name: str, local_map: dict, remote_map: dict, force: bool) -> dict:
+    conflicts = 0
+    creates: list[dict] = []
+    updates: list[dict] = []
 
     for key, local_word in local_map.items():
         remote_entry = remote_map.get(key)
 
         if remote_entry is None:
-            if not dry_run:
-                try:
-                    source_lang = local_word.get("sourceLanguage", extract_source_language_from_list(list_name))
-                    client.create_vocabulary_item(
-                        source_text=local_word["sourceText"],
-                        target_text=local_word["targetText"],
-                        list_name=list_name,
-                        source_language=source_lang,
-                        target_language=local_word.get("targetLanguage", "ru"),
-                        difficulty_level=local_word.get("difficultyLevel"),
-                        source_usage_example=local_word.get("sourceUsageExample", ""),
-                        target_usage_example=local_word.get("targetUsageExample", ""),
-                    )
-                except Exception:
-                    pass
-            stats["pushed"] += 1
+            creates.append(
+                {
+                    "sourceText": local_word["sourceText"],
+                    "targetText": local_word["targetText"],
+                    "listName": list_name,
+                    "sourceLanguage": local_word.get("sourceLanguage", extract_source_language_from_list(list_name)),
+                    "targetLanguage": local_word.get("targetLanguage", "ru"),
+                    "difficultyLevel": local_word.get("difficultyLevel"),
+                    "sourceUsageExample": local_word.get("sourceUsageExample", ""),
+                    "targetUsageExample": local_word.get("targetUsageExample", ""),
+                }
+            )
         elif word_differs(remote_entry, local_word, check_source=False):
             if force:
-                if not dry_run:
-                    try:
-                        client.update_vocabulary_item(
-                            item_id=remote_entry.id,
-                            target_text=local_word.get("targetText"),
-                            source_usage_example=local_word.get("sourceUsageExample"),
-                            target_usage_example=local_word.get("targetUsageExample"),
-                        )
-                    except Exception:
-                        pass
-                stats["pushed"] += 1
+                update = {"id": remote_entry.id}
+                for field in ("targetText", "sourceUsageExample", "targetUsageExample"):
+                    if local_word.get(field) is not None:
+                        update[field] = local_word[field]
+                updates.append(update)
             else:
-                stats["conflicts"] += 1
+                conflicts += 1
 
-    return stats
+    return {"create": creates, "update": updates, "conflicts": conflicts}
+
+
+# Returns how many changes the server applied; duplicates and missing items are not counted
+def _push_changes(client, creates: list[dict], updates: list[dict], dry_run: bool) -> int:
+    if dry_run or not (creates or updates):
+        return len(creates) + len(updates)
+
+    try:
+        results = client.bulk_vocabulary(create=creates, update=updates)
+    except VocabularyBulkError as e:
+        console.print(f"[red]Failed to push changes: {e}[/red]")
+        results = e.applied
+    except VocabularyError as e:
+        console.print(f"[red]Failed to push changes: {e}[/red]")
+        results = []
+
+    return sum(1 for result in results if result.get("status") in ("created", "updated"))
 
 
 def _pull_changes(
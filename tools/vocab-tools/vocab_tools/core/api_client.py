@@ -1,10 +1,27 @@
+import json
 import os
+import time
+from collections.abc import Iterator
 
 import requests
 
-from .exceptions import MissingCredentialsError, VocabularyCreateError, VocabularyFetchError, VocabularyUpdateError
+from .exceptions import (
+    MissingCredentialsError,
+    VocabularyBulkError,
+    VocabularyCreateError,
+    VocabularyFetchError,
+    VocabularyUpdateError,
+)
 from .models import VocabularyEntry
 
+# Server caps admin list pages at 1000 rows; further pages follow the X-Next-Cursor header
+LIST_PAGE_SIZE = 1000
+# Operations per bulk request; the server rejects more than 5000
+BULK_CHUNK_SIZE = 1000
+# The bulk endpoint allows 10 requests a minute; a 429 is retried after Retry-After (or a full window)
+BULK_RATE_LIMIT_RETRIES = 5
+BULK_RATE_LIMIT_WAIT_SECONDS = 60
+
 
 class StagingAPIClient:
     def __init__(
@@ -105,19 +122,38 @@ class StagingAPIClient:
         data = response.json()
         return [VocabularyEntry.from_api_dict(item) for item in data]
 
-    def list_vocabulary(
-        self, list_name: str | None = None, limit: int = 1000, offset: int = 0
-    ) -> list[VocabularyEntry]:
+    def list_vocabulary(self, list_name: str | None = None, limit: int | None = None) -> list[VocabularyEntry]:
         url = f"{self.base_url}/api/admin/vocabulary"
-        params: dict[str, str | int] = {"limit": limit, "offset": offset}
-        if list_name:
-            params["list_name"] = list_name
+        entries: list[VocabularyEntry] = []
+        cursor: str | None = None
 
-        response = requests.get(url, headers=self._get_headers(), params=params, timeout=30)
-        response.raise_for_status()
+        while limit is None or len(entries) < limit:
+            page_size = LIST_PAGE_SIZE if limit is None else min(LIST_PAGE_SIZE, limit - len(entries))
+            params: dict[str, str | int] = {"limit": page_size}
+            if list_name:
+                params["list_name"] = list_name
+            if cursor:
+                params["cursor"] = cursor
 
-        data = response.json()
-        return [VocabularyEntry.from_api_dict(item) for item in data]
+            response = requests.get(url, headers=self._get_headers(), params=params, timeout=30)
+            response.raise_for_status()
+
+            entries.extend(VocabularyEntry.from_api_dict(item) for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        return entries
+
+    def export_vocabulary(self, list_name: str | None = None) -> Iterator[VocabularyEntry]:
+        url = f"{self.base_url}/api/admin/vocabulary/export"
+        params = {"list_name": list_name} if list_name else {}
+
+        with requests.get(url, headers=self._get_headers(), params=params, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield VocabularyEntry.from_api_dict(json.loads(line))
 
     def update_vocabulary_item(
         self,
@@ -155,6 +191,47 @@ class StagingAPIClient:
         except requests.RequestException as e:
             raise VocabularyUpdateError(item_id, e) from e
 
+    def bulk_vocabulary(
+        self,
+        create: list[dict] | None = None,
+        update: list[dict] | None = None,
+        deactivate: list[str] | None = None,
+    ) -> list[dict]:
+        url = f"{self.base_url}/api/admin/vocabulary/bulk"
+        operations = [("create", item) for item in create or []]
+        operations += [("update", item) for item in update or []]
+        operations += [("deactivate", item_id) for item_id in deactivate or []]
+
+        results: list[dict] = []
+        for start in range(0, len(operations), BULK_CHUNK_SIZE):
+            data: dict[str, list] = {"create": [], "update": [], "deactivate": []}
+            for op, payload in operations[start : start + BULK_CHUNK_SIZE]:
+                data[op].append(payload)
+
+            try:
+                response = self._post_rate_limited(url, data)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise VocabularyBulkError(len(operations[start : start + BULK_CHUNK_SIZE]), e, results) from e
+            results.extend(response.json()["results"])
+
+        return results
+
+    def _post_rate_limited(self, url: str, data: dict) -> requests.Response:
+        for _ in range(BULK_RATE_LIMIT_RETRIES):
+            response = requests.post(url, headers=self._get_headers(), json=data, timeout=120)
+            if response.status_code != 429:
+                return response
+            time.sleep(_retry_after_seconds(response))
+        return requests.post(url, headers=self._get_headers(), json=data, timeout=120)
+
+
+def _retry_after_seconds(response: requests.Response) -> int:
+    try:
+        return max(1, int(response.headers.get("Retry-After", BULK_RATE_LIMIT_WAIT_SECONDS)))
+    except ValueError:
+        return BULK_RATE_LIMIT_WAIT_SECONDS
+
 
 def get_api_client() -> StagingAPIClient:
     return StagingAPIClient()
@@ -13,6 +13,10 @@ from vocab_tools.core.exceptions import (
 from vocab_tools.core.keychain import KeychainError, get_words_db_credentials
 from vocab_tools.core.models import VocabularyEntry
 
+# Resolved inside every statement, like the backend's admin writes, so a long-lived client never touches a
+# version that a vocabulary sync has since retired; writes queue behind the sync's table lock
+ACTIVE_VERSION = "(SELECT id FROM content_versions WHERE is_active)"
+
 
 def get_db_connection():
     if os.environ.get("WORDS_DB_HOST"):
@@ -44,25 +48,15 @@ def get_db_connection():
 class DirectDatabaseClient:
     def __init__(self):
         self.conn = get_db_connection()
-        self._version_id = self._get_active_version_id()
-
-    def _get_active_version_id(self) -> int:
-        with self.conn.cursor() as cur:
-            cur.execute("SELECT id FROM content_versions WHERE is_active = TRUE LIMIT 1")
-            row = cur.fetchone()
-            if not row:
-                raise RuntimeError("No active content version found")
-            return row[0]
 
     def get_all_list_names(self) -> list[str]:
         with self.conn.cursor() as cur:
             cur.execute(
-                """
+                f"""
                 SELECT DISTINCT list_name FROM vocabulary_items
-                WHERE version_id = %s AND is_active = TRUE
+                WHERE version_id = {ACTIVE_VERSION} AND is_active = TRUE
                 ORDER BY list_name
-                """,
-                (self._version_id,),
+                """  # nosec B608
             )
             return [row[0] for row in cur.fetchall()]
 
@@ -70,15 +64,15 @@ class DirectDatabaseClient:
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
-                    """
+                    f"""
                     SELECT id, source_text, target_text, source_language, target_language,
                            list_name, source_usage_example, target_usage_example,
                            difficulty_level, is_active
                     FROM vocabulary_items
-                    WHERE version_id = %s AND list_name = %s
+                    WHERE version_id = {ACTIVE_VERSION} AND list_name = %s
                     ORDER BY source_text
-                    """,
-                    (self._version_id, list_name),
+                    """,  # nosec B608
+                    (list_name,),
                 )
                 return [VocabularyEntry.from_db_row(row) for row in cur.fetchall()]
         except psycopg2.Error as e:
@@ -120,7 +114,7 @@ class DirectDatabaseClient:
             return False
 
         params.append(item_id)
-        query = f"UPDATE vocabulary_items SET {', '.join(updates)} WHERE id = %s"  # nosec B608
+        query = f"UPDATE vocabulary_items SET {', '.join(updates)} WHERE version_id = {ACTIVE_VERSION} AND id = %s"  # nosec B608
 
         try:
             with self.conn.cursor() as cur:
@@ -133,7 +127,10 @@ class DirectDatabaseClient:
     def delete_vocabulary_item(self, item_id: str) -> bool:
         try:
             with self.conn.cursor() as cur:
-                cur.execute("UPDATE vocabulary_items SET is_active = FALSE WHERE id = %s", (item_id,))
+                cur.execute(
+                    f"UPDATE vocabulary_items SET is_active = FALSE WHERE version_id = {ACTIVE_VERSION} AND id = %s",  # nosec B608
+                    (item_id,),
+                )
                 self.conn.commit()
                 return cur.rowcount > 0
         except psycopg2.Error as e:
@@ -153,15 +150,14 @@ class DirectDatabaseClient:
         try:
             with self.conn.cursor() as cur:
                 cur.execute(
-                    """
+                    f"""
                     INSERT INTO vocabulary_items
                         (version_id, source_text, target_text, source_language, target_language,
                          list_name, difficulty_level, source_usage_example, target_usage_example)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES ({ACTIVE_VERSION}, %s, %s, %s, %s, %s, %s, %s, %s)
                     RETURNING id
-                    """,
+                    """,  # nosec B608
                     (
-                        self._version_id,
                         source_text,
                         target_text,
                         source_language,
@@ -190,11 +186,11 @@ class DirectDatabaseClient:
     ) -> tuple[str, bool]:
         with self.conn.cursor() as cur:
             cur.execute(
-                """
+                f"""
                 INSERT INTO vocabulary_items
                     (version_id, source_text, target_text, source_language, target_language,
                      list_name, difficulty_level, source_usage_example, target_usage_example, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE)
+                VALUES ({ACTIVE_VERSION}, %s, %s, %s, %s, %s, %s, %s, %s, TRUE)
                 ON CONFLICT (version_id, source_text, source_language, target_language)
                 DO UPDATE SET
                     target_text = EXCLUDED.target_text,
@@ -204,9 +200,8 @@ class DirectDatabaseClient:
                     target_usage_example = EXCLUDED.target_usage_example,
                     is_active = TRUE
                 RETURNING id, (xmax = 0) AS inserted
-                """,
+                """,  # nosec B608
                 (
-                    self._version_id,
                     source_text,
                     target_text,
                     source_language,
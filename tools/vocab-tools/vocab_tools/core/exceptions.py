@@ -42,6 +42,17 @@ class VocabularyDeleteError(VocabularyError):
         super().__init__(message)
 
 
+class VocabularyBulkError(VocabularyError):
+    def __init__(self, operation_count: int, cause: Exception | None = None, applied: list[dict] | None = None):
+        self.operation_count = operation_count
+        self.cause = cause
+        self.applied = applied or []
+        message = f"Failed to apply bulk vocabulary changes ({operation_count} operations)"
+        if cause:
+            message += f": {cause}"
+        super().__init__(message)
+
+
 class MissingCredentialsError(VocabularyError):
     pass
 